@@ -13,4 +13,14 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'TheatreAPIService.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from theatre.streams import match_seat_stream, seat_stream  # noqa: E402
+
+
+async def application(scope, receive, send):
+    """Serves seat-change streams directly and everything else by Django."""
+    performance_id = match_seat_stream(scope)
+    if performance_id is not None:
+        return await seat_stream(scope, receive, send, performance_id)
+    return await django_application(scope, receive, send)
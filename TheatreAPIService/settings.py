@@ -51,6 +51,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'theatre.middleware.MetricsMiddleware',
+    'theatre.middleware.TracingMiddleware',
+    'theatre.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -133,7 +136,25 @@ USE_TZ = False
 STATIC_URL = 'static/'
 
 MEDIA_URL = "/media/"
-MEDIA_ROOT = BASE_DIR / "media"
+MEDIA_ROOT = os.getenv("MEDIA_ROOT", BASE_DIR / "media")
+
+# Uploads are named by the hash of their content, so identical files are
+# stored once and media URLs can be cached for MEDIA_CACHE_MAX_AGE seconds.
+STORAGES = {
+    "default": {"BACKEND": "theatre.media.ContentAddressedStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+MEDIA_CACHE_MAX_AGE = 31536000
+
+# Uploads are streamed to a temporary file instead of memory.
+FILE_UPLOAD_HANDLERS = [
+    "django.core.files.uploadhandler.TemporaryFileUploadHandler",
+]
+
+# collect_media_garbage keeps unreferenced files younger than this.
+MEDIA_GC_GRACE_SECONDS = 86400
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -150,13 +171,129 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         "theatre.permissions.IsAdminOrIfAuthenticatedReadOnly",
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        "theatre.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
     'DEFAULT_THROTTLE_CLASSES': [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "theatre.throttling.ScopedSlidingWindowThrottle",
     ],
-    'DEFAULT_THROTTLE_RATES': {"anon": "100/day", "user": "500/day"},
+    'DEFAULT_THROTTLE_RATES': {
+        "anon": "30/min",
+        "user": "120/min",
+        "catalog": "300/min",
+        "reservations": "120/min",
+        "reservation_writes": "10/min",
+        "check_in": "600/min",
+    },
+}
+
+# The waiting room, check-in marks, throttles and price grids are kept in
+# the default cache, which every worker must share: set CACHE_URL to a
+# Redis URL (e.g. redis://redis:6379/0). Without it each process has its
+# own memory cache, which only suits a single worker.
+CACHE_URL = os.getenv("CACHE_URL")
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": CACHE_URL,
+    } if CACHE_URL else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Compressed response bodies, kept apart so they cannot evict the
+    # state above. Each worker keeps at most MAX_ENTRIES of them.
+    "compression": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "compression",
+        "OPTIONS": {"MAX_ENTRIES": 100},
+    },
 }
 
+# Serve list endpoints of the theatre API from .values() rows. Opt-in:
+# enable it once benchmark_list_serialization shows it pays off.
+FAST_LIST_SERIALIZATION = False
+
+# How long (in seconds) a reservation Idempotency-Key is remembered.
+IDEMPOTENCY_KEY_TTL = 60 * 60 * 24
+
+# Bearer token that lets a Prometheus scraper read /metrics/ without a JWT.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+# Share of requests traced (0 disables tracing, 1 traces every request),
+# and where the traces are exported.
+TRACING_SAMPLE_RATE = float(os.getenv("TRACING_SAMPLE_RATE", 0))
+TRACING_EXPORTER = "theatre.tracing.JSONFileExporter"
+TRACING_EXPORT_PATH = BASE_DIR / "traces.jsonl"
+
+# Live seat-change events served by TheatreAPIService.asgi.
+SEAT_EVENTS_BROKER = "theatre.seat_events.LocalBroker"
+SEAT_EVENTS_MAX_PENDING = 100
+SEAT_EVENTS_KEEPALIVE = 15
+
+# Tickets of performances older than this many days are archived, in
+# batches of ARCHIVE_BATCH_SIZE.
+ARCHIVE_AFTER_DAYS = 180
+ARCHIVE_BATCH_SIZE = 1000
+
+# reconcile_sales_rollups recomputes this many past days, and every
+# future day, unless given a range.
+SALES_ROLLUP_RECONCILE_DAYS = 7
+
+# Unfiltered admin changelists of tables estimated to hold at least this
+# many rows show the Postgres estimate instead of running COUNT(*).
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100000
+
+# Actor and genre details embed this many plays, by title, and this many
+# upcoming performances.
+FILMOGRAPHY_PLAYS_LIMIT = 50
+FILMOGRAPHY_PERFORMANCES_LIMIT = 10
+
+# Responses of at least COMPRESSION_MIN_SIZE bytes are compressed with
+# brotli, when installed, or gzip. Compressed bodies of up to
+# COMPRESSION_CACHE_MAX_SIZE bytes are cached in the COMPRESSION_CACHE
+# alias for COMPRESSION_CACHE_TTL seconds, so unchanged responses are
+# compressed once.
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_GZIP_LEVEL = 6
+COMPRESSION_BROTLI_QUALITY = 5
+COMPRESSION_CACHE = "compression"
+COMPRESSION_CACHE_TTL = 300
+COMPRESSION_CACHE_MAX_SIZE = 262144
+
+# Door check-ins are written in batches of CHECKIN_BATCH_SIZE, or after
+# CHECKIN_FLUSH_INTERVAL seconds. Scanned tickets stay marked in the cache
+# for CHECKIN_MARK_TTL seconds. Cancelled tickets stay marked for
+# CHECKIN_REVOKED_TTL seconds; None keeps them until the cache evicts them.
+CHECKIN_BATCH_SIZE = 50
+CHECKIN_FLUSH_INTERVAL = 2
+CHECKIN_MARK_TTL = 60 * 60 * 48
+CHECKIN_REVOKED_TTL = None
+
+# Seats released for a sold-out performance are held for the next waitlist
+# entries for WAITLIST_CLAIM_SECONDS; each promotion locks up to
+# WAITLIST_PROMOTE_BATCH_SIZE entries.
+WAITLIST_CLAIM_SECONDS = 600
+WAITLIST_PROMOTE_BATCH_SIZE = 50
+
+# Performances with admissions_per_minute set admit users to reservations
+# through a cache-backed waiting room, in batches every WAITING_ROOM_TICK
+# seconds. Admission tokens are valid for WAITING_ROOM_ADMISSION_TTL
+# seconds and queue places for WAITING_ROOM_TTL.
+WAITING_ROOM_TICK = 1
+WAITING_ROOM_ADMISSION_TTL = 600
+WAITING_ROOM_TTL = 60 * 60 * 24
+
+# Seconds the price grid of a hall and the prices of a performance are
+# cached. Changes drop them at once from the shared cache.
+PRICE_GRID_CACHE_TTL = 60
+
+# Seconds each /readyz check may take, and how long its result is reused.
+READINESS_CHECK_TIMEOUT = 2
+READINESS_CACHE_TTL = 5
+
+# Where build_schema writes the OpenAPI schema served at /api/schema/.
+OPENAPI_SCHEMA_DIR = BASE_DIR / "schema"
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Theatre API Service',
     'DESCRIPTION': 'Reserv tickets for your theatre session.',
@@ -16,20 +16,31 @@ Including another URLconf
 """
 
 from django.contrib import admin
-from django.conf.urls.static import static
-from django.urls import path, include
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from django.urls import path, include, re_path
+from drf_spectacular.views import SpectacularSwaggerView
 
 from TheatreAPIService import settings
+from theatre.health import healthz, readyz
+from theatre.media import serve_media
+from theatre.schema import CachedSpectacularAPIView
+from theatre.views import MetricsView
 
 urlpatterns = [
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", CachedSpectacularAPIView.as_view(), name="schema"),
     path(
         "api/schema/swagger-ui/",
         SpectacularSwaggerView.as_view(url_name="schema"),
         name="swagger-ui"
     ),
     path("admin/", admin.site.urls),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
+    path("healthz", healthz, name="healthz"),
+    path("readyz", readyz, name="readyz"),
     path("api/theatre/", include("theatre.urls", namespace="theatre")),
     path("api/user/", include("user.urls", namespace="user")),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+    re_path(
+        rf"^{settings.MEDIA_URL.strip('/')}/(?P<path>.+)$",
+        serve_media,
+        name="media",
+    ),
+]
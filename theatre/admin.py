@@ -1,5 +1,10 @@
+from django.conf import settings
 from django.contrib import admin
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
 
+from theatre import performance_cards, sales_rollups
 from theatre.models import (
     Play,
     Actor,
@@ -7,14 +12,209 @@ from theatre.models import (
     Genre,
     Ticket,
     Reservation,
-    Performance
-
+    Performance,
+    WaitlistEntry,
+    Cancellation,
+    PriceTier,
+    PerformancePrice,
 )
+from theatre.ticket_release import release_tickets
+
+
+def estimated_count(queryset):
+    """Returns the planner's row estimate for the queryset's table."""
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    return row[0] if row else -1
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that skips ``COUNT(*)`` on big unfiltered Postgres tables.
+
+    Without filters the estimate from ``pg_class.reltuples`` is used once
+    it reaches ``ADMIN_ESTIMATED_COUNT_THRESHOLD`` rows; smaller tables,
+    filtered changelists and other databases are counted exactly.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if (
+            not queryset.query.where
+            and connections[queryset.db].vendor == "postgresql"
+        ):
+            estimate = estimated_count(queryset)
+            if estimate >= getattr(
+                settings, "ADMIN_ESTIMATED_COUNT_THRESHOLD", 100000
+            ):
+                return estimate
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Filtered changelists would otherwise count the whole table as well.
+    show_full_result_count = False
+    ordering = ("-id",)
+
+
+@admin.register(Play)
+class PlayAdmin(admin.ModelAdmin):
+    list_display = ("title",)
+    search_fields = ("title",)
+    autocomplete_fields = ("actors", "genres")
+
+
+@admin.register(Actor)
+class ActorAdmin(admin.ModelAdmin):
+    list_display = ("first_name", "last_name")
+    search_fields = ("first_name", "last_name")
+
+
+@admin.register(Genre)
+class GenreAdmin(admin.ModelAdmin):
+    search_fields = ("name",)
+
+
+class PriceTierInline(admin.TabularInline):
+    model = PriceTier
+    extra = 0
+
+
+class PerformancePriceInline(admin.TabularInline):
+    model = PerformancePrice
+    extra = 0
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        # Only the tiers of the performance's hall can be overridden.
+        if db_field.name == "price_tier" and request.resolver_match.kwargs.get(
+            "object_id"
+        ):
+            kwargs["queryset"] = PriceTier.objects.filter(
+                theatre_hall__performances=request.resolver_match.kwargs[
+                    "object_id"
+                ]
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+@admin.register(TheatreHall)
+class TheatreHallAdmin(admin.ModelAdmin):
+    list_display = ("name", "rows", "seats_in_row", "capacity")
+    search_fields = ("name",)
+    readonly_fields = ("capacity",)
+    inlines = (PriceTierInline,)
+
+
+@admin.register(Performance)
+class PerformanceAdmin(LargeTableAdmin):
+    list_display = ("id", "play", "theatre_hall", "show_time", "duration")
+    list_select_related = ("play", "theatre_hall")
+    list_filter = ("theatre_hall",)
+    search_fields = ("play__title",)
+    autocomplete_fields = ("play", "theatre_hall")
+    date_hierarchy = "show_time"
+    actions = ("release_all_tickets", "refresh_derived_data")
+    inlines = (PerformancePriceInline,)
+
+    @admin.action(
+        description="Release all tickets of selected performances",
+        permissions=("delete",),
+    )
+    def release_all_tickets(self, request, queryset):
+        released = release_tickets(
+            Ticket.objects.filter(performance__in=queryset)
+        )
+        self.message_user(request, f"Released {released} tickets.")
+
+    @admin.action(
+        description="Rebuild cards and sales of selected performances",
+        permissions=("change",),
+    )
+    def refresh_derived_data(self, request, queryset):
+        performance_cards.refresh_cards(queryset)
+        days = set()
+        play_ids = set()
+        theatre_hall_ids = set()
+        for play_id, theatre_hall_id, day in queryset.values_list(
+            "play_id", "theatre_hall_id", "show_time__date"
+        ).distinct().order_by():
+            play_ids.add(play_id)
+            theatre_hall_ids.add(theatre_hall_id)
+            days.add(day)
+        if days:
+            sales_rollups.reconcile(
+                min(days), max(days), play_ids, theatre_hall_ids
+            )
+        self.message_user(request, "Cards and sales rollups rebuilt.")
+
+
+@admin.register(Reservation)
+class ReservationAdmin(LargeTableAdmin):
+    list_display = ("id", "user", "created_at")
+    list_select_related = ("user",)
+    search_fields = ("user__email",)
+    autocomplete_fields = ("user",)
+    date_hierarchy = "created_at"
+
+
+@admin.register(Ticket)
+class TicketAdmin(LargeTableAdmin):
+    list_display = ("id", "performance", "row", "seat", "reservation")
+    list_select_related = (
+        "performance__play",
+        "performance__theatre_hall",
+        "reservation",
+    )
+    autocomplete_fields = ("performance", "reservation")
+    date_hierarchy = "performance__show_time"
+    actions = ("release_selected",)
+
+    def get_actions(self, request):
+        # Deleting one ticket at a time would run the signal handlers and
+        # load every row for the confirmation page.
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    @admin.action(
+        description="Release selected tickets", permissions=("delete",)
+    )
+    def release_selected(self, request, queryset):
+        released = release_tickets(queryset)
+        self.message_user(request, f"Released {released} tickets.")
+
+
+@admin.register(WaitlistEntry)
+class WaitlistEntryAdmin(LargeTableAdmin):
+    list_display = (
+        "id", "performance", "user", "seats_count", "status", "expires_at"
+    )
+    list_filter = ("status",)
+    list_select_related = (
+        "performance__play",
+        "performance__theatre_hall",
+        "user",
+    )
+    autocomplete_fields = ("performance", "user", "reservation")
+
+
+@admin.register(Cancellation)
+class CancellationAdmin(LargeTableAdmin):
+    list_display = (
+        "id", "reservation_id", "user_id", "whole_reservation", "created_at"
+    )
+    date_hierarchy = "created_at"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
-admin.register(Play)
-admin.register(Performance)
-admin.register(Actor)
-admin.register(TheatreHall)
-admin.register(Genre)
-admin.register(Ticket)
-admin.register(Reservation)
+    def has_delete_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,103 @@
+from django.db import connection, transaction
+
+from theatre.models import (
+    ArchivedReservation,
+    ArchivedTicket,
+    Reservation,
+    Ticket,
+)
+
+TICKET_FIELDS = (
+    "id",
+    "row",
+    "seat",
+    "performance_id",
+    "reservation_id",
+    "price",
+    "performance__play_id",
+    "performance__theatre_hall_id",
+    "performance__show_time",
+)
+
+
+def delete_tickets(ticket_ids):
+    table = connection.ops.quote_name(Ticket._meta.db_table)
+    placeholders = ", ".join(["%s"] * len(ticket_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {table} WHERE id IN ({placeholders})", ticket_ids
+        )
+
+
+def archive_batch(cutoff, after_id, batch_size):
+    """Archives up to ``batch_size`` tickets with an id above ``after_id``.
+
+    Returns the last archived ticket id (``None`` when nothing was left)
+    and the number of archived tickets and reservations.
+    """
+    with transaction.atomic():
+        tickets = list(
+            Ticket.objects.filter(
+                performance__show_time__lt=cutoff, id__gt=after_id
+            )
+            .order_by("id")
+            .values(*TICKET_FIELDS)[:batch_size]
+        )
+        if not tickets:
+            return None, 0, 0
+
+        ArchivedTicket.objects.bulk_create(
+            [
+                ArchivedTicket(
+                    id=ticket["id"],
+                    row=ticket["row"],
+                    seat=ticket["seat"],
+                    performance_id=ticket["performance_id"],
+                    reservation_id=ticket["reservation_id"],
+                    play_id=ticket["performance__play_id"],
+                    theatre_hall_id=ticket["performance__theatre_hall_id"],
+                    show_time=ticket["performance__show_time"],
+                    price=ticket["price"],
+                )
+                for ticket in tickets
+            ],
+            ignore_conflicts=True,
+        )
+        # A plain DELETE skips the per-ticket post_delete handlers: past
+        # performances have no card to update and nobody watching seats,
+        # and archived tickets still count in the sales rollups.
+        ticket_ids = [ticket["id"] for ticket in tickets]
+        delete_tickets(ticket_ids)
+
+        # Reservations are archived once none of their tickets is live.
+        reservations = list(
+            Reservation.objects.filter(
+                id__in={ticket["reservation_id"] for ticket in tickets},
+                tickets__isnull=True,
+            ).values("id", "user_id", "created_at")
+        )
+        ArchivedReservation.objects.bulk_create(
+            [ArchivedReservation(**reservation) for reservation in reservations],
+            ignore_conflicts=True,
+        )
+        Reservation.objects.filter(
+            id__in=[reservation["id"] for reservation in reservations]
+        ).delete()
+
+    return ticket_ids[-1], len(tickets), len(reservations)
+
+
+def archive_tickets(cutoff, batch_size=1000):
+    """Moves tickets of performances before ``cutoff`` to the archive.
+
+    Tickets are walked by id, one short transaction per batch, so the live
+    tables are never locked for long. Yields the counts of every batch.
+    """
+    after_id = 0
+    while True:
+        after_id, tickets_count, reservations_count = archive_batch(
+            cutoff, after_id, batch_size
+        )
+        if after_id is None:
+            return
+        yield tickets_count, reservations_count
@@ -0,0 +1,24 @@
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from rest_framework.authentication import BaseAuthentication
+
+METRICS_AUTH = "metrics"
+
+
+class MetricsTokenAuthentication(BaseAuthentication):
+    """Accepts ``Authorization: Bearer <METRICS_TOKEN>`` from scrapers.
+
+    Returns ``None`` for any other header so JWT authentication can run.
+    """
+
+    def authenticate(self, request):
+        token = getattr(settings, "METRICS_TOKEN", None)
+        header = request.headers.get("Authorization", "")
+        if token and hmac.compare_digest(header, f"Bearer {token}"):
+            return AnonymousUser(), METRICS_AUTH
+        return None
+
+    def authenticate_header(self, request):
+        return 'Bearer realm="metrics"'
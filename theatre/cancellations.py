@@ -0,0 +1,75 @@
+from collections import Counter
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from theatre import metrics
+from theatre.models import Cancellation, Reservation, Ticket
+from theatre.ticket_release import TICKET_FIELDS, release_rows
+
+# Sent once a cancellation is committed, with ``cancellation``. Refunds
+# and other consumers connect here instead of polling the log.
+reservation_cancelled = Signal()
+
+
+def cancel(reservation, ticket_ids=None):
+    """Cancels some tickets of a reservation, or the whole reservation.
+
+    The reservation row is locked, so concurrent cancellations of the same
+    tickets cannot release them twice. The tickets are removed with one
+    delete, caches and counters are updated and the cancellation is logged
+    in the same transaction. Cancelling every ticket deletes the
+    reservation too. Returns the ``Cancellation``.
+    """
+    with transaction.atomic():
+        reservation = Reservation.objects.select_for_update().get(
+            id=reservation.id
+        )
+        rows = list(
+            Ticket.objects.filter(reservation=reservation)
+            .values_list(*TICKET_FIELDS)
+            .order_by("id")
+        )
+        tickets_count = len(rows)
+        if ticket_ids is not None:
+            ticket_ids = set(ticket_ids)
+            unknown = ticket_ids - {row[0] for row in rows}
+            if unknown:
+                raise ValidationError(
+                    {"tickets": f"Not in this reservation: "
+                                f"{', '.join(map(str, sorted(unknown)))}."}
+                )
+            rows = [row for row in rows if row[0] in ticket_ids]
+
+        now = timezone.now()
+        if any(row[6] <= now for row in rows):
+            raise ValidationError(
+                {"tickets": "Tickets of performances that have started "
+                            "cannot be cancelled."}
+            )
+
+        release_rows(rows)
+        cancellation = Cancellation.objects.create(
+            reservation_id=reservation.id,
+            user_id=reservation.user_id,
+            tickets=[
+                {"id": ticket_id, "performance": performance_id,
+                 "row": row, "seat": seat}
+                for ticket_id, row, seat, performance_id, *_ in rows
+            ],
+            whole_reservation=len(rows) == tickets_count,
+        )
+        if cancellation.whole_reservation:
+            reservation.delete()
+
+        performances = Counter(row[3] for row in rows)
+        for performance_id, count in performances.items():
+            metrics.record_tickets_cancelled_on_commit(performance_id, count)
+        transaction.on_commit(
+            lambda: reservation_cancelled.send(
+                sender=Cancellation, cancellation=cancellation
+            )
+        )
+    return cancellation
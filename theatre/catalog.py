@@ -0,0 +1,354 @@
+import csv
+import json
+from contextlib import nullcontext
+from itertools import islice
+
+from django.db import transaction
+
+from theatre import performance_cards
+from theatre.models import Actor, Genre, Performance, Play
+
+FORMATS = ("jsonl", "csv")
+CONTENT_TYPES = {"jsonl": "application/x-ndjson", "csv": "text/csv"}
+CSV_COLUMNS = (
+    "type",
+    "name",
+    "first_name",
+    "last_name",
+    "title",
+    "description",
+    "genres",
+    "actors",
+)
+
+
+class CatalogError(ValueError):
+    """Raised for a record that cannot be imported.
+
+    ``import_catalog`` sets ``stats`` to the changes of the batches it
+    committed before the failing record.
+    """
+    stats = None
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def read_records(lines, file_format):
+    """Yields ``(line number, raw record)`` from JSONL or CSV lines.
+
+    In CSV the ``genres`` and ``actors`` cells hold JSON lists and empty
+    cells are treated as missing.
+    """
+    if file_format == "jsonl":
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except ValueError:
+                raise CatalogError(f"Line {number}: invalid JSON.")
+        return
+
+    reader = csv.DictReader(lines)
+    for row in reader:
+        record = {key: value for key, value in row.items() if value}
+        for key in ("genres", "actors"):
+            if key in record:
+                try:
+                    record[key] = json.loads(record[key])
+                except ValueError:
+                    raise CatalogError(
+                        f"Line {reader.line_num}: {key} must be a JSON list."
+                    )
+        yield reader.line_num, record
+
+
+def required_string(record, key, number):
+    value = record.get(key)
+    if not isinstance(value, str) or not value.strip():
+        raise CatalogError(f"Line {number}: {key} is required.")
+    return value.strip()
+
+
+def genre_name(name, number):
+    if not isinstance(name, str) or not name.strip():
+        raise CatalogError(f"Line {number}: genres must be names.")
+    return name.strip()
+
+
+def actor_key(actor, number):
+    if not isinstance(actor, dict):
+        raise CatalogError(
+            f"Line {number}: actors must be objects with first_name "
+            f"and last_name."
+        )
+    return (
+        required_string(actor, "first_name", number),
+        required_string(actor, "last_name", number),
+    )
+
+
+def parse_record(number, record):
+    """Validates a raw record and returns it in normalized form.
+
+    Plays keep ``genres`` and ``actors`` as ``None`` when the record has
+    no such key, which leaves the existing relations untouched.
+    """
+    if not isinstance(record, dict):
+        raise CatalogError(f"Line {number}: record must be an object.")
+
+    record_type = record.get("type")
+    if record_type == "genre":
+        return {"type": "genre", "name": required_string(record, "name", number)}
+    if record_type == "actor":
+        return {"type": "actor", "key": actor_key(record, number)}
+    if record_type == "play":
+        genres = record.get("genres")
+        actors = record.get("actors")
+        for key, value in (("genres", genres), ("actors", actors)):
+            if value is not None and not isinstance(value, list):
+                raise CatalogError(f"Line {number}: {key} must be a list.")
+        return {
+            "type": "play",
+            "title": required_string(record, "title", number),
+            "description": record.get("description"),
+            "genres": None if genres is None else {
+                genre_name(name, number) for name in genres
+            },
+            "actors": None if actors is None else {
+                actor_key(actor, number) for actor in actors
+            },
+        }
+    raise CatalogError(
+        f"Line {number}: type must be one of genre, actor or play."
+    )
+
+
+def upsert_genres(names, stats):
+    """Returns the ids of genres by name, creating the missing ones."""
+    genre_ids = dict(
+        Genre.objects.filter(name__in=names).values_list("name", "id")
+    )
+    created = Genre.objects.bulk_create(
+        Genre(name=name) for name in sorted(names - genre_ids.keys())
+    )
+    genre_ids.update((genre.name, genre.id) for genre in created)
+    stats["genres"]["created"] += len(created)
+    return genre_ids
+
+
+def upsert_actors(keys, stats):
+    """Returns the ids of actors by (first, last) name, creating missing."""
+    actor_ids = {}
+    # Ordered newest first, so the oldest of same-named actors wins.
+    existing = Actor.objects.filter(
+        first_name__in={first_name for first_name, _ in keys},
+        last_name__in={last_name for _, last_name in keys},
+    ).order_by("-id")
+    for actor_id, first_name, last_name in existing.values_list(
+        "id", "first_name", "last_name"
+    ):
+        if (first_name, last_name) in keys:
+            actor_ids[first_name, last_name] = actor_id
+
+    created = Actor.objects.bulk_create(
+        Actor(first_name=first_name, last_name=last_name)
+        for first_name, last_name in sorted(keys - actor_ids.keys())
+    )
+    actor_ids.update(
+        ((actor.first_name, actor.last_name), actor.id) for actor in created
+    )
+    stats["actors"]["created"] += len(created)
+    return actor_ids
+
+
+def upsert_plays(records, stats):
+    """Creates or updates plays by title.
+
+    Returns the ids of the plays by title and the ids of those that
+    existed before.
+    """
+    existing = {}
+    # Ordered newest first, so the oldest of same-titled plays wins.
+    for play in Play.objects.filter(title__in=records).order_by("-id"):
+        existing[play.title] = play
+
+    to_update = []
+    for title, play in existing.items():
+        description = records[title]["description"]
+        if description is not None and description != play.description:
+            play.description = description
+            to_update.append(play)
+    Play.objects.bulk_update(to_update, ["description"])
+
+    created = Play.objects.bulk_create(
+        Play(title=title, description=records[title]["description"] or "")
+        for title in records
+        if title not in existing
+    )
+    stats["plays"]["created"] += len(created)
+    stats["plays"]["updated"] += len(to_update)
+    play_ids = {play.title: play.id for play in [*existing.values(), *created]}
+    return play_ids, {play.id for play in existing.values()}
+
+
+def sync_relation(through, field, wanted, stats):
+    """Makes the through rows of each play equal to ``wanted[play_id]``.
+
+    Returns the ids of plays whose relations changed.
+    """
+    current = {}
+    stale = {}
+    for row_id, play_id, related_id in through.objects.filter(
+        play_id__in=wanted
+    ).values_list("id", "play_id", field):
+        if related_id in wanted[play_id]:
+            current.setdefault(play_id, set()).add(related_id)
+        else:
+            stale[row_id] = play_id
+
+    new_rows = [
+        through(play_id=play_id, **{field: related_id})
+        for play_id, related_ids in wanted.items()
+        for related_id in related_ids - current.get(play_id, set())
+    ]
+    through.objects.filter(id__in=stale).delete()
+    through.objects.bulk_create(new_rows)
+
+    stats["links"]["created"] += len(new_rows)
+    stats["links"]["deleted"] += len(stale)
+    return {row.play_id for row in new_rows} | set(stale.values())
+
+
+def import_batch(records, stats):
+    genre_names = set()
+    actor_keys = set()
+    plays = {}
+    for record in records:
+        if record["type"] == "genre":
+            genre_names.add(record["name"])
+        elif record["type"] == "actor":
+            actor_keys.add(record["key"])
+        else:
+            # A later record for the same play wins.
+            plays[record["title"]] = record
+            genre_names.update(record["genres"] or ())
+            actor_keys.update(record["actors"] or ())
+
+    genre_ids = upsert_genres(genre_names, stats)
+    actor_ids = upsert_actors(actor_keys, stats)
+    play_ids, existing_play_ids = upsert_plays(plays, stats)
+
+    changed_genres = sync_relation(
+        Play.genres.through,
+        "genre_id",
+        {
+            play_ids[title]: {genre_ids[name] for name in record["genres"]}
+            for title, record in plays.items()
+            if record["genres"] is not None
+        },
+        stats,
+    )
+    sync_relation(
+        Play.actors.through,
+        "actor_id",
+        {
+            play_ids[title]: {actor_ids[key] for key in record["actors"]}
+            for title, record in plays.items()
+            if record["actors"] is not None
+        },
+        stats,
+    )
+    # Bulk writes send no m2m_changed, so cards listing genres are rebuilt.
+    # New plays have no performances yet.
+    changed_genres &= existing_play_ids
+    if changed_genres:
+        performance_cards.refresh_cards(
+            Performance.objects.filter(play_id__in=changed_genres)
+        )
+
+
+def import_catalog(records, batch_size=1000, dry_run=False):
+    """Imports raw records in batches and returns the counts of changes.
+
+    Genres, actors and plays are matched by name, full name and title.
+    Every batch is committed on its own, so an invalid record stops the
+    import with the earlier batches kept; the ``CatalogError`` carries
+    their counts. A dry run imports everything in one transaction and
+    rolls it back.
+    """
+    stats = {
+        "records": 0,
+        "genres": {"created": 0},
+        "actors": {"created": 0},
+        "plays": {"created": 0, "updated": 0},
+        "links": {"created": 0, "deleted": 0},
+        "dry_run": dry_run,
+    }
+    parsed = (parse_record(number, record) for number, record in records)
+
+    try:
+        with transaction.atomic() if dry_run else nullcontext():
+            for batch in batched(parsed, batch_size):
+                with transaction.atomic():
+                    import_batch(batch, stats)
+                stats["records"] += len(batch)
+            if dry_run:
+                transaction.set_rollback(True)
+    except CatalogError as error:
+        error.stats = stats
+        raise
+    return stats
+
+
+def export_records(chunk_size=1000):
+    """Yields every genre, actor and play as a record, streaming by chunk."""
+    for name in Genre.objects.order_by("id").values_list(
+        "name", flat=True
+    ).iterator(chunk_size=chunk_size):
+        yield {"type": "genre", "name": name}
+
+    for first_name, last_name in Actor.objects.order_by("id").values_list(
+        "first_name", "last_name"
+    ).iterator(chunk_size=chunk_size):
+        yield {"type": "actor", "first_name": first_name, "last_name": last_name}
+
+    plays = Play.objects.order_by("id").prefetch_related("genres", "actors")
+    for play in plays.iterator(chunk_size=chunk_size):
+        yield {
+            "type": "play",
+            "title": play.title,
+            "description": play.description,
+            "genres": sorted(genre.name for genre in play.genres.all()),
+            "actors": [
+                {"first_name": actor.first_name, "last_name": actor.last_name}
+                for actor in sorted(play.actors.all(), key=lambda a: a.id)
+            ],
+        }
+
+
+class Echo:
+    """File-like object whose ``write`` returns the value, for csv.writer."""
+
+    def write(self, value):
+        return value
+
+
+def export_lines(file_format, chunk_size=1000):
+    """Yields the export as lines of JSONL or CSV."""
+    if file_format == "jsonl":
+        for record in export_records(chunk_size):
+            yield json.dumps(record, ensure_ascii=False) + "\n"
+        return
+
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_COLUMNS)
+    for record in export_records(chunk_size):
+        for key in ("genres", "actors"):
+            if key in record:
+                record[key] = json.dumps(record[key], ensure_ascii=False)
+        yield writer.writerow(record.get(column, "") for column in CSV_COLUMNS)
@@ -0,0 +1,210 @@
+import atexit
+import base64
+import binascii
+import struct
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from theatre.models import CheckIn
+
+TOKEN_SALT = "theatre.checkin.ticket-token"
+# Ids are bigints; rows and seats are integer fields.
+TOKEN_FORMAT = struct.Struct(">QQII")
+MAC_SIZE = 10
+
+ADMITTED = "admitted"
+DUPLICATE = "duplicate"
+INVALID = "invalid"
+WRONG_PERFORMANCE = "wrong_performance"
+REVOKED = "revoked"
+
+TicketToken = namedtuple(
+    "TicketToken", ("ticket_id", "performance_id", "row", "seat")
+)
+
+
+def sign(payload):
+    mac = salted_hmac(TOKEN_SALT, payload, algorithm="sha256")
+    return mac.digest()[:MAC_SIZE]
+
+
+def make_token(ticket):
+    """Returns the URL-safe token printed in the QR code of a ticket."""
+    payload = TOKEN_FORMAT.pack(
+        ticket.id, ticket.performance_id, ticket.row, ticket.seat
+    )
+    token = base64.urlsafe_b64encode(payload + sign(payload))
+    return token.rstrip(b"=").decode()
+
+
+def read_token(token):
+    """Verifies a token and returns its ``TicketToken``, or ``None``."""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except (binascii.Error, ValueError):
+        return None
+    if len(raw) != TOKEN_FORMAT.size + MAC_SIZE:
+        return None
+
+    payload, mac = raw[:TOKEN_FORMAT.size], raw[TOKEN_FORMAT.size:]
+    if not constant_time_compare(mac, sign(payload)):
+        return None
+    return TicketToken(*TOKEN_FORMAT.unpack(payload))
+
+
+def revoked_key(ticket_id):
+    return f"checkin_revoked_{ticket_id}"
+
+
+def revoke_on_commit(ticket_ids):
+    """Makes the tokens of released tickets fail at the door.
+
+    Tokens are verified without the database, so released tickets are
+    marked in the shared cache for ``CHECKIN_REVOKED_TTL`` seconds, by
+    default until the cache drops them.
+    """
+    keys = {revoked_key(ticket_id): 1 for ticket_id in ticket_ids}
+    transaction.on_commit(lambda: cache.set_many(
+        keys, getattr(settings, "CHECKIN_REVOKED_TTL", None)
+    ))
+
+
+def scan_result(token, status, ticket):
+    """Flattens the outcome of a scan for ``CheckInResultSerializer``."""
+    fields = ticket._asdict() if ticket else dict.fromkeys(TicketToken._fields)
+    return {"token": token, "status": status, **fields}
+
+
+class CheckInRecorder:
+    """Detects duplicate scans and writes check-ins to the database in batches.
+
+    Each process keeps the ids of the checked-in tickets per performance,
+    loaded from the database once, so repeated scans are rejected in
+    memory. A cache key per ticket, set with the atomic ``cache.add``,
+    catches scans of the same ticket at another worker. Scans are keyed
+    by ticket rather than seat, so a seat that was resold admits its new
+    ticket. Cancelled tickets are marked in the same cache, so a scan
+    needs no query once the performance is loaded.
+
+    Admitted scans are buffered and inserted with one ``bulk_create`` when
+    ``CHECKIN_BATCH_SIZE`` scans are pending, or by a timer
+    ``CHECKIN_FLUSH_INTERVAL`` seconds after the first of them, so the last
+    scans of a rush are written even if no more come in.
+    """
+
+    max_performances = 256
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.checked_in = OrderedDict()
+        self.pending = []
+        self.pending_since = None
+        self.timer = None
+
+    def get_checked_in(self, performance_id):
+        ticket_ids = self.checked_in.get(performance_id)
+        if ticket_ids is None:
+            ticket_ids = set(
+                CheckIn.objects.filter(
+                    performance_id=performance_id
+                ).values_list("ticket_id", flat=True)
+            )
+            self.checked_in[performance_id] = ticket_ids
+            if len(self.checked_in) > self.max_performances:
+                self.checked_in.popitem(last=False)
+        else:
+            self.checked_in.move_to_end(performance_id)
+        return ticket_ids
+
+    def scan(self, token, performance_id=None, scanned_at=None):
+        """Checks a token in and returns ``(status, TicketToken)``."""
+        ticket = read_token(token)
+        if ticket is None:
+            return INVALID, None
+        if (
+            performance_id is not None
+            and ticket.performance_id != performance_id
+        ):
+            return WRONG_PERFORMANCE, ticket
+        if cache.get(revoked_key(ticket.ticket_id)):
+            return REVOKED, ticket
+
+        with self.lock:
+            checked_in = self.get_checked_in(ticket.performance_id)
+            if ticket.ticket_id in checked_in:
+                return DUPLICATE, ticket
+            checked_in.add(ticket.ticket_id)
+
+            if not cache.add(
+                f"checkin_ticket_{ticket.ticket_id}",
+                1,
+                getattr(settings, "CHECKIN_MARK_TTL", 172800),
+            ):
+                return DUPLICATE, ticket
+
+            self.pending.append(
+                CheckIn(
+                    ticket_id=ticket.ticket_id,
+                    performance_id=ticket.performance_id,
+                    row=ticket.row,
+                    seat=ticket.seat,
+                    checked_in_at=scanned_at or timezone.now(),
+                )
+            )
+            if self.pending_since is None:
+                self.pending_since = time.monotonic()
+                self.schedule_flush()
+        return ADMITTED, ticket
+
+    def schedule_flush(self):
+        self.timer = threading.Timer(
+            getattr(settings, "CHECKIN_FLUSH_INTERVAL", 2), self.flush_in_timer
+        )
+        self.timer.daemon = True
+        self.timer.start()
+
+    def flush_in_timer(self):
+        try:
+            self.flush()
+        finally:
+            connection.close()
+
+    def should_flush(self):
+        return bool(self.pending) and (
+            len(self.pending) >= getattr(settings, "CHECKIN_BATCH_SIZE", 50)
+            or time.monotonic() - self.pending_since
+            >= getattr(settings, "CHECKIN_FLUSH_INTERVAL", 2)
+        )
+
+    def flush(self):
+        """Writes the pending check-ins and returns how many there were."""
+        with self.lock:
+            pending, self.pending = self.pending, []
+            self.pending_since = None
+            timer, self.timer = self.timer, None
+        if timer is not None:
+            timer.cancel()
+        if pending:
+            CheckIn.objects.bulk_create(pending, ignore_conflicts=True)
+        return len(pending)
+
+    def reset(self):
+        with self.lock:
+            self.checked_in.clear()
+            self.pending = []
+            self.pending_since = None
+            timer, self.timer = self.timer, None
+        if timer is not None:
+            timer.cancel()
+
+
+recorder = CheckInRecorder()
+# Writes what is still buffered when a worker shuts down.
+atexit.register(recorder.flush)
@@ -0,0 +1,199 @@
+import gzip
+import hashlib
+import zlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+BROTLI = "br"
+GZIP = "gzip"
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/x-ndjson",
+    "application/vnd.oai.openapi",
+    "image/svg+xml",
+)
+# Live streams must reach the client event by event.
+UNCOMPRESSED_TYPES = ("text/event-stream",)
+
+accept_encoding_re = _lazy_re_compile(
+    r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?"
+)
+
+
+def get_min_size():
+    return getattr(settings, "COMPRESSION_MIN_SIZE", 1024)
+
+
+def get_level(encoding):
+    if encoding == BROTLI:
+        return getattr(settings, "COMPRESSION_BROTLI_QUALITY", 5)
+    return getattr(settings, "COMPRESSION_GZIP_LEVEL", 6)
+
+
+def available_encodings():
+    """Supported encodings in order of preference."""
+    return (BROTLI, GZIP) if brotli is not None else (GZIP,)
+
+
+def parse_accept_encoding(accept_encoding):
+    """Maps each coding of an ``Accept-Encoding`` header to its q-value."""
+    weights = {}
+    for part in accept_encoding.split(","):
+        match = accept_encoding_re.match(part)
+        if match is None:
+            continue
+        name, weight = match.groups()
+        try:
+            weights[name.lower()] = float(weight) if weight else 1.0
+        except ValueError:
+            continue
+    return weights
+
+
+def accepts(accept_encoding, encoding):
+    """Whether the client accepts ``encoding``, honouring ``q=0``."""
+    weights = parse_accept_encoding(accept_encoding)
+    return weights.get(encoding, weights.get("*", 0.0)) > 0
+
+
+def negotiate(accept_encoding):
+    """Returns the preferred encoding the client accepts, or ``None``."""
+    weights = parse_accept_encoding(accept_encoding)
+    default = weights.get("*", 0.0)
+    best, best_weight = None, 0.0
+    for encoding in available_encodings():
+        weight = weights.get(encoding, default)
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def is_compressible(response):
+    if response.has_header("Content-Encoding"):
+        return False
+    if "no-transform" in response.get("Cache-Control", ""):
+        return False
+    if response.status_code in (204, 206, 304):
+        return False
+    content_type = response.get("Content-Type", "").split(";")[0].strip()
+    if content_type in UNCOMPRESSED_TYPES:
+        return False
+    return (
+        content_type.startswith("text/")
+        or content_type.endswith("+json")
+        or content_type in getattr(
+            settings, "COMPRESSION_CONTENT_TYPES", COMPRESSIBLE_TYPES
+        )
+    )
+
+
+def compress(content, encoding):
+    if encoding == BROTLI:
+        return brotli.compress(content, quality=get_level(encoding))
+    return gzip.compress(content, compresslevel=get_level(encoding), mtime=0)
+
+
+def compress_cached(content, encoding):
+    """Compresses ``content``, reusing the result for identical bodies.
+
+    Variants are cached by a BLAKE2 digest of the body, which costs a
+    fraction of compressing it, so repeated hits of an unchanged listing
+    are compressed once per ``COMPRESSION_CACHE_TTL``. They go to their
+    own cache alias, ``COMPRESSION_CACHE``, so large bodies cannot evict
+    the state kept in the default cache; without one nothing is cached.
+    """
+    ttl = getattr(settings, "COMPRESSION_CACHE_TTL", 300)
+    alias = getattr(settings, "COMPRESSION_CACHE", None)
+    if not ttl or alias not in settings.CACHES or len(content) > getattr(
+        settings, "COMPRESSION_CACHE_MAX_SIZE", 262144
+    ):
+        return compress(content, encoding)
+    cache = caches[alias]
+
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    key = f"compressed_{encoding}_{get_level(encoding)}_{digest}"
+    compressed = cache.get(key)
+    if compressed is None:
+        compressed = compress(content, encoding)
+        cache.set(key, compressed, ttl)
+    return compressed
+
+
+class StreamCompressor:
+    """Compresses a stream chunk by chunk, yielding output as it is ready."""
+
+    def __init__(self, encoding):
+        if encoding == BROTLI:
+            self.compressor = brotli.Compressor(quality=get_level(encoding))
+            self.process = self.compressor.process
+            self.finish = self.compressor.finish
+        else:
+            # wbits 31 writes a gzip header and trailer.
+            self.compressor = zlib.compressobj(
+                get_level(encoding), zlib.DEFLATED, 31
+            )
+            self.process = self.compressor.compress
+            self.finish = self.compressor.flush
+
+    def iterate(self, chunks):
+        for chunk in chunks:
+            if data := self.process(bytes(chunk)):
+                yield data
+        yield self.finish()
+
+    async def aiterate(self, chunks):
+        async for chunk in chunks:
+            if data := self.process(bytes(chunk)):
+                yield data
+        yield self.finish()
+
+
+def compress_response(request, response):
+    """Compresses a response for the client, when worth it."""
+    if not is_compressible(response):
+        return response
+    if not response.streaming and len(response.content) < get_min_size():
+        return response
+
+    patch_vary_headers(response, ("Accept-Encoding",))
+    encoding = negotiate(request.META.get("HTTP_ACCEPT_ENCODING", ""))
+    if encoding is None:
+        return response
+
+    if response.streaming:
+        compressor = StreamCompressor(encoding)
+        if response.is_async:
+            response.streaming_content = compressor.aiterate(
+                response.streaming_content
+            )
+        else:
+            response.streaming_content = compressor.iterate(
+                response.streaming_content
+            )
+        del response["Content-Length"]
+    else:
+        content = response.content
+        compressed = compress_cached(content, encoding)
+        if len(compressed) >= len(content):
+            return response
+        response.content = compressed
+        response["Content-Length"] = str(len(compressed))
+
+    # The body differs from the uncompressed one, so a strong ETag is
+    # weakened like Django's GZipMiddleware does.
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response["ETag"] = "W/" + etag
+    response["Content-Encoding"] = encoding
+    return response
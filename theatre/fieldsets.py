@@ -0,0 +1,167 @@
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+EXPAND_PARAM = "expand"
+
+
+def parse_names(value):
+    return {name.strip() for name in value.split(",") if name.strip()}
+
+
+def serializer_path(serializer):
+    """Returns the dotted path of a nested serializer, ``""`` for the root."""
+    names = []
+    while serializer.parent is not None:
+        if serializer.field_name:
+            names.append(serializer.field_name)
+        serializer = serializer.parent
+    return ".".join(reversed(names))
+
+
+def names_at(names, path):
+    """Returns the field names addressed to the serializer at ``path``.
+
+    ``play.title`` names ``title`` of the ``play`` serializer and implies
+    ``play`` at the root.
+    """
+    prefix = f"{path}." if path else ""
+    return {
+        name[len(prefix):].split(".")[0]
+        for name in names
+        if name.startswith(prefix) and len(name) > len(prefix)
+    }
+
+
+def get_read_request(serializer):
+    request = serializer.context.get("request")
+    if request is not None and request.method in SAFE_METHODS:
+        return request
+    return None
+
+
+class ExpandableFieldsMixin:
+    """Serializer mixin for the ``?fields=`` and ``?expand=`` parameters.
+
+    ``Meta.expandable`` maps relation fields to the serializer rendering
+    them when expanded; otherwise they stay primary keys.
+    ``Meta.default_expand`` lists the relations expanded when a request has
+    no ``expand`` parameter. Both parameters take dotted names for nested
+    serializers, e.g. ``?expand=play.genres&fields=id,play.title``, and
+    only apply to reads.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = get_read_request(self)
+        params = request.query_params if request is not None else {}
+        path = serializer_path(self)
+
+        if EXPAND_PARAM in params:
+            expand = names_at(parse_names(params[EXPAND_PARAM]), path)
+        else:
+            expand = set(getattr(self.Meta, "default_expand", ()))
+        for name, serializer_class in getattr(
+            self.Meta, "expandable", {}
+        ).items():
+            if name in expand and name in fields:
+                field = fields[name]
+                fields[name] = serializer_class(
+                    many=isinstance(field, serializers.ManyRelatedField),
+                    read_only=True,
+                    source=None if field.source == name else field.source,
+                )
+
+        wanted = names_at(parse_names(params.get(FIELDS_PARAM, "")), path)
+        if wanted:
+            fields = {
+                name: field for name, field in fields.items() if name in wanted
+            }
+        return fields
+
+
+def collect_relations(model, fields, prefix, select_related, prefetch_related):
+    """Adds the relations read by ``fields`` to the lookup sets.
+
+    Returns the model columns the fields read, or ``None`` when a field
+    may read anything, e.g. a method field or a property.
+    """
+    columns = set()
+    for name, field in fields.items():
+        if field.write_only:
+            continue
+        source = field.source
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            columns = None
+            continue
+
+        many = model_field.many_to_many or model_field.one_to_many
+        nested = field.child if isinstance(
+            field, serializers.ListSerializer
+        ) else field
+        if isinstance(field, serializers.ManyRelatedField) or (
+            many and isinstance(nested, serializers.BaseSerializer)
+        ):
+            prefetch_related.add(f"{prefix}{source}")
+            if isinstance(nested, serializers.BaseSerializer):
+                collect_relations(
+                    model_field.related_model,
+                    nested.fields,
+                    f"{prefix}{source}__",
+                    prefetch_related,
+                    prefetch_related,
+                )
+            continue
+
+        if not model_field.concrete:
+            columns = None
+            continue
+        if columns is not None:
+            columns.add(source)
+        if isinstance(nested, serializers.BaseSerializer):
+            select_related.add(f"{prefix}{source}")
+            collect_relations(
+                model_field.related_model,
+                nested.fields,
+                f"{prefix}{source}__",
+                select_related,
+                prefetch_related,
+            )
+    return columns
+
+
+def optimize_queryset(queryset, serializer):
+    """Loads only what the serializer's fields will read.
+
+    Columns are limited with ``only()`` when every field maps to one,
+    expanded forward relations are joined and many-valued ones prefetched.
+    """
+    select_related = set()
+    prefetch_related = set()
+    columns = collect_relations(
+        queryset.model,
+        serializer.fields,
+        "",
+        select_related,
+        prefetch_related,
+    )
+    if columns is not None:
+        queryset = queryset.only(queryset.model._meta.pk.name, *columns)
+    if select_related:
+        queryset = queryset.select_related(*sorted(select_related))
+    if prefetch_related:
+        queryset = queryset.prefetch_related(*sorted(prefetch_related))
+    return queryset
+
+
+class ExpandableFieldsViewMixin:
+    """Trims the read queryset to the fields and expansions requested."""
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method in SAFE_METHODS:
+            queryset = optimize_queryset(queryset, self.get_serializer())
+        return queryset
@@ -0,0 +1,76 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Count, F, Prefetch, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from theatre.models import Performance, Play
+
+PLAY_FIELDS = ("id", "title", "image")
+PERFORMANCE_FIELDS = ("id", "play_id", "theatre_hall_id", "show_time")
+
+
+def get_plays_limit():
+    return getattr(settings, "FILMOGRAPHY_PLAYS_LIMIT", 50)
+
+
+def get_performances_limit():
+    return getattr(settings, "FILMOGRAPHY_PERFORMANCES_LIMIT", 10)
+
+
+def with_plays(queryset):
+    """Adds the first plays by title and the plays count of each parent.
+
+    ``queryset`` holds actors or genres. The plays are prefetched into
+    ``filmography`` with a sliced queryset, which Django limits per parent
+    with a ``ROW_NUMBER()`` window, so one query serves any number of them.
+    """
+    plays = Play.objects.only(*PLAY_FIELDS).order_by("title", "id")
+    return queryset.annotate(
+        plays_count=Count("play", distinct=True)
+    ).prefetch_related(
+        Prefetch(
+            "play_set",
+            queryset=plays[:get_plays_limit()],
+            to_attr="filmography",
+        )
+    )
+
+
+def attach_upcoming_performances(parents, relation):
+    """Sets the next performances of each actor or genre in ``parents``.
+
+    ``relation`` is the field of ``Play`` linking to the parents, e.g.
+    ``"actors"``. The performances of all parents are loaded with one query,
+    numbered per parent with a window and cut at the limit in the database.
+    """
+    parents = list(parents)
+    if not parents:
+        return parents
+
+    parent = F(f"play__{relation}")
+    performances = (
+        Performance.objects.filter(
+            **{f"play__{relation}__in": [item.id for item in parents]},
+            show_time__gte=timezone.now(),
+        )
+        .only(*PERFORMANCE_FIELDS)
+        .annotate(
+            parent_id=parent,
+            rank=Window(
+                RowNumber(),
+                partition_by=parent,
+                order_by=(F("show_time").asc(), F("id").asc()),
+            ),
+        )
+        .filter(rank__lte=get_performances_limit())
+        .order_by("show_time", "id")
+    )
+
+    upcoming = defaultdict(list)
+    for performance in performances:
+        upcoming[performance.parent_id].append(performance)
+    for item in parents:
+        item.upcoming_performances = upcoming[item.id]
+    return parents
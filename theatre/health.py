@@ -0,0 +1,104 @@
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import connections
+from django.http import JsonResponse
+
+_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="readyz")
+_lock = threading.Lock()
+_last_result = None
+
+
+def check_database():
+    connection = connections["default"]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+    finally:
+        # Checks run in pool threads, which have their own connections.
+        connection.close()
+
+
+def check_cache():
+    value = uuid.uuid4().hex
+    cache.set("readyz", value, 10)
+    if cache.get("readyz") != value:
+        raise RuntimeError("Cache did not return the stored value.")
+
+
+def check_media_storage():
+    """Creates the media root of a fresh deploy and checks it is writable."""
+    location = getattr(default_storage, "location", None)
+    if location is None:
+        if not default_storage.exists(""):
+            raise RuntimeError("Media storage root does not exist.")
+        return
+    os.makedirs(location, exist_ok=True)
+    if not os.access(location, os.W_OK):
+        raise RuntimeError("Media storage root is not writable.")
+
+
+READINESS_CHECKS = {
+    "database": check_database,
+    "cache": check_cache,
+    "media_storage": check_media_storage,
+}
+
+
+def run_checks():
+    """Runs every readiness check in parallel, each with a timeout."""
+    timeout = getattr(settings, "READINESS_CHECK_TIMEOUT", 2)
+    started = time.perf_counter()
+    futures = {
+        name: _executor.submit(check) for name, check in READINESS_CHECKS.items()
+    }
+
+    results = {}
+    for name, future in futures.items():
+        remaining = max(timeout - (time.perf_counter() - started), 0)
+        try:
+            future.result(timeout=remaining)
+        except TimeoutError:
+            results[name] = {"ok": False, "error": "timeout"}
+        except Exception as error:
+            results[name] = {"ok": False, "error": str(error)}
+        else:
+            results[name] = {"ok": True}
+    return results
+
+
+def get_readiness():
+    """Returns the latest check results, reusing them for a few seconds."""
+    global _last_result
+    ttl = getattr(settings, "READINESS_CACHE_TTL", 5)
+    with _lock:
+        if _last_result is None or _last_result[0] <= time.monotonic():
+            _last_result = (time.monotonic() + ttl, run_checks())
+        return _last_result[1]
+
+
+def reset_readiness():
+    global _last_result
+    with _lock:
+        _last_result = None
+
+
+def healthz(request):
+    """Liveness: the process is up and serving requests."""
+    return JsonResponse({"status": "ok"})
+
+
+def readyz(request):
+    """Readiness: the database, cache and media storage are reachable."""
+    checks = get_readiness()
+    ready = all(check["ok"] for check in checks.values())
+    return JsonResponse(
+        {"status": "ok" if ready else "unavailable", "checks": checks},
+        status=200 if ready else 503,
+    )
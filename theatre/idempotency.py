@@ -0,0 +1,82 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+from theatre import metrics
+from theatre.models import IdempotencyKey
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(request):
+    """Returns a hash of the method, path and body of the request."""
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    raw = f"{request.method}:{request.path}:{body}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class IdempotentCreateMixin:
+    """Makes ``create`` safe to retry with the same ``Idempotency-Key``.
+
+    The first request with a key runs normally and its response is stored.
+    Retries with the same key and body replay the stored response without
+    creating anything. Concurrent duplicates block on the key row until the
+    first request commits, so only one of them does the work.
+    """
+
+    def create(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if not key:
+            return super().create(request, *args, **kwargs)
+
+        if len(key) > MAX_KEY_LENGTH:
+            return Response(
+                {"detail": f"{IDEMPOTENCY_HEADER} must be at most "
+                           f"{MAX_KEY_LENGTH} characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        fingerprint = request_fingerprint(request)
+        ttl = getattr(settings, "IDEMPOTENCY_KEY_TTL", 60 * 60 * 24)
+
+        with transaction.atomic():
+            record, created = (
+                IdempotencyKey.objects.select_for_update().get_or_create(
+                    user=request.user,
+                    key=key,
+                    defaults={"fingerprint": fingerprint},
+                )
+            )
+
+            if not created and record.is_expired(ttl):
+                record.fingerprint = fingerprint
+                record.created_at = timezone.now()
+                created = True
+
+            metrics.record_cache("idempotency_keys", not created)
+            if not created:
+                if record.fingerprint != fingerprint:
+                    return Response(
+                        {"detail": f"{IDEMPOTENCY_HEADER} was already used "
+                                   f"with a different request."},
+                        status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    )
+                return Response(
+                    record.response_body,
+                    status=record.response_status,
+                    headers={REPLAYED_HEADER: "true"},
+                )
+
+            response = super().create(request, *args, **kwargs)
+            record.response_status = response.status_code
+            record.response_body = response.data
+            record.save()
+
+        return response
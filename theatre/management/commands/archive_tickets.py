@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from theatre.archive import archive_tickets
+
+
+class Command(BaseCommand):
+    help = "move tickets and reservations of past performances to the archive"  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.ARCHIVE_AFTER_DAYS,
+            help="Archive performances shown more than this many days ago.",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.ARCHIVE_BATCH_SIZE
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        tickets_total = reservations_total = 0
+
+        for tickets, reservations in archive_tickets(
+            cutoff, options["batch_size"]
+        ):
+            tickets_total += tickets
+            reservations_total += reservations
+            self.stdout.write(f"Archived {tickets_total} tickets so far...")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {tickets_total} tickets and "
+                f"{reservations_total} reservations."
+            )
+        )
@@ -0,0 +1,116 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from theatre import compression
+from theatre.models import Actor, Play, Performance, TheatreHall
+from theatre.views import ActorViewSet, PerformanceViewSet, PlayViewSet
+
+BENCHMARK_HOST = "benchmark.local"
+ENDPOINTS = (
+    ("actors", ActorViewSet),
+    ("plays", PlayViewSet),
+    ("performances", PerformanceViewSet),
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "measure compressed response sizes and compression time"  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic(), override_settings(
+                ALLOWED_HOSTS=[BENCHMARK_HOST]
+            ):
+                user = self.create_sample_data(options["rows"])
+                self.run_benchmark(user, options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def create_sample_data(self, rows):
+        suffix = uuid.uuid4().hex[:8]
+        hall = TheatreHall.objects.create(
+            name=f"Benchmark hall {suffix}", rows=20, seats_in_row=30
+        )
+        Actor.objects.bulk_create(
+            Actor(first_name=f"Actor {i}", last_name="Benchmark")
+            for i in range(rows)
+        )
+        plays = Play.objects.bulk_create(
+            Play(title=f"Play {i} {suffix}", description="Benchmark")
+            for i in range(rows)
+        )
+        start = datetime(2030, 1, 1, 19, 0)
+        Performance.objects.bulk_create(
+            Performance(
+                play=play,
+                theatre_hall=hall,
+                show_time=start + timedelta(hours=i * 3),
+            )
+            for i, play in enumerate(plays)
+        )
+        return get_user_model().objects.create_user(
+            email=f"benchmark-{suffix}@example.com",
+            password="benchmark",
+        )
+
+    def render(self, viewset, user):
+        view = viewset.as_view({"get": "list"}, throttle_classes=())
+        request = APIRequestFactory().get("/", SERVER_NAME=BENCHMARK_HOST)
+        force_authenticate(request, user=user)
+        response = view(request)
+        response.render()
+        return response.content
+
+    @staticmethod
+    def measure(function, repeat):
+        result = function()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        return result, (time.perf_counter() - started) / repeat * 1000
+
+    def run_benchmark(self, user, repeat):
+        self.stdout.write(
+            f"{'endpoint':<14}{'encoding':<10}{'bytes':>10}{'ratio':>8}"
+            f"{'ms':>9}{'cached ms':>11}"
+        )
+        for name, viewset in ENDPOINTS:
+            content = self.render(viewset, user)
+            self.stdout.write(
+                f"{name:<14}{'identity':<10}{len(content):>10}"
+                f"{1:>8.2f}{0:>9.2f}{0:>11.2f}"
+            )
+            for encoding in compression.available_encodings():
+                compressed, elapsed = self.measure(
+                    lambda: compression.compress(content, encoding), repeat
+                )
+                _, cached = self.measure(
+                    lambda: compression.compress_cached(content, encoding),
+                    repeat,
+                )
+                self.stdout.write(
+                    f"{name:<14}{encoding:<10}{len(compressed):>10}"
+                    f"{len(content) / len(compressed):>8.2f}"
+                    f"{elapsed:>9.2f}{cached:>11.2f}"
+                )
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Cached ms is the cost of a repeated identical response."
+            )
+        )
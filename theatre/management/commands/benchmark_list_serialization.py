@@ -0,0 +1,120 @@
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from theatre.models import Actor, Play, Performance, TheatreHall
+from theatre.renderers import FastJSONRenderer
+from theatre.views import ActorViewSet, PerformanceViewSet, PlayViewSet
+
+BENCHMARK_HOST = "benchmark.local"
+ENDPOINTS = (
+    ("actors", ActorViewSet),
+    ("plays", PlayViewSet),
+    ("performances", PerformanceViewSet),
+)
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "compare DRF and fast list serialization output and speed"  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=1000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic(), override_settings(
+                ALLOWED_HOSTS=[BENCHMARK_HOST]
+            ):
+                user = self.create_sample_data(options["rows"])
+                self.run_benchmark(user, options["repeat"])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def create_sample_data(self, rows):
+        suffix = uuid.uuid4().hex[:8]
+        hall = TheatreHall.objects.create(
+            name=f"Benchmark hall {suffix}", rows=20, seats_in_row=30
+        )
+        Actor.objects.bulk_create(
+            Actor(
+                first_name=f"Actor {i}",
+                last_name="Benchmark",
+                image=f"uploads/images/actor-{i}.jpg" if i % 2 else None,
+            )
+            for i in range(rows)
+        )
+        plays = Play.objects.bulk_create(
+            Play(title=f"Play {i} {suffix}", description="Benchmark")
+            for i in range(rows)
+        )
+        start = datetime(2030, 1, 1, 19, 0)
+        Performance.objects.bulk_create(
+            Performance(
+                play=play,
+                theatre_hall=hall,
+                show_time=start + timedelta(hours=i),
+            )
+            for i, play in enumerate(plays)
+        )
+        return get_user_model().objects.create_user(
+            email=f"benchmark-{suffix}@example.com",
+            password="benchmark",
+        )
+
+    def render(self, view, user):
+        request = APIRequestFactory().get("/", SERVER_NAME=BENCHMARK_HOST)
+        force_authenticate(request, user=user)
+        response = view(request)
+        response.render()
+        return response.content
+
+    def measure(self, view, user, repeat):
+        content = self.render(view, user)
+        started = time.perf_counter()
+        for _ in range(repeat):
+            self.render(view, user)
+        return content, (time.perf_counter() - started) / repeat
+
+    def run_benchmark(self, user, repeat):
+        self.stdout.write(
+            f"{'endpoint':<14}{'bytes':>10}{'drf ms':>10}"
+            f"{'fast ms':>10}{'speedup':>9}"
+        )
+        for name, viewset in ENDPOINTS:
+            drf_view = viewset.as_view(
+                {"get": "list"},
+                throttle_classes=(),
+                renderer_classes=(JSONRenderer,),
+            )
+            fast_view = viewset.as_view(
+                {"get": "list"},
+                throttle_classes=(),
+                renderer_classes=(FastJSONRenderer,),
+            )
+
+            with override_settings(FAST_LIST_SERIALIZATION=False):
+                expected, drf_time = self.measure(drf_view, user, repeat)
+            with override_settings(FAST_LIST_SERIALIZATION=True):
+                content, fast_time = self.measure(fast_view, user, repeat)
+
+            if content != expected:
+                raise CommandError(f"Fast output of {name} differs from DRF.")
+
+            self.stdout.write(
+                f"{name:<14}{len(content):>10}{drf_time * 1000:>10.1f}"
+                f"{fast_time * 1000:>10.1f}{drf_time / fast_time:>8.1f}x"
+            )
+        self.stdout.write(self.style.SUCCESS("Output is byte-for-byte identical."))
@@ -0,0 +1,11 @@
+from django.core.management import BaseCommand
+
+from theatre.schema import build_schema_files
+
+
+class Command(BaseCommand):
+    help = "generate the OpenAPI schema served at /api/schema/"  # noqa
+
+    def handle(self, *args, **options):
+        for path in build_schema_files():
+            self.stdout.write(self.style.SUCCESS(f"Schema written to {path}"))
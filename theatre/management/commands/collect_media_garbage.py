@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from theatre.media import collect_garbage
+
+
+class Command(BaseCommand):
+    help = "delete uploaded files that no row references"  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--grace-seconds",
+            type=int,
+            default=settings.MEDIA_GC_GRACE_SECONDS,
+            help="Keep unreferenced files modified more recently than this.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="List the files without deleting them.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = collect_garbage(
+            grace_seconds=options["grace_seconds"],
+            dry_run=options["dry_run"],
+        )
+        for name in deleted:
+            self.stdout.write(name)
+
+        verb = "Would delete" if options["dry_run"] else "Deleted"
+        self.stdout.write(
+            self.style.SUCCESS(f"{verb} {len(deleted)} unreferenced files.")
+        )
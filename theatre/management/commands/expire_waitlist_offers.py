@@ -0,0 +1,13 @@
+from django.core.management import BaseCommand
+
+from theatre import waitlist
+
+
+class Command(BaseCommand):
+    help = "release seats of waitlist offers not claimed in time"  # noqa
+
+    def handle(self, *args, **options):
+        expired = waitlist.expire_offers()
+        self.stdout.write(
+            self.style.SUCCESS(f"Expired {expired} waitlist offers.")
+        )
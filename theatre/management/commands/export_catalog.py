@@ -0,0 +1,27 @@
+from django.core.management import BaseCommand
+
+from theatre.catalog import FORMATS, export_lines
+
+
+class Command(BaseCommand):
+    help = "export genres, actors and plays as JSONL or CSV"  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format", dest="file_format", choices=FORMATS, default="jsonl"
+        )
+        parser.add_argument(
+            "--output", help="File to write to, standard output by default."
+        )
+
+    def handle(self, *args, **options):
+        if options["output"] is None:
+            for line in export_lines(options["file_format"]):
+                self.stdout.write(line, ending="")
+            return
+
+        with open(options["output"], "w", newline="", encoding="utf-8") as file:
+            file.writelines(export_lines(options["file_format"]))
+        self.stdout.write(
+            self.style.SUCCESS(f"Catalog written to {options['output']}")
+        )
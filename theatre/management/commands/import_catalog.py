@@ -0,0 +1,54 @@
+import json
+
+from django.core.management import BaseCommand, CommandError
+
+from theatre.catalog import FORMATS, CatalogError, import_catalog, read_records
+
+
+class Command(BaseCommand):
+    help = "import genres, actors and plays from a JSONL or CSV file"  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=FORMATS,
+            help="File format, by default taken from the file extension.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report the changes without saving them.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_format = options["file_format"] or path.rsplit(".", 1)[-1]
+        if file_format not in FORMATS:
+            raise CommandError("Use --format to choose jsonl or csv.")
+
+        with open(path, newline="", encoding="utf-8") as file:
+            try:
+                stats = import_catalog(
+                    read_records(file, file_format),
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                )
+            except CatalogError as error:
+                if options["dry_run"]:
+                    raise CommandError(str(error))
+                self.stdout.write(json.dumps(error.stats, indent=2))
+                raise CommandError(
+                    f"{error} {error.stats['records']} records of earlier "
+                    f"batches were imported."
+                )
+
+        self.stdout.write(json.dumps(stats, indent=2))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{'Checked' if options['dry_run'] else 'Imported'} "
+                f"{stats['records']} records."
+            )
+        )
@@ -0,0 +1,69 @@
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+STARTUP_CODE = (
+    "import django; django.setup(); "
+    "import {wsgi}; "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+
+def parse_importtime(output):
+    """Parses ``python -X importtime`` output into (module, self, total)."""
+    modules = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        modules.append(
+            (module.strip(), int(self_us) / 1000, int(cumulative_us) / 1000)
+        )
+    return modules
+
+
+class Command(BaseCommand):
+    help = "measure import time of a worker boot"  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument(
+            "--max-ms",
+            type=float,
+            help="Fail if the imports take longer than this many milliseconds.",
+        )
+
+    def handle(self, *args, **options):
+        wsgi_module = settings.WSGI_APPLICATION.rsplit(".", 1)[0]
+        result = subprocess.run(
+            [
+                sys.executable,
+                "-X",
+                "importtime",
+                "-c",
+                STARTUP_CODE.format(wsgi=wsgi_module),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(result.stderr)
+
+        modules = parse_importtime(result.stderr)
+        total_ms = sum(self_ms for _, self_ms, _ in modules)
+
+        self.stdout.write(f"{'cumulative ms':>14}{'self ms':>10}  module")
+        slowest = sorted(modules, key=lambda module: module[2], reverse=True)
+        for module, self_ms, cumulative_ms in slowest[:options["top"]]:
+            self.stdout.write(f"{cumulative_ms:>14.1f}{self_ms:>10.1f}  {module}")
+        self.stdout.write(
+            f"Imported {len(modules)} modules in {total_ms:.1f} ms."
+        )
+
+        if options["max_ms"] is not None and total_ms > options["max_ms"]:
+            raise CommandError(
+                f"Startup imports took {total_ms:.1f} ms, "
+                f"more than {options['max_ms']:.1f} ms."
+            )
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from theatre.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = "delete idempotency keys older than IDEMPOTENCY_KEY_TTL"  # noqa
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+        deleted, _ = IdempotencyKey.objects.filter(
+            created_at__lt=cutoff
+        ).delete()
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} expired idempotency keys.")
+        )
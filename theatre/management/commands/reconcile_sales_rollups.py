@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.utils import timezone
+
+from theatre.sales_rollups import reconcile
+
+
+class Command(BaseCommand):
+    help = "recompute sales rollups from tickets"  # noqa
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--from",
+            dest="date_from",
+            type=date.fromisoformat,
+            help="First day to recompute (YYYY-MM-DD). By default "
+                 "SALES_ROLLUP_RECONCILE_DAYS ago.",
+        )
+        parser.add_argument(
+            "--to",
+            dest="date_to",
+            type=date.fromisoformat,
+            help="Last day to recompute (YYYY-MM-DD). By default no limit.",
+        )
+        parser.add_argument(
+            "--all", action="store_true", help="Recompute every rollup."
+        )
+
+    def handle(self, *args, **options):
+        date_from, date_to = options["date_from"], options["date_to"]
+        if options["all"]:
+            date_from = date_to = None
+        elif date_from is None:
+            date_from = timezone.now().date() - timedelta(
+                days=settings.SALES_ROLLUP_RECONCILE_DAYS
+            )
+
+        count = reconcile(date_from, date_to)
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {count} rollups."))
@@ -0,0 +1,13 @@
+from django.core.management import BaseCommand
+
+from theatre.performance_cards import rebuild_all
+
+
+class Command(BaseCommand):
+    help = "rebuild performance cards for all upcoming performances"  # noqa
+
+    def handle(self, *args, **options):
+        count = rebuild_all()
+        self.stdout.write(
+            self.style.SUCCESS(f"Refreshed {count} performance cards.")
+        )
@@ -1,33 +1,45 @@
+import random
 import time
-from sqlite3 import OperationalError
 
-from django.core.management import BaseCommand
+from django.core.management import BaseCommand, CommandError
 from django.db import connections
+from django.db.utils import OperationalError
+
+
+def backoff_delay(attempt, base_delay, max_delay):
+    """Exponential backoff with full jitter for the given attempt (from 1)."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** (attempt - 1)))
 
 
 class Command(BaseCommand):
     help = "wait for database to be ready"  # noqa
 
+    def add_arguments(self, parser):
+        parser.add_argument("--max-attempts", type=int, default=30)
+        parser.add_argument("--base-delay", type=float, default=0.5)
+        parser.add_argument("--max-delay", type=float, default=10)
+
     def handle(self, *args, **options):
         self.stdout.write("Waiting for database to be ready...")
-        database_connection = None
-        max_attempts = 30
-        attempt = 0
+        max_attempts = options["max_attempts"]
 
-        while database_connection is None and attempt < max_attempts:
+        for attempt in range(1, max_attempts + 1):
             try:
-                database_connection = connections["default"]
-                database_connection.cursor()
+                connections["default"].ensure_connection()
             except OperationalError:
-                attempt += 1
+                if attempt == max_attempts:
+                    break
+                delay = backoff_delay(
+                    attempt, options["base_delay"], options["max_delay"]
+                )
                 self.stdout.write(
-                    f"Database unavailable,"
-                    f" waiting 1 second... (Attempt {attempt}/{max_attempts})"
+                    f"Database unavailable, waiting {delay:.1f} seconds..."
+                    f" (Attempt {attempt}/{max_attempts})"
                 )
-                time.sleep(1)
-
-            if database_connection is None:
-                self.stdout.write(self.style.ERROR("Database not ready."))
-                raise Exception("Database is not available.")
+                time.sleep(delay)
+            else:
+                self.stdout.write(self.style.SUCCESS("Database ready."))
+                return
 
-            self.stdout.write(self.style.SUCCESS("Database ready."))
+        self.stdout.write(self.style.ERROR("Database not ready."))
+        raise CommandError("Database is not available.")
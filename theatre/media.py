@@ -0,0 +1,239 @@
+import hashlib
+import mimetypes
+import os
+import re
+import time
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.db import models
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpResponse,
+    HttpResponseNotModified,
+    StreamingHttpResponse,
+)
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.decorators.http import require_safe
+
+CHUNK_SIZE = 64 * 1024
+INCOMING_DIR = ".incoming"
+DIGEST_NAME_RE = re.compile(r"^[0-9a-f]{64}$")
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def hashed_name(directory, digest, extension):
+    """Spreads files over two levels of directories by digest prefix."""
+    return os.path.join(
+        directory, digest[:2], digest[2:4], f"{digest}{extension.lower()}"
+    )
+
+
+def is_hashed_name(name):
+    stem = os.path.splitext(os.path.basename(name))[0]
+    return bool(DIGEST_NAME_RE.match(stem))
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """File storage that names files by the SHA-256 of their content.
+
+    The directory and extension of the requested name are kept and the
+    file name is replaced by the digest, so identical uploads share one
+    file and a name always refers to the same bytes. Uploads are written
+    in chunks to a temporary file that is renamed into place.
+
+    Files are never overwritten nor deleted when a row changes; see
+    ``collect_garbage``.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Identical content maps to the same name, never to a new one.
+        return name
+
+    def _save(self, name, content):
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1]
+        incoming = self.path(
+            os.path.join(INCOMING_DIR, f"{uuid.uuid4().hex}.part")
+        )
+        os.makedirs(os.path.dirname(incoming), exist_ok=True)
+
+        digest = hashlib.sha256()
+        if hasattr(content, "temporary_file_path"):
+            # Already streamed to disk by the upload handler: hash it and
+            # move it, without copying the data.
+            with open(content.temporary_file_path(), "rb") as source:
+                while chunk := source.read(CHUNK_SIZE):
+                    digest.update(chunk)
+            file_move_safe(content.temporary_file_path(), incoming)
+        else:
+            with open(incoming, "wb") as target:
+                for chunk in content.chunks(CHUNK_SIZE):
+                    digest.update(chunk)
+                    target.write(chunk)
+
+        name = hashed_name(directory, digest.hexdigest(), extension)
+        full_path = self.path(name)
+        if os.path.exists(full_path):
+            os.remove(incoming)
+            # A fresh mtime keeps the garbage collector off the file while
+            # the row referencing it is being saved.
+            os.utime(full_path)
+        else:
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(incoming, self.file_permissions_mode)
+            os.replace(incoming, full_path)
+        return name
+
+
+def referenced_names():
+    """Returns the names stored in every file field of every model."""
+    names = set()
+    for model in apps.get_models():
+        for field in model._meta.get_fields():
+            if isinstance(field, models.FileField) and field.concrete:
+                names.update(
+                    model._default_manager.exclude(
+                        **{field.name: ""}
+                    ).exclude(
+                        **{f"{field.name}__isnull": True}
+                    ).values_list(field.name, flat=True).iterator()
+                )
+    return names
+
+
+def walk_files(storage, directory=""):
+    directories, files = storage.listdir(directory)
+    for name in files:
+        yield os.path.join(directory, name)
+    for child in directories:
+        yield from walk_files(storage, os.path.join(directory, child))
+
+
+def collect_garbage(storage=None, grace_seconds=None, dry_run=False):
+    """Deletes stored files that no row references.
+
+    Files modified within ``grace_seconds`` are kept, so an upload whose
+    row is not committed yet survives. Leftover partial uploads are
+    removed after the same delay. Returns the deleted names.
+    """
+    storage = storage or default_storage
+    if grace_seconds is None:
+        grace_seconds = getattr(settings, "MEDIA_GC_GRACE_SECONDS", 86400)
+    if not storage.exists(""):
+        return []
+
+    referenced = referenced_names()
+    cutoff = time.time() - grace_seconds
+    deleted = []
+    for name in walk_files(storage):
+        if name in referenced:
+            continue
+        if os.path.getmtime(storage.path(name)) > cutoff:
+            continue
+        if not dry_run:
+            storage.delete(name)
+        deleted.append(name)
+    return deleted
+
+
+def parse_range(header, size):
+    """Returns the ``(start, end)`` of a single byte range, inclusive.
+
+    Returns ``None`` for a missing or multi-range header, which is served
+    as a full response, and raises ``ValueError`` for unsatisfiable ones.
+    """
+    match = RANGE_RE.match(header or "")
+    if match is None:
+        return None
+    start, end = match.groups()
+    if not start:
+        if not end:
+            return None
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    if start > end or start >= size:
+        raise ValueError
+    return start, end
+
+
+def read_range(path, start, length):
+    with open(path, "rb") as file:
+        file.seek(start)
+        while length > 0:
+            chunk = file.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                return
+            length -= len(chunk)
+            yield chunk
+
+
+@require_safe
+def serve_media(request, path):
+    """Serves an uploaded file with validators and byte ranges.
+
+    Content-addressed files never change, so they are cacheable forever
+    and their digest is the ETag. Other files are revalidated.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    if path.startswith(INCOMING_DIR) or not os.path.isfile(full_path):
+        raise Http404
+
+    stat = os.stat(full_path)
+    if is_hashed_name(path):
+        etag = f'"{os.path.splitext(os.path.basename(path))[0]}"'
+        cache_control = (
+            f"public, max-age="
+            f"{getattr(settings, 'MEDIA_CACHE_MAX_AGE', 31536000)}, immutable"
+        )
+    else:
+        etag = f'"{int(stat.st_mtime):x}-{stat.st_size:x}"'
+        cache_control = "public, no-cache"
+
+    if etag in request.headers.get("If-None-Match", ""):
+        response = HttpResponseNotModified()
+    else:
+        content_type = mimetypes.guess_type(full_path)[0]
+        content_type = content_type or "application/octet-stream"
+        try:
+            byte_range = None
+            if request.headers.get("If-Range", etag) == etag:
+                byte_range = parse_range(
+                    request.headers.get("Range"), stat.st_size
+                )
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{stat.st_size}"
+            return response
+
+        if byte_range is None:
+            response = FileResponse(
+                open(full_path, "rb"), content_type=content_type
+            )
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                read_range(full_path, start, end - start + 1),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Length"] = str(end - start + 1)
+            response["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+        response["Accept-Ranges"] = "bytes"
+        response["Last-Modified"] = http_date(stat.st_mtime)
+
+    response["ETag"] = etag
+    response["Cache-Control"] = cache_control
+    return response
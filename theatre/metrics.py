@@ -0,0 +1,107 @@
+import os
+
+from django.db import transaction
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+REQUESTS = Counter(
+    "theatre_http_requests_total",
+    "HTTP requests by route, action, method and status.",
+    ["route", "action", "method", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "theatre_http_request_duration_seconds",
+    "HTTP request latency by route and action.",
+    ["route", "action"],
+)
+REQUEST_DB_QUERIES = Histogram(
+    "theatre_http_request_db_queries",
+    "Database queries executed per HTTP request.",
+    ["route", "action"],
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100, 250),
+)
+RESERVATIONS = Counter(
+    "theatre_reservations_total",
+    "Reservation attempts by outcome.",
+    ["outcome"],
+)
+TICKETS_SOLD = Counter(
+    "theatre_tickets_sold_total",
+    "Tickets sold per performance.",
+    ["performance"],
+)
+TICKETS_CANCELLED = Counter(
+    "theatre_tickets_cancelled_total",
+    "Tickets given back by cancellations per performance.",
+    ["performance"],
+)
+CACHE_REQUESTS = Counter(
+    "theatre_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+
+RESERVATION_SUCCESS = RESERVATIONS.labels("success")
+RESERVATION_CONFLICT = RESERVATIONS.labels("conflict")
+RESERVATION_FAILURE = RESERVATIONS.labels("failure")
+
+CONTENT_TYPE = CONTENT_TYPE_LATEST
+
+_children = {}
+
+
+def child(metric, *labels):
+    """Returns the labelled child of ``metric``, binding it only once.
+
+    ``labels()`` takes a lock inside prometheus_client; after the first
+    call the child is read from a plain dict, which needs no lock.
+    """
+    key = (metric, labels)
+    try:
+        return _children[key]
+    except KeyError:
+        _children[key] = metric.labels(*labels)
+        return _children[key]
+
+
+def record_request(route, action, method, status, duration, db_queries):
+    child(REQUESTS, route, action, method, str(status)).inc()
+    child(REQUEST_LATENCY, route, action).observe(duration)
+    child(REQUEST_DB_QUERIES, route, action).observe(db_queries)
+
+
+def record_cache(cache, hit):
+    child(CACHE_REQUESTS, cache, "hit" if hit else "miss").inc()
+
+
+def record_tickets_sold_on_commit(performance_id, count):
+    transaction.on_commit(
+        lambda: child(TICKETS_SOLD, str(performance_id)).inc(count)
+    )
+
+
+def record_tickets_cancelled_on_commit(performance_id, count):
+    transaction.on_commit(
+        lambda: child(TICKETS_CANCELLED, str(performance_id)).inc(count)
+    )
+
+
+def render():
+    """Returns the exposition of all metrics, merged across processes.
+
+    When ``PROMETHEUS_MULTIPROC_DIR`` is set (e.g. under gunicorn), each
+    worker writes its values to that directory and they are summed here.
+    """
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
@@ -0,0 +1,86 @@
+import time
+
+from django.db import connection
+
+from theatre import compression, metrics, tracing
+
+
+class QueryCounter:
+    """Database execute wrapper that only counts queries."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def resolve_route(request):
+    """Returns the (route, action) labels for a handled request.
+
+    The route is the URL name (e.g. ``theatre:performance-list``) so the
+    number of label values stays bounded.
+    """
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched", request.method.lower()
+    actions = getattr(match.func, "actions", None) or {}
+    action = actions.get(request.method.lower(), request.method.lower())
+    return match.view_name, action
+
+
+class MetricsMiddleware:
+    """Records request count, latency and DB queries per route and action."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        duration = time.perf_counter() - started
+
+        route, action = resolve_route(request)
+        metrics.record_request(
+            route,
+            action,
+            request.method,
+            response.status_code,
+            duration,
+            queries.count,
+        )
+        return response
+
+
+class TracingMiddleware:
+    """Traces a sample of requests, including every SQL statement."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not tracing.should_sample():
+            return self.get_response(request)
+
+        with tracing.start_trace(f"{request.method} {request.path}") as trace:
+            with connection.execute_wrapper(tracing.trace_sql):
+                response = self.get_response(request)
+            route, action = resolve_route(request)
+            trace.attributes.update(
+                route=route, action=action, status=response.status_code
+            )
+        return response
+
+
+class CompressionMiddleware:
+    """Compresses responses with brotli or gzip, as the client accepts."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        return compression.compress_response(request, response)
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 22:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theatre', '0002_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='performance',
+            name='show_time',
+            field=models.DateTimeField(db_index=True),
+        ),
+    ]
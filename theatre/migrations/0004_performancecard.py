@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2026-10-18 22:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theatre', '0003_performance_show_time_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PerformanceCard',
+            fields=[
+                ('performance', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='card', serialize=False, to='theatre.performance')),
+                ('play_id', models.BigIntegerField(db_index=True)),
+                ('play_title', models.CharField(max_length=255)),
+                ('play_image', models.CharField(blank=True, max_length=255)),
+                ('genres', models.JSONField(default=list)),
+                ('theatre_hall_id', models.BigIntegerField(db_index=True)),
+                ('theatre_hall_name', models.CharField(max_length=255)),
+                ('show_time', models.DateTimeField(db_index=True)),
+                ('capacity', models.IntegerField()),
+                ('available_seats_count', models.IntegerField()),
+            ],
+            options={
+                'ordering': ('show_time',),
+            },
+        ),
+    ]
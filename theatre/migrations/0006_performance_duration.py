@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-18 22:50
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theatre', '0005_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='performance',
+            name='duration',
+            field=models.DurationField(default=datetime.timedelta(seconds=7200)),
+        ),
+    ]
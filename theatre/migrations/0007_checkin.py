@@ -0,0 +1,24 @@
+# Generated by Django 5.1.1 on 2026-10-18 22:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theatre', '0006_performance_duration'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CheckIn',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ticket_id', models.BigIntegerField(unique=True)),
+                ('performance_id', models.BigIntegerField(db_index=True)),
+                ('row', models.IntegerField()),
+                ('seat', models.IntegerField()),
+                ('checked_in_at', models.DateTimeField()),
+            ],
+        ),
+    ]
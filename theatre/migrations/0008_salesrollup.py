@@ -0,0 +1,29 @@
+# Generated by Django 5.1.1 on 2026-10-18 22:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theatre', '0007_checkin'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('play_id', models.BigIntegerField()),
+                ('theatre_hall_id', models.BigIntegerField()),
+                ('day', models.DateField()),
+                ('performances_count', models.IntegerField(default=0)),
+                ('capacity', models.IntegerField(default=0)),
+                ('tickets_sold', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['day'], name='theatre_sal_day_950f62_idx')],
+                'constraints': [models.UniqueConstraint(fields=('play_id', 'theatre_hall_id', 'day'), name='unique_sales_rollup')],
+            },
+        ),
+    ]
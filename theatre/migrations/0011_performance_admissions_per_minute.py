@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-18 23:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theatre', '0010_waitlistentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='performance',
+            name='admissions_per_minute',
+            field=models.PositiveIntegerField(blank=True, help_text='Opens a waiting room admitting this many users a minute to reservations. Leave empty for open sales.', null=True),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-18 23:29
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theatre', '0011_performance_admissions_per_minute'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Cancellation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reservation_id', models.BigIntegerField(db_index=True)),
+                ('user_id', models.BigIntegerField(db_index=True)),
+                ('tickets', models.JSONField(default=list)),
+                ('whole_reservation', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+        ),
+    ]
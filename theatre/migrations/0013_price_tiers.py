@@ -0,0 +1,51 @@
+# Generated by Django 5.1.1 on 2026-10-18 23:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theatre', '0012_cancellation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='theatrehall',
+            name='seat_zones',
+            field=models.TextField(blank=True, help_text='One line per row with the price tier code of each seat, e.g. AAABBBAAA. Empty puts every seat in tier A.'),
+        ),
+        migrations.AddField(
+            model_name='ticket',
+            name='price',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=8, null=True),
+        ),
+        migrations.CreateModel(
+            name='PriceTier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('code', models.CharField(max_length=1)),
+                ('name', models.CharField(max_length=255)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('theatre_hall', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='price_tiers', to='theatre.theatrehall')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PerformancePrice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('price', models.DecimalField(decimal_places=2, max_digits=8)),
+                ('performance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='prices', to='theatre.performance')),
+                ('price_tier', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='performance_prices', to='theatre.pricetier')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='pricetier',
+            constraint=models.UniqueConstraint(fields=('theatre_hall', 'code'), name='unique_price_tier'),
+        ),
+        migrations.AddConstraint(
+            model_name='performanceprice',
+            constraint=models.UniqueConstraint(fields=('performance', 'price_tier'), name='unique_performance_price'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.1.1 on 2026-10-18 23:39
+
+from django.db import migrations, models
+
+from theatre.seat_layout import pack
+
+
+def fill_seat_masks(apps, schema_editor):
+    """Existing halls are full rectangles."""
+    TheatreHall = apps.get_model("theatre", "TheatreHall")
+    for hall in TheatreHall.objects.all():
+        size = hall.rows * hall.seats_in_row
+        hall.seat_mask = pack((1 << size) - 1, size)
+        hall.capacity = size
+        hall.save(update_fields=["seat_mask", "capacity"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('theatre', '0013_price_tiers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='theatrehall',
+            name='capacity',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='theatrehall',
+            name='seat_layout',
+            field=models.TextField(blank=True, help_text='One line per row of seat runs and, prefixed with -, gap runs, e.g. 4 -2 4 for an aisle between two blocks of four. Empty makes every seat of the rectangle exist.'),
+        ),
+        migrations.AddField(
+            model_name='theatrehall',
+            name='seat_mask',
+            field=models.BinaryField(default=b''),
+        ),
+        migrations.RunPython(fill_seat_masks, migrations.RunPython.noop),
+    ]
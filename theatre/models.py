@@ -1,24 +1,21 @@
 import os
-import uuid
+from datetime import timedelta
 
+from django.core import exceptions
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.db.models import ForeignKey, UniqueConstraint
-from django.utils.text import slugify
+from django.utils import timezone
 from rest_framework.exceptions import ValidationError
 
+from theatre.seat_layout import SeatMask, pack, parse
 from TheatreAPIService import settings
 
 
 def create_custom_path(instance, filename):
+    """Keeps the extension only: the storage names files by content hash."""
     _, ext = os.path.splitext(filename)
-    if isinstance(instance, Play):
-        return os.path.join(
-            "uploads/images/", f"{slugify(instance.title)}-{uuid.uuid4()}{ext}"
-        )
-    if isinstance(instance, Actor):
-        return os.path.join(
-            "uploads/images/", f"{slugify(instance.last_name)}-{uuid.uuid4()}{ext}"
-        )
+    return os.path.join("uploads/images/", f"upload{ext.lower()}")
 
 
 class Actor(models.Model):
@@ -60,13 +57,54 @@ class TheatreHall(models.Model):
     name = models.CharField(max_length=255, unique=True)
     rows = models.IntegerField()
     seats_in_row = models.IntegerField()
+    seat_zones = models.TextField(
+        blank=True,
+        help_text="One line per row with the price tier code of each "
+                  "seat, e.g. AAABBBAAA. Empty puts every seat in tier A.",
+    )
+    seat_layout = models.TextField(
+        blank=True,
+        help_text="One line per row of seat runs and, prefixed with -, "
+                  "gap runs, e.g. 4 -2 4 for an aisle between two blocks "
+                  "of four. Empty makes every seat of the rectangle exist.",
+    )
+    seat_mask = models.BinaryField(editable=False, default=b"")
+    capacity = models.PositiveIntegerField(editable=False, default=0)
 
     def __str__(self):
         return self.name
 
+    def clean(self):
+        """Checks the seat layout, and that the seat zones cover every
+        seat of the hall."""
+        try:
+            parse(self.seat_layout, self.rows, self.seats_in_row)
+        except ValueError as error:
+            raise exceptions.ValidationError({"seat_layout": str(error)})
+        if not self.seat_zones:
+            return
+        lines = self.seat_zones.split()
+        if len(lines) != self.rows or any(
+            len(line) != self.seats_in_row for line in lines
+        ):
+            raise exceptions.ValidationError({
+                "seat_zones": f"Must have {self.rows} lines of "
+                              f"{self.seats_in_row} tier codes."
+            })
+
+    def save(self, *args, **kwargs):
+        """Packs the layout into the seat mask and counts its seats."""
+        mask = parse(self.seat_layout, self.rows, self.seats_in_row)
+        self.seat_mask = pack(mask, self.rows * self.seats_in_row)
+        self.capacity = mask.bit_count()
+        return super().save(*args, **kwargs)
+
+    def get_seat_mask(self):
+        return SeatMask.from_hall(self)
+
 
 class Reservation(models.Model):
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -84,7 +122,14 @@ class Performance(models.Model):
         on_delete=models.CASCADE,
         related_name="performances",
     )
-    show_time = models.DateTimeField()
+    show_time = models.DateTimeField(db_index=True)
+    duration = models.DurationField(default=timedelta(hours=2))
+    admissions_per_minute = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text="Opens a waiting room admitting this many users a minute "
+                  "to reservations. Leave empty for open sales.",
+    )
 
     def __str__(self):
         return (f"{self.play}."
@@ -99,17 +144,8 @@ class Performance(models.Model):
 
     def get_free_seats(self):
         """Returns a list of free seats for this performance."""
-        total_rows = self.theatre_hall.rows
-        seats_in_row = self.theatre_hall.seats_in_row
-        occupied_seats = set(self.get_taken_seats())
-
-        free_seats = []
-
-        for row in range(1, total_rows + 1):
-            for seat in range(1, seats_in_row + 1):
-                if (row, seat) not in occupied_seats:
-                    free_seats.append((row, seat))
-        return free_seats
+        seat_mask = self.theatre_hall.get_seat_mask()
+        return seat_mask.free_seats(self.get_taken_seats())
 
 
 class Ticket(models.Model):
@@ -125,6 +161,9 @@ class Ticket(models.Model):
         on_delete=models.CASCADE,
         related_name="tickets",
     )
+    price = models.DecimalField(
+        max_digits=8, decimal_places=2, null=True, blank=True
+    )
 
     class Meta:
         constraints = [
@@ -138,8 +177,11 @@ class Ticket(models.Model):
         return f"{self.performance}. Seat: {self.seat}, row: {self.row}"
 
     @staticmethod
-    def validate_seat(row, total_rows, seat, num_seats, error_to_raise):
-        """Checks if the row and seat is within the valid range."""
+    def validate_seat(
+        row, total_rows, seat, num_seats, error_to_raise, seat_mask=None
+    ):
+        """Checks if the row and seat is within the valid range, and is a
+        seat of the hall's layout."""
         if not (1 <= seat <= num_seats):
             raise error_to_raise(
                 {"seat": f"must be in range [1, {num_seats}]"})
@@ -148,13 +190,21 @@ class Ticket(models.Model):
             raise error_to_raise(
                 {"row": f"must be in range [1, {total_rows}]"})
 
+        if seat_mask is not None and not seat_mask.has(row, seat):
+            raise error_to_raise(
+                {"seat": f"There is no seat {seat} in row {row}."})
+
     def clean(self):
         """Checks whether the seat and the row on the ticket is correct,
         based on the total number of seats in the theater hall."""
-        total_rows = self.performance.theatre_hall.rows
-        seats_in_row = self.performance.theatre_hall.seats_in_row
+        theatre_hall = self.performance.theatre_hall
         Ticket.validate_seat(
-            self.row, total_rows, self.seat, seats_in_row, ValidationError
+            self.row,
+            theatre_hall.rows,
+            self.seat,
+            theatre_hall.seats_in_row,
+            ValidationError,
+            theatre_hall.get_seat_mask(),
         )
 
         """Checking if this seat is already booked."""
@@ -171,3 +221,273 @@ class Ticket(models.Model):
     def save(self, *args, **kwargs):
         self.full_clean()
         return super(Ticket, self).save(*args, **kwargs)
+
+
+class PerformanceCard(models.Model):
+    """Denormalized, read-only view of an upcoming performance.
+
+    Maintained by ``theatre.signals`` so schedule listings can be served
+    from this single table. Rebuild with ``refresh_performance_cards``.
+    """
+    performance = models.OneToOneField(
+        Performance,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="card",
+    )
+    play_id = models.BigIntegerField(db_index=True)
+    play_title = models.CharField(max_length=255)
+    play_image = models.CharField(max_length=255, blank=True)
+    genres = models.JSONField(default=list)
+    theatre_hall_id = models.BigIntegerField(db_index=True)
+    theatre_hall_name = models.CharField(max_length=255)
+    show_time = models.DateTimeField(db_index=True)
+    capacity = models.IntegerField()
+    available_seats_count = models.IntegerField()
+
+    class Meta:
+        ordering = ("show_time",)
+
+    def __str__(self):
+        return f"{self.play_title}. Show time: {self.show_time}"
+
+
+class IdempotencyKey(models.Model):
+    """Stored outcome of a create request sent with an ``Idempotency-Key``."""
+    key = models.CharField(max_length=255)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="idempotency_keys",
+    )
+    fingerprint = models.CharField(max_length=64)
+    response_status = models.PositiveSmallIntegerField(null=True)
+    response_body = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["user", "key"],
+                name="unique_idempotency_key"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.user_id}: {self.key}"
+
+    def is_expired(self, ttl):
+        """Checks whether the key is older than ``ttl`` seconds."""
+        return self.created_at < timezone.now() - timedelta(seconds=ttl)
+
+
+class ArchivedReservation(models.Model):
+    """Reservation moved out of the live table by ``archive_tickets``."""
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_reservations",
+    )
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return str(self.created_at)
+
+
+class ArchivedTicket(models.Model):
+    """Ticket of a past performance moved out of the live table.
+
+    Keeps plain ids instead of foreign keys, plus the show time and the
+    play and hall of the performance, so reports need no joins.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    performance_id = models.BigIntegerField(db_index=True)
+    reservation_id = models.BigIntegerField(db_index=True)
+    play_id = models.BigIntegerField()
+    theatre_hall_id = models.BigIntegerField()
+    show_time = models.DateTimeField(db_index=True)
+    price = models.DecimalField(
+        max_digits=8, decimal_places=2, null=True, blank=True
+    )
+    archived_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return f"{self.performance_id}. Seat: {self.seat}, row: {self.row}"
+
+
+class CheckIn(models.Model):
+    """Admission of a ticket at the door.
+
+    Stores the ticket as a plain id, since check-ins are written in batches
+    from signed tokens without loading the tickets.
+    """
+    ticket_id = models.BigIntegerField(unique=True)
+    performance_id = models.BigIntegerField(db_index=True)
+    row = models.IntegerField()
+    seat = models.IntegerField()
+    checked_in_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.performance_id}. Seat: {self.seat}, row: {self.row}"
+
+
+class SalesRollup(models.Model):
+    """Tickets sold for one play in one hall on one day.
+
+    Kept up to date by signals on ticket commit and recomputed by
+    ``reconcile_sales_rollups``; analytics read only this table.
+    """
+    play_id = models.BigIntegerField()
+    theatre_hall_id = models.BigIntegerField()
+    day = models.DateField()
+    performances_count = models.IntegerField(default=0)
+    capacity = models.IntegerField(default=0)
+    tickets_sold = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["play_id", "theatre_hall_id", "day"],
+                name="unique_sales_rollup"
+            )
+        ]
+        indexes = [models.Index(fields=["day"])]
+
+    def __str__(self):
+        return f"{self.play_id} in {self.theatre_hall_id} on {self.day}"
+
+
+class WaitlistEntry(models.Model):
+    """Request for seats of a sold-out performance.
+
+    Entries are served first come, first served by ``theatre.waitlist``
+    when seats are released: the seats are held in a reservation, which
+    the user claims before ``expires_at`` or loses to the next entry.
+    """
+    class Status(models.TextChoices):
+        WAITING = "waiting"
+        OFFERED = "offered"
+        CLAIMED = "claimed"
+        EXPIRED = "expired"
+
+    performance = models.ForeignKey(
+        Performance,
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries",
+    )
+    seats_count = models.PositiveSmallIntegerField()
+    status = models.CharField(
+        max_length=16,
+        choices=Status.choices,
+        default=Status.WAITING,
+    )
+    reservation = models.OneToOneField(
+        Reservation,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="waitlist_entry",
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["performance", "user"],
+                condition=models.Q(status__in=["waiting", "offered"]),
+                name="unique_active_waitlist_entry"
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=["performance", "status", "id"],
+                name="waitlist_queue_idx",
+            ),
+            models.Index(
+                fields=["status", "expires_at"],
+                name="waitlist_expiry_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.performance_id}: {self.seats_count} for {self.user_id}"
+
+
+class Cancellation(models.Model):
+    """Append-only record of tickets given back from a reservation.
+
+    Keeps plain ids and the seats of the deleted tickets, so refunds and
+    reports read it without the rows the cancellation removed.
+    """
+    reservation_id = models.BigIntegerField(db_index=True)
+    user_id = models.BigIntegerField(db_index=True)
+    tickets = models.JSONField(default=list)
+    whole_reservation = models.BooleanField(default=False)
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.reservation_id}: {len(self.tickets)} tickets"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Cancellations cannot be changed.")
+        return super().save(*args, **kwargs)
+
+
+class PriceTier(models.Model):
+    """Price of the seats marked with ``code`` in a hall's seat zones."""
+    theatre_hall = models.ForeignKey(
+        TheatreHall,
+        on_delete=models.CASCADE,
+        related_name="price_tiers",
+    )
+    code = models.CharField(max_length=1)
+    name = models.CharField(max_length=255)
+    price = models.DecimalField(max_digits=8, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["theatre_hall", "code"],
+                name="unique_price_tier"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.code}): {self.price}"
+
+
+class PerformancePrice(models.Model):
+    """Price of a tier for one performance, instead of the hall's."""
+    performance = models.ForeignKey(
+        Performance,
+        on_delete=models.CASCADE,
+        related_name="prices",
+    )
+    price_tier = models.ForeignKey(
+        PriceTier,
+        on_delete=models.CASCADE,
+        related_name="performance_prices",
+    )
+    price = models.DecimalField(max_digits=8, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(
+                fields=["performance", "price_tier"],
+                name="unique_performance_price"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.performance_id}: {self.price_tier_id} at {self.price}"
@@ -0,0 +1,52 @@
+import threading
+import weakref
+
+from django.db import transaction
+
+# The batches waiting for a commit, by class and savepoint. Only the
+# connection's on-commit callbacks hold on to a batch, so it leaves this
+# map as soon as Django runs it or drops it on a rollback.
+_pending = threading.local()
+
+
+class CommitBatch:
+    """Work collected during a transaction and done once it commits.
+
+    ``add`` collects into the batch registered under the current savepoint,
+    or registers a new one, so a transaction touching many rows schedules
+    one callback per savepoint. Work collected under a savepoint that rolls
+    back is dropped with its batch. Subclasses implement ``collect`` and
+    ``run``.
+    """
+
+    def __init__(self):
+        self.done = False
+
+    def __call__(self):
+        self.done = True
+        self.run()
+
+    def collect(self, *args):
+        raise NotImplementedError
+
+    def run(self):
+        raise NotImplementedError
+
+    @classmethod
+    def add(cls, *args):
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            batch = cls()
+            batch.collect(*args)
+            batch()
+            return
+
+        if not hasattr(_pending, "batches"):
+            _pending.batches = weakref.WeakValueDictionary()
+        key = (cls, tuple(connection.savepoint_ids))
+        batch = _pending.batches.get(key)
+        if batch is None or batch.done:
+            batch = cls()
+            _pending.batches[key] = batch
+            transaction.on_commit(batch)
+        batch.collect(*args)
@@ -0,0 +1,84 @@
+from django.db.models import Count, F
+from django.utils import timezone
+
+from theatre.models import Performance, PerformanceCard
+
+CARD_FIELDS = (
+    "play_id",
+    "play_title",
+    "play_image",
+    "genres",
+    "theatre_hall_id",
+    "theatre_hall_name",
+    "show_time",
+    "capacity",
+    "available_seats_count",
+)
+
+
+def build_cards(performances):
+    """Builds unsaved cards for the given performances queryset."""
+    performances = (
+        performances
+        .select_related("play", "theatre_hall")
+        .prefetch_related("play__genres")
+        .annotate(tickets_sold=Count("tickets"))
+    )
+    cards = []
+    for performance in performances:
+        play = performance.play
+        hall = performance.theatre_hall
+        capacity = hall.capacity
+        cards.append(PerformanceCard(
+            performance_id=performance.id,
+            play_id=play.id,
+            play_title=play.title,
+            play_image=play.image.url if play.image else "",
+            genres=[genre.name for genre in play.genres.all()],
+            theatre_hall_id=hall.id,
+            theatre_hall_name=hall.name,
+            show_time=performance.show_time,
+            capacity=capacity,
+            available_seats_count=capacity - performance.tickets_sold,
+        ))
+    return cards
+
+
+def refresh_cards(performances):
+    """Upserts cards for upcoming performances and drops past ones."""
+    now = timezone.now()
+    PerformanceCard.objects.filter(
+        performance__in=performances.filter(show_time__lt=now)
+    ).delete()
+    cards = build_cards(performances.filter(show_time__gte=now))
+    PerformanceCard.objects.bulk_create(
+        cards,
+        update_conflicts=True,
+        unique_fields=["performance"],
+        update_fields=CARD_FIELDS,
+    )
+    return len(cards)
+
+
+def refresh_performance(performance_id):
+    refresh_cards(Performance.objects.filter(id=performance_id))
+
+
+def refresh_play(play_id):
+    refresh_cards(Performance.objects.filter(play_id=play_id))
+
+
+def refresh_theatre_hall(theatre_hall_id):
+    refresh_cards(Performance.objects.filter(theatre_hall_id=theatre_hall_id))
+
+
+def change_available_seats(performance_id, delta):
+    """Shifts the free seats of one card without recomputing it."""
+    PerformanceCard.objects.filter(performance_id=performance_id).update(
+        available_seats_count=F("available_seats_count") + delta
+    )
+
+
+def rebuild_all():
+    """Recomputes every card and removes cards of past performances."""
+    return refresh_cards(Performance.objects.all())
@@ -1,5 +1,7 @@
 from rest_framework.permissions import SAFE_METHODS, BasePermission
 
+from theatre.authentication import METRICS_AUTH
+
 
 class IsAdminOrIfAuthenticatedReadOnly(BasePermission):
     def has_permission(self, request, view):
@@ -11,3 +13,11 @@ class IsAdminOrIfAuthenticatedReadOnly(BasePermission):
             )
             or (request.user and request.user.is_staff)
         )
+
+
+class IsAdminOrMetricsScraper(BasePermission):
+    def has_permission(self, request, view):
+        return bool(
+            request.auth == METRICS_AUTH
+            or (request.user and request.user.is_staff)
+        )
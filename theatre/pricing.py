@@ -0,0 +1,173 @@
+from collections import Counter
+from itertools import islice
+
+from django.conf import settings
+from django.core.cache import cache
+
+from theatre.models import PerformancePrice, PriceTier
+from theatre.seat_layout import GAP
+
+DEFAULT_TIER = "A"
+
+
+def get_cache_ttl():
+    return getattr(settings, "PRICE_GRID_CACHE_TTL", 60)
+
+
+def grid_key(theatre_hall_id):
+    return f"price_grid_{theatre_hall_id}"
+
+
+def overrides_key(performance_id):
+    return f"price_overrides_{performance_id}"
+
+
+class PriceGrid:
+    """Price tier of every seat of a hall, and the prices of the tiers.
+
+    ``rows`` holds one string per row with one tier code per seat, so the
+    tier of a seat is two index operations away. ``tiers`` maps a code to
+    its ``(name, price)``; codes without a tier have no price, and
+    ``GAP`` marks positions without a seat. ``capacity`` counts the seats
+    of each code.
+    """
+
+    def __init__(self, rows, tiers, capacity):
+        self.rows = rows
+        self.tiers = tiers
+        self.capacity = capacity
+
+    def with_prices(self, prices):
+        """Returns the grid with some tiers' prices replaced."""
+        tiers = dict(self.tiers)
+        for code, price in prices.items():
+            if code in tiers:
+                tiers[code] = (tiers[code][0], price)
+        return PriceGrid(self.rows, tiers, self.capacity)
+
+    def tier_of(self, row, seat):
+        """Code of the seat; ``GAP`` for seats left out by a resize."""
+        if 1 <= row <= len(self.rows) and 1 <= seat <= len(self.rows[0]):
+            return self.rows[row - 1][seat - 1]
+        return GAP
+
+    def price_of(self, row, seat):
+        tier = self.tiers.get(self.tier_of(row, seat))
+        return tier[1] if tier else None
+
+    def count_by_tier(self, seats):
+        return Counter(self.tier_of(row, seat) for row, seat in seats)
+
+    def total(self, seats):
+        """Sum of the prices of ``seats``, or ``None`` if one has none."""
+        total = 0
+        for code, count in self.count_by_tier(seats).items():
+            if code not in self.tiers:
+                return None
+            total += self.tiers[code][1] * count
+        return total
+
+    def sorted_codes(self):
+        """Codes of the seats, cheapest first; unpriced ones last."""
+        return sorted(
+            self.capacity,
+            key=lambda code: (
+                code not in self.tiers,
+                self.tiers[code][1] if code in self.tiers else 0,
+                code,
+            ),
+        )
+
+    def availability(self, taken_seats):
+        """Capacity and free seats of every tier, cheapest first."""
+        taken = self.count_by_tier(taken_seats)
+        availability = []
+        for code in self.sorted_codes():
+            name, price = self.tiers.get(code, (None, None))
+            availability.append({
+                "code": code,
+                "name": name,
+                "price": price,
+                "capacity": self.capacity[code],
+                "available": self.capacity[code] - taken[code],
+            })
+        return availability
+
+    def cheapest_available(self, taken_seats, count=1):
+        """Returns ``(code, seats)`` of the cheapest tier with ``count`` free
+        seats, or ``None``.
+
+        Free seats are counted per tier first, so only the seats of the
+        chosen tier are listed.
+        """
+        taken_seats = set(taken_seats)
+        taken = self.count_by_tier(taken_seats)
+        for code in self.sorted_codes():
+            if code in self.tiers and self.capacity[code] - taken[code] >= count:
+                free = (
+                    (row, seat)
+                    for row, codes in enumerate(self.rows, start=1)
+                    for seat, seat_code in enumerate(codes, start=1)
+                    if seat_code == code and (row, seat) not in taken_seats
+                )
+                return code, list(islice(free, count))
+        return None
+
+
+def load_hall_grid(theatre_hall):
+    rows = tuple(theatre_hall.seat_zones.split())
+    if len(rows) != theatre_hall.rows or any(
+        len(codes) != theatre_hall.seats_in_row for codes in rows
+    ):
+        # No zones, or zones left over from before the hall was resized.
+        rows = (DEFAULT_TIER * theatre_hall.seats_in_row,) * theatre_hall.rows
+    rows = theatre_hall.get_seat_mask().overlay(rows)
+    capacity = Counter("".join(rows))
+    del capacity[GAP]
+    tiers = {
+        code: (name, price)
+        for code, name, price in PriceTier.objects.filter(
+            theatre_hall_id=theatre_hall.id
+        ).values_list("code", "name", "price")
+    }
+    return rows, tiers, capacity
+
+
+def load_overrides(performance_id):
+    return dict(
+        PerformancePrice.objects.filter(
+            performance_id=performance_id
+        ).values_list("price_tier__code", "price")
+    )
+
+
+def get_grid(performance):
+    """Returns the ``PriceGrid`` of a performance.
+
+    The hall's grid and the performance's prices are cached, so after the
+    first load this makes no queries. Changes drop them from the cache
+    right away, and the ``PRICE_GRID_CACHE_TTL`` bounds how long a worker
+    that does not share the cache can keep stale prices.
+    """
+    hall = performance.theatre_hall
+    keys = (grid_key(hall.id), overrides_key(performance.id))
+    cached = cache.get_many(keys)
+
+    hall_grid = cached.get(keys[0])
+    if hall_grid is None:
+        hall_grid = load_hall_grid(hall)
+        cache.set(keys[0], hall_grid, get_cache_ttl())
+    overrides = cached.get(keys[1])
+    if overrides is None:
+        overrides = load_overrides(performance.id)
+        cache.set(keys[1], overrides, get_cache_ttl())
+
+    return PriceGrid(*hall_grid).with_prices(overrides)
+
+
+def forget_hall(theatre_hall_id):
+    cache.delete(grid_key(theatre_hall_id))
+
+
+def forget_performance(performance_id):
+    cache.delete(overrides_key(performance_id))
@@ -0,0 +1,50 @@
+from rest_framework.renderers import JSONRenderer
+
+from theatre import tracing
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSON renderer that uses orjson when it is installed.
+
+    The output is byte-for-byte the same as ``JSONRenderer`` for compact
+    responses: datetimes, decimals and other non-native types still go
+    through the DRF encoder, and indented or non-UTF-8 output falls back to
+    the stdlib renderer. The only difference is the exponent notation of
+    very large or small floats (``1e16`` instead of ``1e+16``).
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with tracing.span("render", renderer=type(self).__name__):
+            return self.render_json(
+                data, accepted_media_type, renderer_context
+            )
+
+    def render_json(self, data, accepted_media_type, renderer_context):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {})
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except (orjson.JSONEncodeError, TypeError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Same escaping of U+2028 and U+2029 as JSONRenderer.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028")
+            ret = ret.replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
@@ -0,0 +1,116 @@
+from functools import lru_cache
+
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+# Fields whose ``to_representation`` is an identity for the values the
+# database driver already returns.
+PASSTHROUGH_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.PrimaryKeyRelatedField,
+    serializers.SerializerMethodField,
+)
+
+
+class RowSerializer:
+    """Turns ``.values()`` rows into the output of a DRF serializer.
+
+    The serializer's fields are inspected once and compiled into a list of
+    ``(name, lookup, converter)`` entries, so rendering a row is a single
+    dict comprehension instead of DRF's per-field attribute access.
+
+    Only flat serializers are supported: model fields, primary-key
+    relations, files and ``SerializerMethodField``s. A method field is read
+    from an annotation with the same name, which the queryset must provide.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.fields = []
+        self.file_fields = set()
+
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+
+            if isinstance(field, serializers.SerializerMethodField):
+                lookup = name
+            elif isinstance(
+                field, (serializers.BaseSerializer, serializers.ManyRelatedField)
+            ):
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} is nested and "
+                    f"cannot be compiled to a row serializer."
+                )
+            else:
+                lookup = field.source
+
+            if isinstance(field, serializers.FileField):
+                converter = field
+                self.file_fields.add(name)
+            elif isinstance(field, PASSTHROUGH_FIELDS):
+                converter = None
+            else:
+                converter = field.to_representation
+
+            self.fields.append((name, lookup, converter))
+
+        self.lookups = tuple(lookup for _, lookup, _ in self.fields)
+
+    def select(self, names=None):
+        """Returns the fields in ``names``, or all of them when empty."""
+        if not names:
+            return self.fields
+        return [field for field in self.fields if field[0] in names]
+
+    def get_lookups(self, names=None):
+        return tuple(lookup for _, lookup, _ in self.select(names))
+
+    def bind(self, request, names=None):
+        """Returns the per-request list of converters."""
+        fields = []
+        for name, lookup, converter in self.select(names):
+            if name in self.file_fields:
+                converter = self.file_converter(converter, request)
+            fields.append((name, lookup, converter))
+        return fields
+
+    @staticmethod
+    def file_converter(field, request):
+        storage = field.parent.Meta.model._meta.get_field(field.source).storage
+        use_url = getattr(field, "use_url", api_settings.UPLOADED_FILES_USE_URL)
+
+        def to_representation(name):
+            if not name:
+                return None
+            if not use_url:
+                return name
+            url = storage.url(name)
+            if request is not None:
+                return request.build_absolute_uri(url)
+            return url
+
+        return to_representation
+
+    def serialize(self, rows, request=None, names=None):
+        fields = self.bind(request, names)
+        return [
+            {
+                name: (
+                    row[lookup]
+                    if converter is None or row[lookup] is None
+                    else converter(row[lookup])
+                )
+                for name, lookup, converter in fields
+            }
+            for row in rows
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_row_serializer(serializer_class):
+    """Returns the compiled row serializer for a serializer class."""
+    return RowSerializer(serializer_class)
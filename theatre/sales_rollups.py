@@ -0,0 +1,185 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+
+from theatre.models import ArchivedTicket, Performance, SalesRollup, Ticket
+from theatre.on_commit import CommitBatch
+
+ROLLUP_FIELDS = ("performances_count", "capacity", "tickets_sold")
+
+
+def rollup_key(performance):
+    return (
+        performance.play_id,
+        performance.theatre_hall_id,
+        performance.show_time.date(),
+    )
+
+
+def apply_tickets_sold(key, delta):
+    play_id, theatre_hall_id, day = key
+    updated = SalesRollup.objects.filter(
+        play_id=play_id, theatre_hall_id=theatre_hall_id, day=day
+    ).update(tickets_sold=F("tickets_sold") + delta)
+    if not updated:
+        reconcile(day, day, [play_id], [theatre_hall_id])
+
+
+class PendingTicketsSold(CommitBatch):
+    """Sold-count changes by performance id, applied once committed.
+
+    The rollup keys of all the performances are read with one query, so
+    ticket signals need no performance loaded. Performances deleted
+    meanwhile are skipped; deleting one reconciles its day.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.deltas = Counter()
+
+    def collect(self, performance_id, delta):
+        self.deltas[performance_id] += delta
+
+    def run(self):
+        totals = Counter()
+        for performance in Performance.objects.filter(
+            id__in=self.deltas
+        ).only("play_id", "theatre_hall_id", "show_time"):
+            totals[rollup_key(performance)] += self.deltas[performance.id]
+        for key, delta in totals.items():
+            if delta:
+                apply_tickets_sold(key, delta)
+
+
+def change_tickets_sold(performance_id, delta):
+    """Shifts the sold count of the performance's rollup once committed."""
+    PendingTicketsSold.add(performance_id, delta)
+
+
+def shift_tickets_sold(key, delta):
+    """Shifts the sold count of the rollup with ``key`` once committed."""
+    transaction.on_commit(lambda: apply_tickets_sold(key, delta))
+
+
+def refresh_performance(performance):
+    """Recomputes the rollup of the performance's day once committed."""
+    play_id, theatre_hall_id, day = rollup_key(performance)
+    transaction.on_commit(
+        lambda: reconcile(day, day, [play_id], [theatre_hall_id])
+    )
+
+
+def refresh_theatre_hall(theatre_hall_id, capacity):
+    """Recomputes the hall's rollups once committed if its capacity changed.
+
+    The capacity of a rollup is its performance count times the hall's
+    capacity, so the rollups are recomputed only if one no longer matches.
+    """
+    def refresh():
+        changed = SalesRollup.objects.filter(
+            theatre_hall_id=theatre_hall_id
+        ).exclude(capacity=F("performances_count") * capacity)
+        if changed.exists():
+            reconcile(theatre_hall_ids=[theatre_hall_id])
+
+    transaction.on_commit(refresh)
+
+
+def filter_range(queryset, field, date_from, date_to):
+    if date_from is not None:
+        queryset = queryset.filter(**{f"{field}__gte": date_from})
+    if date_to is not None:
+        queryset = queryset.filter(
+            **{f"{field}__lt": date_to + timedelta(days=1)}
+        )
+    return queryset
+
+
+def reconcile(
+    date_from=None, date_to=None, play_ids=None, theatre_hall_ids=None
+):
+    """Recomputes the rollups of a date range from performances and tickets.
+
+    Archived tickets are counted too, so archiving does not change sales.
+    Open bounds and missing filters cover everything. Returns the number
+    of rollups written.
+    """
+    performances = filter_range(
+        Performance.objects.all(), "show_time", date_from, date_to
+    )
+    tickets = filter_range(
+        Ticket.objects.all(), "performance__show_time", date_from, date_to
+    )
+    archived = filter_range(
+        ArchivedTicket.objects.all(), "show_time", date_from, date_to
+    )
+    rollups = filter_range(
+        SalesRollup.objects.all(), "day", date_from, date_to
+    )
+    if play_ids is not None:
+        performances = performances.filter(play_id__in=play_ids)
+        tickets = tickets.filter(performance__play_id__in=play_ids)
+        archived = archived.filter(play_id__in=play_ids)
+        rollups = rollups.filter(play_id__in=play_ids)
+    if theatre_hall_ids is not None:
+        performances = performances.filter(
+            theatre_hall_id__in=theatre_hall_ids
+        )
+        tickets = tickets.filter(
+            performance__theatre_hall_id__in=theatre_hall_ids
+        )
+        archived = archived.filter(theatre_hall_id__in=theatre_hall_ids)
+        rollups = rollups.filter(theatre_hall_id__in=theatre_hall_ids)
+
+    computed = {}
+
+    def rollup(key):
+        if key not in computed:
+            computed[key] = SalesRollup(
+                play_id=key[0], theatre_hall_id=key[1], day=key[2]
+            )
+        return computed[key]
+
+    for row in (
+        performances.annotate(day=TruncDate("show_time"))
+        .values_list("play_id", "theatre_hall_id", "day")
+        .annotate(
+            performances_count=Count("id"),
+            capacity=Sum("theatre_hall__capacity"),
+        )
+        .order_by()
+    ):
+        item = rollup(row[:3])
+        item.performances_count, item.capacity = row[3:]
+
+    for queryset, prefix, show_time in (
+        (tickets, "performance__", "performance__show_time"),
+        (archived, "", "show_time"),
+    ):
+        for *key, sold in (
+            queryset.annotate(day=TruncDate(show_time))
+            .values_list(f"{prefix}play_id", f"{prefix}theatre_hall_id", "day")
+            .annotate(sold=Count("id"))
+            .order_by()
+        ):
+            rollup(tuple(key)).tickets_sold += sold
+
+    with transaction.atomic():
+        stale_ids = [
+            rollup_id
+            for rollup_id, *key in rollups.values_list(
+                "id", "play_id", "theatre_hall_id", "day"
+            )
+            if tuple(key) not in computed
+        ]
+        SalesRollup.objects.filter(id__in=stale_ids).delete()
+        SalesRollup.objects.bulk_create(
+            computed.values(),
+            update_conflicts=True,
+            unique_fields=["play_id", "theatre_hall_id", "day"],
+            update_fields=ROLLUP_FIELDS,
+        )
+    return len(computed)
@@ -0,0 +1,63 @@
+from bisect import bisect_left
+from datetime import datetime, timedelta
+
+from django.db.models import F
+
+from theatre.models import Performance
+
+
+def expand_schedule(date_from, date_to, weekdays, times):
+    """Returns the sorted show times of a weekly recurrence.
+
+    ``weekdays`` uses Monday as 0, like ``date.weekday()``.
+    """
+    weekdays = set(weekdays)
+    show_times = []
+    day = date_from
+    while day <= date_to:
+        if day.weekday() in weekdays:
+            show_times.extend(datetime.combine(day, time) for time in times)
+        day += timedelta(days=1)
+    return sorted(show_times)
+
+
+def find_overlaps(show_times, duration):
+    """Returns show times starting before the previous one has ended."""
+    return [
+        current
+        for previous, current in zip(show_times, show_times[1:])
+        if current < previous + duration
+    ]
+
+
+def find_conflicts(theatre_hall_id, show_times, duration, exclude_id=None):
+    """Finds performances in the hall overlapping any of ``show_times``.
+
+    All candidates are loaded with one range query over the whole span of
+    ``show_times`` and matched in Python. Returns ``(show_time, performance)``
+    pairs, where ``show_time`` is the requested time that overlaps.
+    """
+    if not show_times:
+        return []
+
+    existing = (
+        Performance.objects.filter(theatre_hall_id=theatre_hall_id)
+        .annotate(ends_at=F("show_time") + F("duration"))
+        .filter(show_time__lt=show_times[-1] + duration,
+                ends_at__gt=show_times[0])
+        .order_by("show_time")
+    )
+    if exclude_id is not None:
+        existing = existing.exclude(id=exclude_id)
+
+    conflicts = []
+    for performance in existing:
+        # Requested shows starting before this performance has ended...
+        index = bisect_left(show_times, performance.ends_at)
+        # ...that also end after it has started.
+        for position in range(index - 1, -1, -1):
+            show_time = show_times[position]
+            if show_time + duration <= performance.show_time:
+                break
+            conflicts.append((show_time, performance))
+    return sorted(conflicts, key=lambda conflict: conflict[0])
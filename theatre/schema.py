@@ -0,0 +1,121 @@
+import gzip
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from drf_spectacular.renderers import OpenApiJsonRenderer, OpenApiYamlRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+from theatre import compression
+
+SCHEMA_RENDERERS = {
+    "yaml": OpenApiYamlRenderer,
+    "json": OpenApiJsonRenderer,
+}
+
+_schema_files = {}
+
+
+class SchemaFile:
+    """Rendered schema in one format, with its gzip variant and their
+    ETags. Each content-coding gets its own strong ETag."""
+
+    def __init__(self, content):
+        self.content = content
+        self.gzipped = gzip.compress(content, mtime=0)
+        digest = hashlib.sha256(content).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+
+
+def get_schema_dir():
+    return Path(
+        getattr(settings, "OPENAPI_SCHEMA_DIR", settings.BASE_DIR / "schema")
+    )
+
+
+def get_schema_path(schema_format):
+    return get_schema_dir() / f"schema.{schema_format}"
+
+
+def generate_schema():
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    return generator.get_schema(request=None, public=True)
+
+
+def write_atomic(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+        file.write(content)
+    os.replace(file.name, path)
+
+
+def build_schema_files():
+    """Generates the schema and writes it to disk in every format."""
+    schema = generate_schema()
+    paths = []
+    for schema_format, renderer_class in SCHEMA_RENDERERS.items():
+        path = get_schema_path(schema_format)
+        write_atomic(path, renderer_class().render(schema))
+        paths.append(path)
+    _schema_files.clear()
+    return paths
+
+
+def get_schema_file(schema_format):
+    """Returns the schema in ``schema_format``, building it on first use."""
+    if schema_format not in _schema_files:
+        path = get_schema_path(schema_format)
+        if not path.exists():
+            build_schema_files()
+        _schema_files[schema_format] = SchemaFile(path.read_bytes())
+    return _schema_files[schema_format]
+
+
+def etag_matches(if_none_match, etag):
+    """Compares weakly, as ``If-None-Match`` does: the compression
+    middleware sends the ETag as ``W/"..."`` when it recompresses."""
+    if not if_none_match:
+        return False
+    return any(
+        tag == "*" or tag.removeprefix("W/") == etag
+        for tag in parse_etags(if_none_match)
+    )
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """Serves the schema built by ``build_schema`` instead of regenerating it.
+
+    Responses carry an ETag, answer ``If-None-Match`` with 304 and are
+    gzipped when the client accepts it.
+    """
+
+    def get(self, request, *args, **kwargs):
+        renderer, media_type = self.perform_content_negotiation(request)
+        schema_format = "json" if renderer.format == "json" else "yaml"
+        schema_file = get_schema_file(schema_format)
+
+        gzipped = compression.accepts(
+            request.headers.get("Accept-Encoding", ""), compression.GZIP
+        )
+        if gzipped:
+            content, etag = schema_file.gzipped, schema_file.gzip_etag
+        else:
+            content, etag = schema_file.content, schema_file.etag
+
+        if etag_matches(request.headers.get("If-None-Match"), etag):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type=media_type)
+            if gzipped:
+                response["Content-Encoding"] = compression.GZIP
+
+        response["ETag"] = etag
+        response["Vary"] = "Accept, Accept-Encoding"
+        response["Cache-Control"] = "no-cache"
+        return response
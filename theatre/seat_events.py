@@ -0,0 +1,125 @@
+import asyncio
+import threading
+from collections import defaultdict, deque
+from functools import lru_cache
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+RESERVED = "reserved"
+RELEASED = "released"
+RESYNC = "resync"
+
+
+class Subscription:
+    """Bounded queue of seat events for one connection.
+
+    At most ``max_pending`` events are kept. When a slow client falls
+    further behind, the oldest events are dropped and the next ``get``
+    returns a single ``resync`` event telling the client to reload the
+    seat map.
+    """
+
+    def __init__(self, performance_id, max_pending):
+        self.performance_id = performance_id
+        self.events = deque(maxlen=max_pending)
+        self.overflowed = False
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def push(self, event):
+        """Queues an event. Safe to call from any thread."""
+        if len(self.events) == self.events.maxlen:
+            self.overflowed = True
+        self.events.append(event)
+        try:
+            self._loop.call_soon_threadsafe(self._ready.set)
+        except RuntimeError:
+            # The connection's event loop is already closed.
+            pass
+
+    async def get(self):
+        while not self.events:
+            self._ready.clear()
+            if self.events:
+                break
+            await self._ready.wait()
+
+        if self.overflowed:
+            self.overflowed = False
+            self.events.clear()
+            return {"type": RESYNC, "performance": self.performance_id}
+        return self.events.popleft()
+
+
+class BaseBroker:
+    """Fans seat events out to subscribers of a performance."""
+
+    def publish(self, performance_id, event):
+        raise NotImplementedError("publish() must be overridden")
+
+    def subscribe(self, performance_id):
+        raise NotImplementedError("subscribe() must be overridden")
+
+    def unsubscribe(self, subscription):
+        raise NotImplementedError("unsubscribe() must be overridden")
+
+
+class LocalBroker(BaseBroker):
+    """In-process broker, for a single ASGI worker or for tests.
+
+    Deployments with several workers should use a backend that relays
+    events between processes (e.g. over Redis pub/sub) with the same
+    interface.
+    """
+
+    def __init__(self, max_pending=None):
+        self.max_pending = max_pending or getattr(
+            settings, "SEAT_EVENTS_MAX_PENDING", 100
+        )
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, performance_id, event):
+        with self._lock:
+            subscriptions = tuple(self._subscriptions.get(performance_id, ()))
+        for subscription in subscriptions:
+            subscription.push(event)
+
+    def subscribe(self, performance_id):
+        subscription = Subscription(performance_id, self.max_pending)
+        with self._lock:
+            self._subscriptions[performance_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.performance_id)
+            if subscriptions is None:
+                return
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.performance_id]
+
+    def subscribers_count(self, performance_id):
+        with self._lock:
+            return len(self._subscriptions.get(performance_id, ()))
+
+
+@lru_cache(maxsize=None)
+def get_broker():
+    broker_class = getattr(
+        settings, "SEAT_EVENTS_BROKER", "theatre.seat_events.LocalBroker"
+    )
+    return import_string(broker_class)()
+
+
+def publish_on_commit(performance_id, event_type, seats):
+    """Publishes a seat change once the current transaction commits."""
+    event = {
+        "type": event_type,
+        "performance": performance_id,
+        "seats": [[row, seat] for row, seat in seats],
+    }
+    transaction.on_commit(lambda: get_broker().publish(performance_id, event))
@@ -0,0 +1,123 @@
+"""Hall layouts packed into seat masks.
+
+Seat ``(row, seat)`` of a hall is bit ``(row - 1) * seats_in_row + seat -
+1`` of its mask: a set bit is a seat, a clear one an aisle, a box or a
+removed seat. Seats keep their position in the rectangle as their number,
+so checking a seat is one shift and one and.
+"""
+
+# Marks positions without a seat in rendered rows.
+GAP = "."
+
+
+def parse(spec, rows, seats_in_row):
+    """Packs a run-length layout into a mask.
+
+    ``spec`` has one line per row of runs that cover the row from left to
+    right: a number of seats, or a number of gaps prefixed with ``-``.
+    ``4 -2 4`` is four seats, a two-seat aisle and four more seats. An
+    empty spec is the full rectangle. Raises ``ValueError``.
+    """
+    size = rows * seats_in_row
+    if not spec.strip():
+        return (1 << size) - 1
+    lines = spec.strip().splitlines()
+    if len(lines) != rows:
+        raise ValueError(f"Must have {rows} lines, one per row.")
+
+    mask = 0
+    for index, line in enumerate(lines):
+        position = index * seats_in_row
+        end = position + seats_in_row
+        for run in line.split():
+            try:
+                length = int(run)
+            except ValueError:
+                raise ValueError(
+                    f"Row {index + 1}: {run!r} is not a number of seats."
+                ) from None
+            if length > 0:
+                mask |= ((1 << length) - 1) << position
+            position += abs(length)
+        if position != end:
+            raise ValueError(
+                f"Row {index + 1} must cover {seats_in_row} seats."
+            )
+    if not mask:
+        raise ValueError("The hall must have at least one seat.")
+    return mask
+
+
+def pack(mask, size):
+    return mask.to_bytes((size + 7) // 8, "little")
+
+
+def unpack(data):
+    return int.from_bytes(bytes(data), "little")
+
+
+class SeatMask:
+    """The seats of a hall as one integer."""
+
+    __slots__ = ("rows", "seats_in_row", "bits")
+
+    def __init__(self, rows, seats_in_row, bits):
+        self.rows = rows
+        self.seats_in_row = seats_in_row
+        self.bits = bits
+
+    @classmethod
+    def from_hall(cls, theatre_hall):
+        if theatre_hall.seat_mask:
+            bits = unpack(theatre_hall.seat_mask)
+        else:
+            # Not saved since the layout was added: every seat exists.
+            bits = (1 << theatre_hall.rows * theatre_hall.seats_in_row) - 1
+        return cls(theatre_hall.rows, theatre_hall.seats_in_row, bits)
+
+    @property
+    def capacity(self):
+        return self.bits.bit_count()
+
+    def index(self, row, seat):
+        return (row - 1) * self.seats_in_row + seat - 1
+
+    def has(self, row, seat):
+        return (
+            1 <= row <= self.rows
+            and 1 <= seat <= self.seats_in_row
+            and self.bits >> self.index(row, seat) & 1 == 1
+        )
+
+    def mask_of(self, seats):
+        """Packs ``seats``, skipping those the hall no longer has."""
+        mask = 0
+        for row, seat in seats:
+            if self.has(row, seat):
+                mask |= 1 << self.index(row, seat)
+        return mask
+
+    def free_seats(self, taken_seats):
+        """Lists the seats not in ``taken_seats``, row by row."""
+        free = self.bits & ~self.mask_of(taken_seats)
+        seats = []
+        while free:
+            lowest = free & -free
+            row, seat = divmod(lowest.bit_length() - 1, self.seats_in_row)
+            seats.append((row + 1, seat + 1))
+            free ^= lowest
+        return seats
+
+    def overlay(self, rows):
+        """Replaces the positions without a seat in ``rows`` with ``GAP``."""
+        full = (1 << self.seats_in_row) - 1
+        rendered = []
+        for index, codes in enumerate(rows):
+            row_bits = self.bits >> index * self.seats_in_row & full
+            if row_bits != full:
+                codes = "".join(
+                    code if row_bits >> seat & 1 else GAP
+                    for seat, code in enumerate(codes)
+                )
+            rendered.append(codes)
+        return tuple(rendered)
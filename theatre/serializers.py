@@ -1,6 +1,24 @@
-from django.db import transaction
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
 from rest_framework import serializers
 
+from theatre import (
+    checkin,
+    metrics,
+    performance_cards,
+    pricing,
+    sales_rollups,
+    seat_events,
+    waitlist,
+)
+from theatre.catalog import FORMATS
+from theatre.fieldsets import ExpandableFieldsMixin
+from theatre.scheduling import expand_schedule, find_conflicts, find_overlaps
+from theatre.seat_layout import parse
+
 from theatre.models import (
     Actor,
     Genre,
@@ -9,32 +27,92 @@ from theatre.models import (
     Performance,
     Reservation,
     Ticket,
+    PerformanceCard,
+    WaitlistEntry,
+    Cancellation,
 )
 
+WAITLIST_MAX_SEATS = 10
+
 
-class ActorSerializer(serializers.ModelSerializer):
+class ActorSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Actor
         fields = ("id", "first_name", "last_name", "image")
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ("id", "name")
 
 
-class PlaySerializer(serializers.ModelSerializer):
+class TheatreHallSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
+    class Meta:
+        model = TheatreHall
+        fields = (
+            "id", "name", "rows", "seats_in_row", "seat_layout", "capacity"
+        )
+        read_only_fields = ("capacity",)
+
+    def validate(self, attrs):
+        data = super(TheatreHallSerializer, self).validate(attrs)
+        values = {
+            field: data.get(field, getattr(self.instance, field, ""))
+            for field in ("seat_layout", "rows", "seats_in_row")
+        }
+        try:
+            parse(values["seat_layout"], values["rows"], values["seats_in_row"])
+        except ValueError as error:
+            raise serializers.ValidationError({"seat_layout": str(error)})
+        return data
+
+
+class PlaySerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Play
         fields = ("id", "title", "description", "actors", "genres", "image")
+        expandable = {"actors": ActorSerializer, "genres": GenreSerializer}
+
+
+class FilmographyPlaySerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
+    class Meta:
+        model = Play
+        fields = ("id", "title", "image")
+
+
+class UpcomingPerformanceSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
+    class Meta:
+        model = Performance
+        fields = ("id", "play", "theatre_hall", "show_time")
+        expandable = {
+            "play": FilmographyPlaySerializer,
+            "theatre_hall": TheatreHallSerializer,
+        }
 
 
 class ActorDetailSerializer(ActorSerializer):
-    movies = PlaySerializer(many=True, read_only=True)
+    """Expects a queryset prepared by ``theatre.filmography``."""
+    plays = FilmographyPlaySerializer(
+        source="filmography", many=True, read_only=True
+    )
+    plays_count = serializers.IntegerField(read_only=True)
+    upcoming_performances = UpcomingPerformanceSerializer(
+        many=True, read_only=True
+    )
 
     class Meta(ActorSerializer.Meta):
-        fields = ActorSerializer.Meta.fields + ("movies",)
+        fields = ActorSerializer.Meta.fields + (
+            "plays",
+            "plays_count",
+            "upcoming_performances",
+        )
 
 
 class ActorImageSerializer(serializers.ModelSerializer):
@@ -44,10 +122,21 @@ class ActorImageSerializer(serializers.ModelSerializer):
 
 
 class GenreDetailSerializer(GenreSerializer):
-    movies = PlaySerializer(many=True, read_only=True)
+    """Expects a queryset prepared by ``theatre.filmography``."""
+    plays = FilmographyPlaySerializer(
+        source="filmography", many=True, read_only=True
+    )
+    plays_count = serializers.IntegerField(read_only=True)
+    upcoming_performances = UpcomingPerformanceSerializer(
+        many=True, read_only=True
+    )
 
     class Meta(GenreSerializer.Meta):
-        fields = GenreSerializer.Meta.fields + ("movies",)
+        fields = GenreSerializer.Meta.fields + (
+            "plays",
+            "plays_count",
+            "upcoming_performances",
+        )
 
 
 class PlayListSerializer(PlaySerializer):
@@ -56,8 +145,8 @@ class PlayListSerializer(PlaySerializer):
 
 
 class PlayDetailSerializer(PlaySerializer):
-    genres = GenreSerializer(many=True, read_only=True)
-    actors = ActorSerializer(many=True, read_only=True)
+    class Meta(PlaySerializer.Meta):
+        default_expand = ("actors", "genres")
 
 
 class PlayImageSerializer(serializers.ModelSerializer):
@@ -66,35 +155,262 @@ class PlayImageSerializer(serializers.ModelSerializer):
         fields = ("id", "image")
 
 
-class TheatreHallSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = TheatreHall
-        fields = ("id", "name", "rows", "seats_in_row")
+SCHEDULE_MAX_DAYS = 366
+SCHEDULE_MAX_PERFORMANCES = 1000
+
+
+def conflict_errors(conflicts):
+    return [
+        f"{show_time:%Y-%m-%d %H:%M} overlaps performance {performance.id} "
+        f"at {performance.show_time:%Y-%m-%d %H:%M}."
+        for show_time, performance in conflicts
+    ]
 
 
-class PerformanceSerializer(serializers.ModelSerializer):
+class PerformanceSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Performance
-        fields = ("id", "play", "theatre_hall", "show_time")
+        fields = ("id", "play", "theatre_hall", "show_time", "duration")
+        expandable = {
+            "play": PlaySerializer,
+            "theatre_hall": TheatreHallSerializer,
+        }
+
+    def check_conflicts(self, data):
+        """Rejects a performance overlapping another one in the same hall.
+
+        Runs inside the write's transaction with the hall row locked, like
+        scheduling, so concurrent writes into one hall are checked one
+        after another.
+        """
+        instance = self.instance
+        theatre_hall = data.get(
+            "theatre_hall", getattr(instance, "theatre_hall", None)
+        )
+        show_time = data.get("show_time", getattr(instance, "show_time", None))
+        duration = data.get(
+            "duration", getattr(instance, "duration", timedelta(hours=2))
+        )
+        TheatreHall.objects.select_for_update().get(id=theatre_hall.id)
+        conflicts = find_conflicts(
+            theatre_hall.id,
+            [show_time],
+            duration,
+            exclude_id=getattr(instance, "id", None),
+        )
+        if conflicts:
+            raise serializers.ValidationError(
+                {"show_time": conflict_errors(conflicts)}
+            )
+
+    def create(self, validated_data):
+        with transaction.atomic():
+            self.check_conflicts(validated_data)
+            return super().create(validated_data)
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            self.check_conflicts(validated_data)
+            return super().update(instance, validated_data)
+
+
+class PerformanceScheduleSerializer(serializers.Serializer):
+    """Weekly recurrence expanded into performances of one play and hall."""
+    play = serializers.PrimaryKeyRelatedField(queryset=Play.objects.all())
+    theatre_hall = serializers.PrimaryKeyRelatedField(
+        queryset=TheatreHall.objects.all()
+    )
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    weekdays = serializers.ListField(
+        child=serializers.IntegerField(min_value=0, max_value=6),
+        allow_empty=False,
+        help_text="Days of the week, Monday is 0.",
+    )
+    times = serializers.ListField(
+        child=serializers.TimeField(), allow_empty=False
+    )
+    duration = serializers.DurationField(default=timedelta(hours=2))
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        days_count = (data["date_to"] - data["date_from"]).days + 1
+        if days_count < 1:
+            raise serializers.ValidationError(
+                {"date_to": "Must not be earlier than date_from."}
+            )
+        if days_count > SCHEDULE_MAX_DAYS:
+            raise serializers.ValidationError(
+                {"date_to": f"Range must not exceed {SCHEDULE_MAX_DAYS} days."}
+            )
+
+        show_times = expand_schedule(
+            data["date_from"], data["date_to"], data["weekdays"], data["times"]
+        )
+        if not show_times:
+            raise serializers.ValidationError(
+                "The schedule does not contain any performance."
+            )
+        if len(show_times) > SCHEDULE_MAX_PERFORMANCES:
+            raise serializers.ValidationError(
+                f"The schedule must not exceed "
+                f"{SCHEDULE_MAX_PERFORMANCES} performances."
+            )
+        if find_overlaps(show_times, data["duration"]):
+            raise serializers.ValidationError(
+                {"times": "Performances of one day must not overlap."}
+            )
+
+        data["show_times"] = show_times
+        return data
+
+    def create(self, validated_data):
+        theatre_hall = validated_data["theatre_hall"]
+        duration = validated_data["duration"]
+        show_times = validated_data["show_times"]
+
+        with transaction.atomic():
+            # Locking the hall serializes scheduling into it.
+            TheatreHall.objects.select_for_update().get(id=theatre_hall.id)
+            conflicts = find_conflicts(theatre_hall.id, show_times, duration)
+            if conflicts:
+                raise serializers.ValidationError(
+                    {"show_times": conflict_errors(conflicts)}
+                )
+            performances = Performance.objects.bulk_create(
+                Performance(
+                    play=validated_data["play"],
+                    theatre_hall=theatre_hall,
+                    show_time=show_time,
+                    duration=duration,
+                )
+                for show_time in show_times
+            )
+            # bulk_create sends no post_save, so cards and sales rollups
+            # are built here.
+            performance_cards.refresh_cards(
+                Performance.objects.filter(
+                    id__in=[performance.id for performance in performances]
+                )
+            )
+            sales_rollups.reconcile(
+                show_times[0].date(),
+                show_times[-1].date(),
+                [validated_data["play"].id],
+                [theatre_hall.id],
+            )
+        return performances
 
 
 class PerformanceListSerializer(PerformanceSerializer):
     """We define a field to get the number of free seats through the serializer method"""
     available_seats_count = serializers.SerializerMethodField()
 
-    class Meta:
-        model = Performance
+    class Meta(PerformanceSerializer.Meta):
         fields = PerformanceSerializer.Meta.fields + ("available_seats_count",)
 
-    """We call the get_available_seats_count() method of the Performance model to get it
-    of free places for the current object (obj) """
+    """We use the count annotated by the list queryset, or call the
+    get_free_seats() method of the Performance model to get it of free
+    places for the current object (obj) """
     def get_available_seats_count(self, obj):
+        if hasattr(obj, "available_seats_count"):
+            return obj.available_seats_count
         return len(obj.get_free_seats())
 
 
+class PerformanceCalendarSerializer(serializers.Serializer):
+    """Serializes rows of the calendar ``values()`` queryset."""
+    id = serializers.IntegerField()
+    play = serializers.IntegerField(source="play_id")
+    play_title = serializers.CharField(source="play__title")
+    theatre_hall = serializers.IntegerField(source="theatre_hall_id")
+    theatre_hall_name = serializers.CharField(source="theatre_hall__name")
+    show_time = serializers.DateTimeField()
+    available_seats_count = serializers.IntegerField()
+    sold_out = serializers.BooleanField()
+
+
+class CalendarDaySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    performances_count = serializers.IntegerField()
+    available_seats_count = serializers.IntegerField()
+    performances = PerformanceCalendarSerializer(many=True)
+
+
+class ArchivedPerformanceSerializer(serializers.Serializer):
+    """Serializes rows of the archive report ``values()`` queryset."""
+    performance = serializers.IntegerField(source="performance_id")
+    play = serializers.IntegerField(source="play_id")
+    theatre_hall = serializers.IntegerField(source="theatre_hall_id")
+    show_time = serializers.DateTimeField()
+    tickets_count = serializers.IntegerField()
+
+
+class ArchiveReportSerializer(serializers.Serializer):
+    date_from = serializers.DateField()
+    date_to = serializers.DateField()
+    tickets_count = serializers.IntegerField()
+    reservations_count = serializers.IntegerField()
+    performances = ArchivedPerformanceSerializer(many=True)
+
+
+class SalesRollupSerializer(serializers.Serializer):
+    """Serializes rows of the sales analytics ``values()`` queryset."""
+    date = serializers.DateField(source="day")
+    play = serializers.IntegerField(source="play_id")
+    theatre_hall = serializers.IntegerField(source="theatre_hall_id")
+    performances_count = serializers.IntegerField()
+    capacity = serializers.IntegerField()
+    tickets_sold = serializers.IntegerField()
+    running_tickets_sold = serializers.IntegerField()
+    occupancy = serializers.FloatField(
+        allow_null=True, help_text="Percent of seats sold."
+    )
+    occupancy_trend = serializers.FloatField(
+        allow_null=True,
+        help_text="Average occupancy of this and the previous six days "
+                  "with performances.",
+    )
+
+
 class PerformanceDetailSerializer(PerformanceSerializer):
-    play = PlayDetailSerializer(read_only=True)
-    theatre_hall = TheatreHallSerializer(read_only=True)
+    class Meta(PerformanceSerializer.Meta):
+        expandable = {
+            "play": PlayDetailSerializer,
+            "theatre_hall": TheatreHallSerializer,
+        }
+        default_expand = ("play", "theatre_hall")
+
+
+class PerformanceCardSerializer(serializers.ModelSerializer):
+    id = serializers.IntegerField(source="performance_id")
+    play = serializers.IntegerField(source="play_id")
+    theatre_hall = serializers.IntegerField(source="theatre_hall_id")
+    play_image = serializers.SerializerMethodField()
+
+    class Meta:
+        model = PerformanceCard
+        fields = (
+            "id",
+            "play",
+            "play_title",
+            "play_image",
+            "genres",
+            "theatre_hall",
+            "theatre_hall_name",
+            "show_time",
+            "available_seats_count",
+        )
+
+    def get_play_image(self, obj) -> str | None:
+        if not obj.play_image:
+            return None
+        request = self.context.get("request")
+        if request is None:
+            return obj.play_image
+        return request.build_absolute_uri(obj.play_image)
 
 
 class TicketSerializer(serializers.ModelSerializer):
@@ -109,14 +425,72 @@ class TicketSerializer(serializers.ModelSerializer):
             theatre_hall.rows,
             attrs["seat"],
             theatre_hall.seats_in_row,
-            serializers.ValidationError
+            serializers.ValidationError,
+            theatre_hall.get_seat_mask(),
         )
         return data
 
     class Meta:
         model = Ticket
-        fields = ("id", "row", "seat", "performance", "reservation")
-        read_only_fields = ("reservation",)
+        fields = ("id", "row", "seat", "performance", "reservation", "price")
+        read_only_fields = ("reservation", "price")
+
+
+class TicketTokenSerializer(serializers.ModelSerializer):
+    token = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Ticket
+        fields = ("id", "performance", "row", "seat", "token")
+
+    def get_token(self, obj) -> str:
+        return checkin.make_token(obj)
+
+
+class CheckInSerializer(serializers.Serializer):
+    token = serializers.CharField(max_length=64)
+    performance = serializers.IntegerField(
+        required=False,
+        help_text="Performance at this door; other tickets are rejected.",
+    )
+
+
+class CheckInScanSerializer(serializers.Serializer):
+    token = serializers.CharField(max_length=64)
+    scanned_at = serializers.DateTimeField(required=False)
+
+
+class CheckInSyncSerializer(serializers.Serializer):
+    performance = serializers.IntegerField(required=False)
+    scans = CheckInScanSerializer(many=True, max_length=1000)
+
+
+class CheckInResultSerializer(serializers.Serializer):
+    token = serializers.CharField()
+    status = serializers.ChoiceField(
+        choices=(
+            checkin.ADMITTED,
+            checkin.DUPLICATE,
+            checkin.INVALID,
+            checkin.WRONG_PERFORMANCE,
+            checkin.REVOKED,
+        )
+    )
+    ticket = serializers.IntegerField(source="ticket_id", allow_null=True)
+    performance = serializers.IntegerField(
+        source="performance_id", allow_null=True
+    )
+    row = serializers.IntegerField(allow_null=True)
+    seat = serializers.IntegerField(allow_null=True)
+
+
+def has_error_code(errors, code):
+    """Checks whether any (nested) error detail has the given code."""
+    if isinstance(errors, dict):
+        return any(has_error_code(error, code) for error in errors.values())
+    if isinstance(errors, list):
+        return any(has_error_code(error, code) for error in errors)
+    return getattr(errors, "code", None) == code
 
 
 class ReservationSerializer(serializers.ModelSerializer):
@@ -125,17 +499,219 @@ class ReservationSerializer(serializers.ModelSerializer):
         read_only=False,
         allow_empty=False
     )
+    total_price = serializers.SerializerMethodField()
+
     class Meta:
         model = Reservation
-        fields = ("id", "created_at", "user", "tickets")
+        fields = ("id", "created_at", "user", "tickets", "total_price")
         read_only_fields = ("created_at", "user")
 
+    def get_total_price(self, obj) -> str | None:
+        """Sum of the ticket prices, formatted like the prices."""
+        prices = [ticket.price for ticket in obj.tickets.all()]
+        if not prices or None in prices:
+            return None
+        return f"{sum(prices):.2f}"
+
+    def is_valid(self, *, raise_exception=False):
+        """Counts rejected reservations, telling taken seats apart."""
+        if super().is_valid():
+            return True
+
+        if has_error_code(self.errors, "unique"):
+            metrics.RESERVATION_CONFLICT.inc()
+        else:
+            metrics.RESERVATION_FAILURE.inc()
+
+        if raise_exception:
+            raise serializers.ValidationError(self.errors)
+        return False
+
     def create(self, validated_data):
         tickets_data = validated_data.pop("tickets")
         if not tickets_data:
             raise serializers.ValidationError({"tickets": "This field is required."})
-        with transaction.atomic():
-            reservation = Reservation.objects.create(**validated_data)
-            for ticket in tickets_data:
-                Ticket.objects.create(reservation=reservation, **ticket)
-            return reservation
+        try:
+            with transaction.atomic():
+                reservation = Reservation.objects.create(**validated_data)
+                seats_by_performance = defaultdict(list)
+                grids = {}
+                for ticket in tickets_data:
+                    performance = ticket["performance"]
+                    if performance.id not in grids:
+                        grids[performance.id] = pricing.get_grid(performance)
+                    Ticket.objects.create(
+                        reservation=reservation,
+                        price=grids[performance.id].price_of(
+                            ticket["row"], ticket["seat"]
+                        ),
+                        **ticket,
+                    )
+                    seats_by_performance[ticket["performance"].id].append(
+                        (ticket["row"], ticket["seat"])
+                    )
+                for performance_id, seats in seats_by_performance.items():
+                    seat_events.publish_on_commit(
+                        performance_id, seat_events.RESERVED, seats
+                    )
+                    metrics.record_tickets_sold_on_commit(
+                        performance_id, len(seats)
+                    )
+                transaction.on_commit(metrics.RESERVATION_SUCCESS.inc)
+                return reservation
+        except IntegrityError:
+            metrics.RESERVATION_CONFLICT.inc()
+            raise serializers.ValidationError(
+                {"tickets": "One of the seats has just been booked."}
+            )
+        except serializers.ValidationError:
+            metrics.RESERVATION_CONFLICT.inc()
+            raise
+        except Exception:
+            metrics.RESERVATION_FAILURE.inc()
+            raise
+
+
+class CancellationRequestSerializer(serializers.Serializer):
+    tickets = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        required=False,
+        help_text="Ids of the tickets to cancel. "
+                  "Omit to cancel the whole reservation.",
+    )
+
+
+class CancellationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Cancellation
+        fields = (
+            "id",
+            "reservation_id",
+            "tickets",
+            "whole_reservation",
+            "created_at",
+        )
+
+
+class WaitlistEntrySerializer(serializers.ModelSerializer):
+    seats_count = serializers.IntegerField(
+        min_value=1, max_value=WAITLIST_MAX_SEATS
+    )
+    position = serializers.SerializerMethodField()
+
+    class Meta:
+        model = WaitlistEntry
+        fields = (
+            "id",
+            "performance",
+            "seats_count",
+            "status",
+            "position",
+            "reservation",
+            "created_at",
+            "expires_at",
+        )
+        read_only_fields = ("status", "reservation", "created_at", "expires_at")
+
+    def get_position(self, obj) -> int | None:
+        """Place in the queue of a waiting entry, starting at 1."""
+        if obj.status != WaitlistEntry.Status.WAITING:
+            return None
+        position = getattr(obj, "position", None)
+        if position is None:
+            position = WaitlistEntry.objects.filter(
+                performance_id=obj.performance_id,
+                status=WaitlistEntry.Status.WAITING,
+                id__lte=obj.id,
+            ).count()
+        return position
+
+    def validate(self, attrs):
+        performance = attrs["performance"]
+        if performance.show_time <= timezone.now():
+            raise serializers.ValidationError(
+                {"performance": "The performance has already started."}
+            )
+        if waitlist.free_seats_count(performance) >= attrs["seats_count"]:
+            raise serializers.ValidationError(
+                {"seats_count": "Enough seats are free; reserve them directly."}
+            )
+        return attrs
+
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"performance": "You are already on this waitlist."}
+            )
+
+
+class WaitingRoomSerializer(serializers.Serializer):
+    position = serializers.IntegerField()
+    ahead = serializers.IntegerField(
+        help_text="Users still in the queue ahead of you."
+    )
+    estimated_wait = serializers.IntegerField(help_text="In seconds.")
+    token = serializers.CharField(
+        help_text="Send as ?token= to poll your place in the queue."
+    )
+    admission_token = serializers.CharField(
+        allow_null=True,
+        help_text="Send in the Admission-Token header of the reservation.",
+    )
+
+
+class SeatTierSerializer(serializers.Serializer):
+    code = serializers.CharField()
+    name = serializers.CharField(allow_null=True)
+    price = serializers.DecimalField(
+        max_digits=8, decimal_places=2, allow_null=True
+    )
+    capacity = serializers.IntegerField()
+    available = serializers.IntegerField()
+
+
+class SeatMapSerializer(serializers.Serializer):
+    performance = serializers.IntegerField()
+    rows = serializers.ListField(
+        child=serializers.CharField(),
+        help_text="Price tier code of every seat, one string per row.",
+    )
+    taken = serializers.ListField(
+        child=serializers.ListField(child=serializers.IntegerField()),
+        help_text="Taken seats as [row, seat] pairs.",
+    )
+    tiers = SeatTierSerializer(many=True)
+
+
+class CheapestSeatsSerializer(serializers.Serializer):
+    tier = serializers.CharField()
+    price = serializers.DecimalField(max_digits=8, decimal_places=2)
+    seats = serializers.ListField(
+        child=serializers.ListField(child=serializers.IntegerField())
+    )
+    total_price = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+
+class CatalogImportSerializer(serializers.Serializer):
+    file = serializers.FileField()
+    file_format = serializers.ChoiceField(
+        choices=FORMATS,
+        required=False,
+        help_text="By default taken from the file extension.",
+    )
+    dry_run = serializers.BooleanField(default=False)
+
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        if "file_format" not in data:
+            extension = data["file"].name.rsplit(".", 1)[-1]
+            if extension not in FORMATS:
+                raise serializers.ValidationError(
+                    {"file_format": "Must be set for this file name."}
+                )
+            data["file_format"] = extension
+        return data
@@ -0,0 +1,95 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from theatre import (
+    checkin,
+    performance_cards,
+    pricing,
+    sales_rollups,
+    seat_events,
+    waiting_room,
+    waitlist,
+)
+from theatre.models import (
+    Performance,
+    PerformancePrice,
+    Play,
+    PriceTier,
+    TheatreHall,
+    Ticket,
+)
+
+
+@receiver(post_save, sender=Performance)
+def performance_saved(sender, instance, **kwargs):
+    performance_cards.refresh_performance(instance.id)
+    sales_rollups.refresh_performance(instance)
+    waiting_room.forget_admission_rate(instance.id)
+
+
+@receiver(post_delete, sender=Performance)
+def performance_deleted(sender, instance, **kwargs):
+    sales_rollups.refresh_performance(instance)
+    waiting_room.forget_admission_rate(instance.id)
+
+
+@receiver(post_save, sender=Play)
+def play_saved(sender, instance, created, **kwargs):
+    if not created:
+        performance_cards.refresh_play(instance.id)
+
+
+@receiver(m2m_changed, sender=Play.genres.through)
+def play_genres_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if not action.startswith("post_"):
+        return
+    if reverse:
+        for play_id in pk_set or ():
+            performance_cards.refresh_play(play_id)
+    else:
+        performance_cards.refresh_play(instance.id)
+
+
+@receiver(post_save, sender=TheatreHall)
+def theatre_hall_saved(sender, instance, created, **kwargs):
+    pricing.forget_hall(instance.id)
+    if not created:
+        performance_cards.refresh_theatre_hall(instance.id)
+        sales_rollups.refresh_theatre_hall(instance.id, instance.capacity)
+
+
+@receiver(post_save, sender=Ticket)
+def ticket_saved(sender, instance, created, **kwargs):
+    if created:
+        performance_cards.change_available_seats(instance.performance_id, -1)
+        sales_rollups.change_tickets_sold(instance.performance_id, 1)
+
+
+@receiver(post_delete, sender=Ticket)
+def ticket_deleted(sender, instance, **kwargs):
+    performance_cards.change_available_seats(instance.performance_id, 1)
+    sales_rollups.change_tickets_sold(instance.performance_id, -1)
+    seat_events.publish_on_commit(
+        instance.performance_id,
+        seat_events.RELEASED,
+        [(instance.row, instance.seat)],
+    )
+    waitlist.promote_on_commit(instance.performance_id)
+    checkin.revoke_on_commit([instance.id])
+
+
+@receiver(post_save, sender=PriceTier)
+@receiver(post_delete, sender=PriceTier)
+def price_tier_changed(sender, instance, **kwargs):
+    pricing.forget_hall(instance.theatre_hall_id)
+    # Overrides are cached by tier code, which may have changed.
+    for performance_id in PerformancePrice.objects.filter(
+        price_tier_id=instance.id
+    ).values_list("performance_id", flat=True):
+        pricing.forget_performance(performance_id)
+
+
+@receiver(post_save, sender=PerformancePrice)
+@receiver(post_delete, sender=PerformancePrice)
+def performance_price_changed(sender, instance, **kwargs):
+    pricing.forget_performance(instance.performance_id)
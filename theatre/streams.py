@@ -0,0 +1,155 @@
+import asyncio
+import json
+import re
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import AccessToken
+
+from theatre.models import Performance
+from theatre.seat_events import get_broker
+
+SEAT_STREAM_PATH = re.compile(
+    r"^/api/theatre/performances/(?P<performance_id>\d+)/seats/stream/$"
+)
+
+
+def get_token(scope):
+    """Reads the JWT from the Authorization header or ``?token=``.
+
+    Browsers' ``EventSource`` cannot send headers, hence the query string.
+    """
+    headers = dict(scope.get("headers", ()))
+    authorization = headers.get(b"authorization", b"").decode()
+    if authorization.startswith("Bearer "):
+        return authorization[len("Bearer "):]
+    query = parse_qs(scope.get("query_string", b"").decode())
+    return query.get("token", [None])[0]
+
+
+def is_authenticated(scope):
+    token = get_token(scope)
+    if not token:
+        return False
+    try:
+        AccessToken(token)
+    except TokenError:
+        return False
+    return True
+
+
+def format_event(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+
+
+@sync_to_async
+def get_taken_seats(performance_id):
+    performance = Performance.objects.filter(id=performance_id).first()
+    if performance is None:
+        return None
+    return list(performance.get_taken_seats())
+
+
+async def send_error(send, status, detail):
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [(b"content-type", b"application/json")],
+    })
+    await send({
+        "type": "http.response.body",
+        "body": json.dumps({"detail": detail}).encode(),
+    })
+
+
+async def wait_for_disconnect(receive):
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def seat_stream(scope, receive, send, performance_id):
+    """Server-Sent Events stream of seat changes for one performance.
+
+    Sends a ``snapshot`` of taken seats, then ``reserved``, ``released``
+    and ``resync`` events as they are published.
+    """
+    if not is_authenticated(scope):
+        await send_error(
+            send, 401, "Authentication credentials were not provided."
+        )
+        return
+
+    broker = get_broker()
+    subscription = broker.subscribe(performance_id)
+    disconnect = asyncio.ensure_future(wait_for_disconnect(receive))
+    next_event = None
+    keepalive = getattr(settings, "SEAT_EVENTS_KEEPALIVE", 15)
+
+    try:
+        taken_seats = await get_taken_seats(performance_id)
+        if taken_seats is None:
+            await send_error(send, 404, "Not found.")
+            return
+
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"text/event-stream"),
+                (b"cache-control", b"no-cache"),
+                (b"x-accel-buffering", b"no"),
+            ],
+        })
+        await send({
+            "type": "http.response.body",
+            "body": format_event({
+                "type": "snapshot",
+                "performance": performance_id,
+                "seats": [[row, seat] for row, seat in taken_seats],
+            }),
+            "more_body": True,
+        })
+
+        while True:
+            if next_event is None:
+                next_event = asyncio.ensure_future(subscription.get())
+
+            done, _ = await asyncio.wait(
+                {next_event, disconnect},
+                timeout=keepalive,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+
+            if disconnect in done:
+                break
+
+            if next_event in done:
+                body = format_event(next_event.result())
+                next_event = None
+            else:
+                body = b": keepalive\n\n"
+
+            await send({
+                "type": "http.response.body",
+                "body": body,
+                "more_body": True,
+            })
+    finally:
+        broker.unsubscribe(subscription)
+        disconnect.cancel()
+        if next_event is not None:
+            next_event.cancel()
+
+
+def match_seat_stream(scope):
+    """Returns the performance id if ``scope`` requests a seat stream."""
+    if scope["type"] != "http" or scope.get("method") != "GET":
+        return None
+    match = SEAT_STREAM_PATH.match(scope["path"])
+    if match is None:
+        return None
+    return int(match["performance_id"])
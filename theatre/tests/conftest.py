@@ -0,0 +1,10 @@
+import pytest
+from django.core.cache import caches
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Keeps throttle counters and other cached state out of other tests."""
+    for cache in caches.all(initialized_only=False):
+        cache.clear()
+    yield
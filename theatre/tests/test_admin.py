@@ -0,0 +1,227 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.admin.sites import site
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import F
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from theatre.admin import EstimatedCountPaginator
+from theatre.models import (
+    Performance,
+    PerformanceCard,
+    Reservation,
+    SalesRollup,
+    Ticket,
+)
+from theatre.tests.test_utils import (
+    sample_performance,
+    sample_play,
+    sample_theatre_hall,
+)
+
+TICKET_CHANGELIST_URL = reverse("admin:theatre_ticket_changelist")
+PERFORMANCE_CHANGELIST_URL = reverse("admin:theatre_performance_changelist")
+
+
+@pytest.mark.django_db
+class AdminTest(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            email="admin@test.com", password="password123"
+        )
+        self.client.force_login(self.admin)
+        self.hall = sample_theatre_hall(rows=2, seats_in_row=5)
+        self.play = sample_play()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.performance = sample_performance(
+                play=self.play,
+                theatre_hall=self.hall,
+                show_time=timezone.now() + timedelta(days=3),
+            )
+        self.reservation = Reservation.objects.create(user=self.admin)
+
+    def sell(self, *seats):
+        with self.captureOnCommitCallbacks(execute=True):
+            return [
+                Ticket.objects.create(
+                    row=1,
+                    seat=seat,
+                    performance=self.performance,
+                    reservation=self.reservation,
+                )
+                for seat in seats
+            ]
+
+    def changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_theatre_models_are_registered(self):
+        for name in (
+            "play",
+            "actor",
+            "genre",
+            "theatrehall",
+            "performance",
+            "reservation",
+            "ticket",
+        ):
+            response = self.client.get(
+                reverse(f"admin:theatre_{name}_changelist")
+            )
+            self.assertEqual(response.status_code, 200, name)
+
+    def test_ticket_changelist_queries_do_not_grow_with_rows(self):
+        self.sell(1)
+        few = self.changelist_queries(TICKET_CHANGELIST_URL)
+        self.sell(2, 3, 4, 5)
+        self.assertEqual(self.changelist_queries(TICKET_CHANGELIST_URL), few)
+
+    def test_performance_autocomplete(self):
+        response = self.client.get(
+            reverse("admin:autocomplete"),
+            {
+                "term": self.play.title[:3],
+                "app_label": "theatre",
+                "model_name": "ticket",
+                "field_name": "performance",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [result["id"] for result in response.json()["results"]],
+            [str(self.performance.id)],
+        )
+
+    def test_release_selected_tickets(self):
+        tickets = self.sell(1, 2, 3)
+        card = PerformanceCard.objects.get(performance=self.performance)
+        self.assertEqual(card.available_seats_count, 7)
+
+        with (
+            mock.patch("theatre.seat_events.get_broker") as get_broker_mock,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            response = self.client.post(
+                TICKET_CHANGELIST_URL,
+                {
+                    "action": "release_selected",
+                    "_selected_action": [tickets[0].id, tickets[2].id],
+                },
+            )
+        self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(
+            list(Ticket.objects.values_list("seat", flat=True)), [2]
+        )
+        card.refresh_from_db()
+        self.assertEqual(card.available_seats_count, 9)
+        self.assertEqual(SalesRollup.objects.get().tickets_sold, 1)
+        get_broker_mock.return_value.publish.assert_called_once_with(
+            self.performance.id,
+            {
+                "type": "released",
+                "performance": self.performance.id,
+                "seats": [[1, 1], [1, 3]],
+            },
+        )
+
+    def test_ticket_changelist_has_no_delete_selected_action(self):
+        response = self.client.get(TICKET_CHANGELIST_URL)
+        choices = response.context["action_form"].fields["action"].choices
+        self.assertNotIn("delete_selected", dict(choices))
+        self.assertIn("release_selected", dict(choices))
+
+    def test_release_all_tickets_of_performances(self):
+        self.sell(1, 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                PERFORMANCE_CHANGELIST_URL,
+                {
+                    "action": "release_all_tickets",
+                    "_selected_action": [self.performance.id],
+                },
+            )
+        self.assertFalse(Ticket.objects.exists())
+        self.assertEqual(SalesRollup.objects.get().tickets_sold, 0)
+
+    def test_refresh_derived_data(self):
+        self.sell(1, 2)
+        # Queryset updates send no signals, leaving the card and rollup stale.
+        Performance.objects.update(
+            show_time=F("show_time") + timedelta(days=1)
+        )
+        PerformanceCard.objects.update(available_seats_count=0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                PERFORMANCE_CHANGELIST_URL,
+                {
+                    "action": "refresh_derived_data",
+                    "_selected_action": [self.performance.id],
+                },
+            )
+        card = PerformanceCard.objects.get(performance=self.performance)
+        self.assertEqual(card.available_seats_count, 8)
+        self.performance.refresh_from_db()
+        self.assertEqual(
+            SalesRollup.objects.get(day=self.performance.show_time.date())
+            .tickets_sold,
+            2,
+        )
+
+
+@pytest.mark.django_db
+class EstimatedCountPaginatorTest(TestCase):
+    def setUp(self):
+        hall = sample_theatre_hall()
+        for day in range(3):
+            sample_performance(
+                theatre_hall=hall,
+                show_time=timezone.now() + timedelta(days=day + 1),
+            )
+
+    def test_counts_exactly_outside_postgres(self):
+        paginator = EstimatedCountPaginator(
+            Performance.objects.order_by("id"), 2
+        )
+        self.assertEqual(paginator.count, 3)
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1000)
+    @mock.patch("theatre.admin.estimated_count", return_value=5000)
+    def test_uses_estimate_for_big_unfiltered_tables(self, estimate_mock):
+        with mock.patch.object(connection, "vendor", "postgresql"):
+            paginator = EstimatedCountPaginator(
+                Performance.objects.order_by("id"), 2
+            )
+            self.assertEqual(paginator.count, 5000)
+
+            filtered = EstimatedCountPaginator(
+                Performance.objects.filter(id__gt=0).order_by("id"), 2
+            )
+            self.assertEqual(filtered.count, 3)
+        estimate_mock.assert_called_once()
+
+    @override_settings(ADMIN_ESTIMATED_COUNT_THRESHOLD=1000)
+    @mock.patch("theatre.admin.estimated_count", return_value=-1)
+    def test_counts_exactly_below_threshold(self, estimate_mock):
+        with mock.patch.object(connection, "vendor", "postgresql"):
+            paginator = EstimatedCountPaginator(
+                Performance.objects.order_by("id"), 2
+            )
+            self.assertEqual(paginator.count, 3)
+
+    def test_changelist_uses_estimated_paginator(self):
+        request = RequestFactory().get("/")
+        paginator = site._registry[Ticket].get_paginator(
+            request, Ticket.objects.order_by("id"), 100
+        )
+        self.assertIsInstance(paginator, EstimatedCountPaginator)
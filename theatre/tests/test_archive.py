@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import (
+    ArchivedReservation,
+    ArchivedTicket,
+    Reservation,
+    Ticket,
+)
+from theatre.tests.test_utils import (
+    sample_performance,
+    sample_play,
+    sample_theatre_hall,
+)
+
+ARCHIVE_REPORT_URL = reverse("theatre:archive-report")
+
+
+@pytest.mark.django_db
+class ArchiveTicketsTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="archive@test.com", password="password123"
+        )
+        hall = sample_theatre_hall()
+        play = sample_play()
+        self.old_show_time = datetime(2020, 5, 1, 19, 0)
+        self.old = sample_performance(
+            play=play, theatre_hall=hall, show_time=self.old_show_time
+        )
+        self.upcoming = sample_performance(play=play, theatre_hall=hall)
+
+        self.old_reservation = Reservation.objects.create(user=self.user)
+        self.mixed_reservation = Reservation.objects.create(user=self.user)
+        for seat in (1, 2, 3):
+            Ticket.objects.create(
+                row=1,
+                seat=seat,
+                performance=self.old,
+                reservation=self.old_reservation,
+            )
+        Ticket.objects.create(
+            row=2, seat=1, performance=self.old,
+            reservation=self.mixed_reservation,
+        )
+        Ticket.objects.create(
+            row=2, seat=1, performance=self.upcoming,
+            reservation=self.mixed_reservation,
+        )
+
+    def archive(self):
+        call_command("archive_tickets", batch_size=2, stdout=StringIO())
+
+    def test_tickets_of_past_performances_are_moved(self):
+        self.old.tickets.update(price=Decimal("25.00"))
+
+        self.archive()
+
+        self.assertFalse(self.old.tickets.exists())
+        self.assertEqual(self.upcoming.tickets.count(), 1)
+        archived = ArchivedTicket.objects.filter(performance_id=self.old.id)
+        self.assertEqual(archived.count(), 4)
+        self.assertEqual(
+            set(archived.values_list("show_time", flat=True)),
+            {self.old_show_time},
+        )
+        self.assertEqual(
+            set(archived.values_list("price", flat=True)), {Decimal("25.00")}
+        )
+
+    def test_reservation_is_archived_when_no_ticket_is_live(self):
+        self.archive()
+
+        self.assertFalse(
+            Reservation.objects.filter(id=self.old_reservation.id).exists()
+        )
+        archived = ArchivedReservation.objects.get(id=self.old_reservation.id)
+        self.assertEqual(archived.user, self.user)
+        self.assertEqual(archived.created_at, self.old_reservation.created_at)
+        self.assertTrue(
+            Reservation.objects.filter(id=self.mixed_reservation.id).exists()
+        )
+
+    def test_archiving_twice_is_a_no_op(self):
+        self.archive()
+        self.archive()
+
+        self.assertEqual(ArchivedTicket.objects.count(), 4)
+        self.assertEqual(ArchivedReservation.objects.count(), 1)
+
+
+@pytest.mark.django_db
+class ArchiveReportTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            email="archive-admin@test.com", password="password123"
+        )
+        show_time = datetime(2020, 5, 1, 19, 0)
+        for ticket_id, (performance_id, reservation_id) in enumerate(
+            [(1, 1), (1, 1), (1, 2), (2, 3)], start=1
+        ):
+            ArchivedTicket.objects.create(
+                id=ticket_id,
+                row=1,
+                seat=ticket_id,
+                performance_id=performance_id,
+                reservation_id=reservation_id,
+                play_id=performance_id,
+                theatre_hall_id=1,
+                show_time=show_time + timedelta(days=performance_id),
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_report(self):
+        response = self.client.get(
+            ARCHIVE_REPORT_URL, {"from": "2020-05-01", "to": "2020-05-31"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["tickets_count"], 4)
+        self.assertEqual(response.data["reservations_count"], 3)
+        self.assertEqual(
+            [
+                (row["performance"], row["tickets_count"])
+                for row in response.data["performances"]
+            ],
+            [(1, 3), (2, 1)],
+        )
+
+    def test_report_filtered_by_play(self):
+        response = self.client.get(
+            ARCHIVE_REPORT_URL,
+            {"from": "2020-05-01", "to": "2020-05-31", "play": "2"},
+        )
+
+        self.assertEqual(response.data["tickets_count"], 1)
+
+    def test_report_requires_valid_range(self):
+        response = self.client.get(
+            ARCHIVE_REPORT_URL, {"from": "2020-05-31", "to": "2020-05-01"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_report_is_admin_only(self):
+        user = get_user_model().objects.create_user(
+            email="archive-user@test.com", password="password123"
+        )
+        self.client.force_authenticate(user)
+
+        response = self.client.get(
+            ARCHIVE_REPORT_URL, {"from": "2020-05-01", "to": "2020-05-31"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
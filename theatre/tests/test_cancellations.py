@@ -0,0 +1,198 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre import checkin
+from theatre.cancellations import reservation_cancelled
+from theatre.models import (
+    Cancellation,
+    PerformanceCard,
+    Reservation,
+    SalesRollup,
+    Ticket,
+    WaitlistEntry,
+)
+from theatre.tests.test_utils import sample_performance, sample_reservation
+
+
+def cancel_url(reservation_id):
+    return reverse("theatre:reservation-cancel", args=[reservation_id])
+
+
+def detail_url(reservation_id):
+    return reverse("theatre:reservation-detail", args=[reservation_id])
+
+
+@pytest.mark.django_db
+class CancellationTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="cancel@test.com", password="password123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.performance = sample_performance()
+        self.reservation = sample_reservation(
+            self.user,
+            performance=self.performance,
+            tickets=[{"row": 1, "seat": seat} for seat in (1, 2, 3)],
+        )
+        self.tickets = list(self.reservation.tickets.order_by("seat"))
+
+    def cancel(self, reservation_id, data=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                cancel_url(reservation_id), data or {}, format="json"
+            )
+
+    def test_partial_cancellation(self):
+        receiver = mock.Mock()
+        reservation_cancelled.connect(receiver)
+        self.addCleanup(reservation_cancelled.disconnect, receiver)
+        card = PerformanceCard.objects.get(performance=self.performance)
+
+        with mock.patch("theatre.seat_events.get_broker") as get_broker_mock:
+            response = self.cancel(
+                self.reservation.id,
+                {"tickets": [self.tickets[0].id, self.tickets[2].id]},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.data["whole_reservation"])
+        self.assertEqual(
+            list(self.reservation.tickets.values_list("seat", flat=True)), [2]
+        )
+        card.refresh_from_db()
+        self.assertEqual(
+            card.available_seats_count, card.capacity - 1
+        )
+        self.assertEqual(SalesRollup.objects.get().tickets_sold, 1)
+        get_broker_mock.return_value.publish.assert_called_once_with(
+            self.performance.id,
+            {
+                "type": "released",
+                "performance": self.performance.id,
+                "seats": [[1, 1], [1, 3]],
+            },
+        )
+        cancellation = Cancellation.objects.get()
+        self.assertEqual(
+            [ticket["seat"] for ticket in cancellation.tickets], [1, 3]
+        )
+        receiver.assert_called_once_with(
+            signal=reservation_cancelled,
+            sender=Cancellation,
+            cancellation=cancellation,
+        )
+
+    def test_whole_cancellation_deletes_the_reservation(self):
+        response = self.cancel(self.reservation.id)
+
+        self.assertTrue(response.data["whole_reservation"])
+        self.assertEqual(len(response.data["tickets"]), 3)
+        self.assertFalse(Reservation.objects.exists())
+        self.assertFalse(Ticket.objects.exists())
+
+    def test_tickets_are_deleted_with_one_query(self):
+        with CaptureQueriesContext(connection) as context:
+            self.cancel(
+                self.reservation.id,
+                {"tickets": [ticket.id for ticket in self.tickets[:2]]},
+            )
+
+        deletes = [
+            query["sql"] for query in context.captured_queries
+            if query["sql"].startswith('DELETE FROM "theatre_ticket"')
+        ]
+        self.assertEqual(len(deletes), 1)
+
+    def test_deleting_a_reservation_is_logged(self):
+        staff = get_user_model().objects.create_superuser(
+            email="staff@test.com", password="password123"
+        )
+        reservation = sample_reservation(
+            staff,
+            performance=self.performance,
+            tickets=[{"row": 2, "seat": 1}],
+        )
+        self.client.force_authenticate(staff)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(detail_url(reservation.id))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertTrue(
+            Cancellation.objects.get(reservation_id=reservation.id)
+            .whole_reservation
+        )
+
+    def test_unknown_tickets_are_rejected(self):
+        other = sample_reservation(
+            self.user,
+            performance=self.performance,
+            tickets=[{"row": 2, "seat": 1}],
+        )
+        ticket_id = other.tickets.get().id
+
+        response = self.cancel(self.reservation.id, {"tickets": [ticket_id]})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 4)
+
+    def test_started_performances_cannot_be_cancelled(self):
+        self.performance.show_time = datetime.now() - timedelta(hours=1)
+        self.performance.save()
+
+        response = self.cancel(self.reservation.id)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Ticket.objects.count(), 3)
+
+    def test_other_users_reservations_are_hidden(self):
+        other_user = get_user_model().objects.create_user(
+            email="other@test.com", password="password123"
+        )
+        self.client.force_authenticate(other_user)
+
+        response = self.cancel(self.reservation.id)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_cancelled_tickets_cannot_check_in(self):
+        token = checkin.make_token(self.tickets[0])
+
+        self.cancel(self.reservation.id, {"tickets": [self.tickets[0].id]})
+        status_, _ = checkin.CheckInRecorder().scan(token)
+
+        self.assertEqual(status_, checkin.REVOKED)
+
+    def test_cancellation_promotes_the_waitlist(self):
+        entry = WaitlistEntry.objects.create(
+            performance=self.performance, user=self.user, seats_count=1
+        )
+        Ticket.objects.bulk_create(
+            Ticket(
+                performance=self.performance,
+                reservation=self.reservation,
+                row=row,
+                seat=seat,
+            )
+            for row in range(1, self.performance.theatre_hall.rows + 1)
+            for seat in range(
+                1, self.performance.theatre_hall.seats_in_row + 1
+            )
+            if row > 1 or seat > 3
+        )
+
+        self.cancel(self.reservation.id, {"tickets": [self.tickets[1].id]})
+
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, WaitlistEntry.Status.OFFERED)
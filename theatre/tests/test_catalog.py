@@ -0,0 +1,231 @@
+import json
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.catalog import CatalogError, import_catalog, read_records
+from theatre.models import Actor, Genre, Play
+from theatre.tests.test_utils import (
+    sample_actor,
+    sample_genre,
+    sample_performance,
+    sample_play,
+)
+
+IMPORT_URL = reverse("theatre:catalog-import")
+EXPORT_URL = reverse("theatre:catalog-export")
+
+CATALOG = [
+    {"type": "genre", "name": "Drama"},
+    {"type": "actor", "first_name": "Ada", "last_name": "Stone"},
+    {
+        "type": "play",
+        "title": "Hamlet",
+        "description": "Prince of Denmark",
+        "genres": ["Drama", "Tragedy"],
+        "actors": [
+            {"first_name": "Ada", "last_name": "Stone"},
+            {"first_name": "Bob", "last_name": "Reed"},
+        ],
+    },
+]
+
+
+def jsonl(records):
+    return [json.dumps(record) + "\n" for record in records]
+
+
+@pytest.mark.django_db
+class ImportCatalogTest(TestCase):
+    def run_import(self, records, **kwargs):
+        return import_catalog(read_records(jsonl(records), "jsonl"), **kwargs)
+
+    def test_import_creates_catalog(self):
+        stats = self.run_import(CATALOG)
+
+        play = Play.objects.get(title="Hamlet")
+        self.assertEqual(
+            set(play.genres.values_list("name", flat=True)),
+            {"Drama", "Tragedy"},
+        )
+        self.assertEqual(play.actors.count(), 2)
+        self.assertEqual(stats["genres"]["created"], 2)
+        self.assertEqual(stats["actors"]["created"], 2)
+        self.assertEqual(stats["links"]["created"], 4)
+
+    def test_import_upserts_by_natural_key(self):
+        genre = sample_genre(name="Drama")
+        actor = sample_actor(first_name="Ada", last_name="Stone")
+        play = sample_play(title="Hamlet", description="Old")
+        play.genres.add(sample_genre(name="Comedy"))
+
+        stats = self.run_import(CATALOG)
+
+        play.refresh_from_db()
+        self.assertEqual(play.description, "Prince of Denmark")
+        self.assertEqual(Play.objects.count(), 1)
+        self.assertEqual(
+            set(play.genres.values_list("name", flat=True)),
+            {"Drama", "Tragedy"},
+        )
+        self.assertIn(genre, play.genres.all())
+        self.assertIn(actor, play.actors.all())
+        self.assertEqual(stats["plays"], {"created": 0, "updated": 1})
+        self.assertEqual(stats["links"]["deleted"], 1)
+
+    def test_import_refreshes_performance_cards(self):
+        performance = sample_performance(play=sample_play(title="Hamlet"))
+
+        self.run_import(CATALOG)
+
+        performance.card.refresh_from_db()
+        self.assertEqual(sorted(performance.card.genres), ["Drama", "Tragedy"])
+
+    def test_import_twice_changes_nothing(self):
+        self.run_import(CATALOG)
+        stats = self.run_import(CATALOG)
+
+        self.assertEqual(stats["plays"], {"created": 0, "updated": 0})
+        self.assertEqual(stats["links"], {"created": 0, "deleted": 0})
+
+    def test_play_without_relations_keeps_them(self):
+        self.run_import(CATALOG)
+        self.run_import([{"type": "play", "title": "Hamlet"}])
+
+        self.assertEqual(Play.objects.get(title="Hamlet").genres.count(), 2)
+
+    def test_import_uses_constant_number_of_queries(self):
+        records = [
+            {
+                "type": "play",
+                "title": f"Play {number}",
+                "genres": [f"Genre {number % 5}"],
+                "actors": [{"first_name": "Actor", "last_name": str(number)}],
+            }
+            for number in range(50)
+        ]
+        # Savepoints, lookup and insert of genres, actors and plays, then
+        # lookup and insert of each relation.
+        with self.assertNumQueries(12):
+            self.run_import(records)
+        self.assertEqual(Play.objects.count(), 50)
+
+    def test_dry_run_saves_nothing(self):
+        stats = self.run_import(CATALOG, dry_run=True)
+
+        self.assertEqual(stats["plays"]["created"], 1)
+        self.assertFalse(Play.objects.exists())
+        self.assertFalse(Genre.objects.exists())
+
+    def test_invalid_record_reports_line(self):
+        with self.assertRaisesMessage(CatalogError, "Line 2: title is required."):
+            self.run_import([CATALOG[0], {"type": "play"}])
+
+    def test_invalid_record_reports_committed_batches(self):
+        records = CATALOG + [{"type": "play"}]
+
+        with self.assertRaises(CatalogError) as context:
+            self.run_import(records, batch_size=len(CATALOG))
+
+        self.assertEqual(context.exception.stats["records"], len(CATALOG))
+        self.assertTrue(Play.objects.filter(title="Hamlet").exists())
+
+    def test_csv_round_trip(self):
+        self.run_import(CATALOG)
+        out = StringIO()
+        call_command("export_catalog", file_format="csv", stdout=out)
+        Play.objects.all().delete()
+        Actor.objects.all().delete()
+        Genre.objects.all().delete()
+
+        import_catalog(
+            read_records(StringIO(out.getvalue(), newline=""), "csv")
+        )
+
+        play = Play.objects.get(title="Hamlet")
+        self.assertEqual(play.description, "Prince of Denmark")
+        self.assertEqual(play.actors.count(), 2)
+        self.assertEqual(play.genres.count(), 2)
+
+
+@pytest.mark.django_db
+class CatalogEndpointsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            email="catalog-admin@test.com", password="password123"
+        )
+        cls.user = get_user_model().objects.create_user(
+            email="catalog-user@test.com", password="password123"
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, name="catalog.jsonl", **data):
+        file = SimpleUploadedFile(name, "".join(jsonl(CATALOG)).encode())
+        return self.client.post(
+            IMPORT_URL, {"file": file, **data}, format="multipart"
+        )
+
+    def test_import_endpoint(self):
+        response = self.upload()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["plays"]["created"], 1)
+        self.assertTrue(Play.objects.filter(title="Hamlet").exists())
+
+    def test_import_endpoint_dry_run(self):
+        response = self.upload(dry_run=True)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(Play.objects.exists())
+
+    def test_import_endpoint_reports_committed_records(self):
+        lines = jsonl(CATALOG + [{"type": "play"}])
+        file = SimpleUploadedFile("catalog.jsonl", "".join(lines).encode())
+
+        response = self.client.post(
+            IMPORT_URL, {"file": file}, format="multipart"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(f"Line {len(lines)}", response.data["file"][0])
+        self.assertEqual(response.data["committed"]["records"], 0)
+
+    def test_import_endpoint_needs_known_format(self):
+        response = self.upload(name="catalog.txt")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_endpoint_streams_jsonl(self):
+        self.upload()
+
+        response = self.client.get(EXPORT_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        records = [
+            json.loads(line)
+            for line in b"".join(response.streaming_content).splitlines()
+        ]
+        self.assertEqual(
+            [record["type"] for record in records],
+            ["genre", "genre", "actor", "actor", "play"],
+        )
+
+    def test_endpoints_are_admin_only(self):
+        self.client.force_authenticate(self.user)
+
+        self.assertEqual(
+            self.client.get(EXPORT_URL).status_code,
+            status.HTTP_403_FORBIDDEN,
+        )
+        self.assertEqual(self.upload().status_code, status.HTTP_403_FORBIDDEN)
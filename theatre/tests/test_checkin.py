@@ -0,0 +1,243 @@
+import base64
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre import checkin
+from theatre.models import CheckIn, Reservation, Ticket
+from theatre.tests.test_utils import sample_performance
+
+CHECK_IN_URL = reverse("theatre:check-in")
+CHECK_IN_SYNC_URL = reverse("theatre:check-in-sync")
+
+
+def tokens_url(reservation_id):
+    return reverse("theatre:reservation-tokens", args=[reservation_id])
+
+
+class TicketTokenTest(TestCase):
+    def test_token_round_trip(self):
+        ticket = Ticket(id=12345, performance_id=7, row=3, seat=14)
+        token = checkin.make_token(ticket)
+
+        self.assertLessEqual(len(token), 46)
+        self.assertEqual(
+            checkin.read_token(token), checkin.TicketToken(12345, 7, 3, 14)
+        )
+
+    def test_token_carries_large_ids(self):
+        ticket = Ticket(id=2**40, performance_id=2**33, row=70000, seat=70001)
+
+        self.assertEqual(
+            checkin.read_token(checkin.make_token(ticket)),
+            checkin.TicketToken(2**40, 2**33, 70000, 70001),
+        )
+
+    def test_tampered_token_is_rejected(self):
+        token = checkin.make_token(
+            Ticket(id=1, performance_id=1, row=1, seat=1)
+        )
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = checkin.TOKEN_FORMAT.pack(1, 1, 1, 2)
+        forged = base64.urlsafe_b64encode(
+            payload + raw[checkin.TOKEN_FORMAT.size:]
+        ).decode()
+
+        self.assertIsNone(checkin.read_token(forged))
+        self.assertIsNone(checkin.read_token("not a token"))
+        self.assertIsNone(checkin.read_token(token[:-2]))
+
+    def test_token_depends_on_secret_key(self):
+        ticket = Ticket(id=1, performance_id=1, row=1, seat=1)
+        token = checkin.make_token(ticket)
+
+        with override_settings(SECRET_KEY="another secret"):
+            self.assertIsNone(checkin.read_token(token))
+
+
+@pytest.mark.django_db
+class CheckInTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            email="door@test.com", password="password123"
+        )
+        cls.performance = sample_performance()
+        reservation = Reservation.objects.create(user=cls.admin)
+        cls.tickets = [
+            Ticket.objects.create(
+                row=1,
+                seat=seat,
+                performance=cls.performance,
+                reservation=reservation,
+            )
+            for seat in (1, 2, 3)
+        ]
+        cls.reservation = reservation
+
+    def setUp(self):
+        checkin.recorder.reset()
+        self.addCleanup(checkin.recorder.reset)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def scan(self, ticket, **data):
+        return self.client.post(
+            CHECK_IN_URL, {"token": checkin.make_token(ticket), **data}
+        )
+
+    def test_reservation_tokens(self):
+        response = self.client.get(tokens_url(self.reservation.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [
+                checkin.read_token(ticket["token"]).ticket_id
+                for ticket in response.data
+            ],
+            [ticket.id for ticket in self.tickets],
+        )
+
+    def test_tokens_of_other_users_are_hidden(self):
+        user = get_user_model().objects.create_user(
+            email="guest@test.com", password="password123"
+        )
+        self.client.force_authenticate(user)
+
+        response = self.client.get(tokens_url(self.reservation.id))
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_check_in_and_duplicate(self):
+        response = self.scan(self.tickets[0])
+        self.assertEqual(response.data["status"], checkin.ADMITTED)
+        self.assertEqual(response.data["ticket"], self.tickets[0].id)
+
+        response = self.scan(self.tickets[0])
+        self.assertEqual(response.data["status"], checkin.DUPLICATE)
+
+    def test_duplicate_detected_across_workers(self):
+        self.scan(self.tickets[0])
+        # Another process starts with an empty bitmap.
+        checkin.recorder.reset()
+
+        response = self.scan(self.tickets[0])
+
+        self.assertEqual(response.data["status"], checkin.DUPLICATE)
+
+    def test_scans_need_no_queries(self):
+        self.scan(self.tickets[0])
+
+        with self.assertNumQueries(0):
+            checkin.recorder.scan(checkin.make_token(self.tickets[1]))
+        with self.assertNumQueries(0):
+            checkin.recorder.scan(checkin.make_token(self.tickets[1]))
+
+    def test_wrong_performance_and_invalid_token(self):
+        response = self.scan(
+            self.tickets[0], performance=self.performance.id + 1
+        )
+        self.assertEqual(response.data["status"], checkin.WRONG_PERFORMANCE)
+
+        response = self.client.post(CHECK_IN_URL, {"token": "forged"})
+        self.assertEqual(response.data["status"], checkin.INVALID)
+        self.assertIsNone(response.data["ticket"])
+
+    @override_settings(CHECKIN_BATCH_SIZE=2, CHECKIN_FLUSH_INTERVAL=60)
+    def test_check_ins_are_written_in_batches(self):
+        self.scan(self.tickets[0])
+        self.assertFalse(CheckIn.objects.exists())
+
+        self.scan(self.tickets[1])
+        self.assertEqual(
+            set(CheckIn.objects.values_list("ticket_id", flat=True)),
+            {self.tickets[0].id, self.tickets[1].id},
+        )
+
+    def test_check_ins_are_loaded_from_database(self):
+        self.scan(self.tickets[0])
+        checkin.recorder.flush()
+        checkin.recorder.reset()
+        cache.clear()
+
+        response = self.scan(self.tickets[0])
+
+        self.assertEqual(response.data["status"], checkin.DUPLICATE)
+
+    def test_resold_seat_is_admitted(self):
+        self.scan(self.tickets[0])
+        self.tickets[0].delete()
+        resold = Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=self.performance,
+            reservation=self.reservation,
+        )
+
+        response = self.scan(resold)
+
+        self.assertEqual(response.data["status"], checkin.ADMITTED)
+
+    def test_sync_offline_scans(self):
+        tokens = [checkin.make_token(ticket) for ticket in self.tickets[:2]]
+        self.scan(self.tickets[0])
+
+        response = self.client.post(
+            CHECK_IN_SYNC_URL,
+            {
+                "performance": self.performance.id,
+                "scans": [
+                    {"token": tokens[1], "scanned_at": "2024-11-10T18:50:00"},
+                    {"token": tokens[1], "scanned_at": "2024-11-10T18:51:00"},
+                    {"token": tokens[0], "scanned_at": "2024-11-10T18:52:00"},
+                ],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [result["status"] for result in response.data],
+            [checkin.ADMITTED, checkin.DUPLICATE, checkin.DUPLICATE],
+        )
+        check_in = CheckIn.objects.get(ticket_id=self.tickets[1].id)
+        self.assertEqual(check_in.checked_in_at.minute, 50)
+
+    def test_check_in_is_staff_only(self):
+        user = get_user_model().objects.create_user(
+            email="visitor@test.com", password="password123"
+        )
+        self.client.force_authenticate(user)
+
+        response = self.scan(self.tickets[0])
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@pytest.mark.django_db(transaction=True)
+class CheckInFlushTest(TransactionTestCase):
+    def setUp(self):
+        checkin.recorder.reset()
+        self.addCleanup(checkin.recorder.reset)
+
+    @override_settings(CHECKIN_BATCH_SIZE=50, CHECKIN_FLUSH_INTERVAL=0.05)
+    def test_idle_scans_are_flushed_by_the_timer(self):
+        user = get_user_model().objects.create_user(
+            email="idle@test.com", password="password123"
+        )
+        ticket = Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=sample_performance(),
+            reservation=Reservation.objects.create(user=user),
+        )
+
+        checkin.recorder.scan(checkin.make_token(ticket))
+        checkin.recorder.timer.join(5)
+
+        self.assertTrue(CheckIn.objects.filter(ticket_id=ticket.id).exists())
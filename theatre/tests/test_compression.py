@@ -0,0 +1,199 @@
+import gzip
+import json
+from datetime import datetime, timedelta
+from unittest import mock, skipIf
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    override_settings,
+)
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theatre import compression
+from theatre.tests.test_utils import (
+    sample_performance,
+    sample_play,
+    sample_theatre_hall,
+)
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+CATALOG_EXPORT_URL = reverse("theatre:catalog-export")
+SCHEMA_URL = reverse("schema")
+
+
+def compressed_response(content, accept="gzip", **kwargs):
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept)
+    return compression.compress_response(
+        request, HttpResponse(content, **kwargs)
+    )
+
+
+class NegotiationTest(SimpleTestCase):
+    def test_prefers_brotli_when_available(self):
+        expected = "br" if compression.brotli is not None else "gzip"
+        self.assertEqual(compression.negotiate("gzip, deflate, br"), expected)
+        self.assertEqual(compression.negotiate("*"), expected)
+
+    def test_respects_weights(self):
+        self.assertEqual(compression.negotiate("br;q=0, gzip"), "gzip")
+        self.assertEqual(compression.negotiate("gzip;q=0"), None)
+        self.assertFalse(compression.accepts("gzip;q=0, br", "gzip"))
+        self.assertTrue(compression.accepts("*", "gzip"))
+        self.assertEqual(compression.negotiate("identity"), None)
+        self.assertEqual(compression.negotiate(""), None)
+
+
+class CompressResponseTest(SimpleTestCase):
+    body = json.dumps([{"id": i, "title": "Hamlet"} for i in range(200)])
+
+    def test_compresses_large_json(self):
+        response = compressed_response(
+            self.body, content_type="application/json"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.content).decode(), self.body)
+        self.assertEqual(int(response["Content-Length"]), len(response.content))
+
+    def test_skips_small_bodies(self):
+        response = compressed_response(
+            '{"id": 1}', content_type="application/json"
+        )
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_skips_compressed_media_and_encoded_responses(self):
+        image = compressed_response(self.body, content_type="image/png")
+        encoded = HttpResponse(
+            gzip.compress(self.body.encode()), content_type="application/json"
+        )
+        encoded["Content-Encoding"] = "gzip"
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        encoded_content = encoded.content
+
+        compression.compress_response(request, encoded)
+
+        self.assertFalse(image.has_header("Content-Encoding"))
+        self.assertEqual(encoded.content, encoded_content)
+
+    def test_skips_event_streams(self):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = StreamingHttpResponse(
+            iter([b"data: {}\n\n"]), content_type="text/event-stream"
+        )
+
+        compression.compress_response(request, response)
+
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_compresses_streams_incrementally(self):
+        chunks = [f"{i},Hamlet\n".encode() * 50 for i in range(100)]
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = StreamingHttpResponse(iter(chunks), content_type="text/csv")
+
+        compression.compress_response(request, response)
+        output = list(response.streaming_content)
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertGreater(len(output), 1)
+        self.assertEqual(gzip.decompress(b"".join(output)), b"".join(chunks))
+
+    def test_weakens_strong_etag(self):
+        request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+        response = HttpResponse(self.body, content_type="application/json")
+        response["ETag"] = '"abc"'
+
+        compression.compress_response(request, response)
+
+        self.assertEqual(response["ETag"], 'W/"abc"')
+
+    @skipIf(compression.brotli is None, "brotli is not installed")
+    def test_brotli(self):
+        response = compressed_response(
+            self.body, accept="br", content_type="application/json"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(
+            compression.brotli.decompress(response.content).decode(),
+            self.body,
+        )
+
+    def test_identical_bodies_are_compressed_once(self):
+        with mock.patch(
+            "theatre.compression.compress", wraps=compression.compress
+        ) as compress_mock:
+            first = compressed_response(
+                self.body, content_type="application/json"
+            )
+            second = compressed_response(
+                self.body, content_type="application/json"
+            )
+
+        compress_mock.assert_called_once()
+        self.assertEqual(first.content, second.content)
+
+    @override_settings(COMPRESSION_CACHE=None)
+    def test_nothing_is_cached_without_a_compression_cache(self):
+        with mock.patch(
+            "theatre.compression.compress", wraps=compression.compress
+        ) as compress_mock:
+            for _ in range(2):
+                compressed_response(
+                    self.body, content_type="application/json"
+                )
+
+        self.assertEqual(compress_mock.call_count, 2)
+
+
+@pytest.mark.django_db
+class CompressionMiddlewareTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_superuser(
+            email="compression@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+        hall = sample_theatre_hall()
+        play = sample_play()
+        for hour in range(30):
+            sample_performance(
+                play=play,
+                theatre_hall=hall,
+                show_time=datetime(2030, 1, 1) + timedelta(hours=hour * 3),
+            )
+
+    def test_list_is_compressed(self):
+        plain = self.client.get(PERFORMANCE_URL)
+        response = self.client.get(
+            PERFORMANCE_URL, HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    def test_streaming_export_is_compressed(self):
+        plain = self.client.get(CATALOG_EXPORT_URL)
+        response = self.client.get(
+            CATALOG_EXPORT_URL, HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(
+            gzip.decompress(b"".join(response.streaming_content)),
+            b"".join(plain.streaming_content),
+        )
+
+    def test_pre_compressed_schema_is_not_compressed_twice(self):
+        response = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn(b"openapi", gzip.decompress(response.content))
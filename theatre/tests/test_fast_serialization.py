@@ -0,0 +1,99 @@
+import datetime
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from theatre import renderers
+from theatre.models import Reservation, Ticket
+from theatre.renderers import FastJSONRenderer
+from theatre.tests.test_utils import (
+    sample_actor,
+    sample_performance,
+    sample_play,
+    sample_theatre_hall,
+)
+
+LIST_URLS = (
+    reverse("theatre:actor-list"),
+    reverse("theatre:play-list"),
+    reverse("theatre:performance-list"),
+)
+
+
+@pytest.mark.django_db
+class FastListSerializationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="fast@example.com",
+            password="password123",
+        )
+        sample_actor(first_name="Ёжик", last_name="Line\u2028break")
+        sample_actor(image="uploads/images/doe.jpg")
+        hall = sample_theatre_hall(rows=3, seats_in_row=4)
+        performance = sample_performance(
+            play=sample_play(title="Чайка"),
+            theatre_hall=hall,
+            show_time=datetime.datetime(2030, 5, 1, 19, 30, 15, 120),
+        )
+        sample_performance(theatre_hall=hall)
+        reservation = Reservation.objects.create(user=cls.user)
+        Ticket.objects.create(
+            row=1, seat=2, performance=performance, reservation=reservation
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_fast_path_output_is_identical(self):
+        for url in LIST_URLS:
+            with override_settings(FAST_LIST_SERIALIZATION=False):
+                expected = self.client.get(url).content
+            with override_settings(FAST_LIST_SERIALIZATION=True):
+                content = self.client.get(url).content
+
+            self.assertEqual(content, expected, url)
+
+    def test_fast_path_uses_single_query(self):
+        with override_settings(FAST_LIST_SERIALIZATION=True):
+            for url in LIST_URLS:
+                with self.assertNumQueries(1):
+                    self.client.get(url)
+
+
+class FastJSONRendererTest(TestCase):
+    data = [
+        {
+            "id": 1,
+            "title": "Чайка\u2028\u2029",
+            "show_time": datetime.datetime(2030, 5, 1, 19, 30),
+            "price": None,
+            "sold_out": False,
+        }
+    ]
+
+    def test_output_matches_json_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(self.data),
+            JSONRenderer().render(self.data),
+        )
+
+    def test_falls_back_without_orjson(self):
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(
+                FastJSONRenderer().render(self.data),
+                JSONRenderer().render(self.data),
+            )
+
+    def test_indented_output_uses_json_renderer(self):
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, media_type),
+            JSONRenderer().render(self.data, media_type),
+        )
@@ -0,0 +1,129 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.tests.test_utils import (
+    sample_actor,
+    sample_genre,
+    sample_performance,
+    sample_play,
+    sample_theatre_hall,
+)
+
+PLAY_URL = reverse("theatre:play-list")
+PERFORMANCE_URL = reverse("theatre:performance-list")
+
+
+def play_detail_url(play_id):
+    return reverse("theatre:play-detail", args=[play_id])
+
+
+def performance_detail_url(performance_id):
+    return reverse("theatre:performance-detail", args=[performance_id])
+
+
+@pytest.mark.django_db
+class ExpandableFieldsTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="fields@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.hall = sample_theatre_hall()
+        self.actor = sample_actor()
+        self.genre = sample_genre()
+        self.play = sample_play(title="Hamlet")
+        self.play.actors.add(self.actor)
+        self.play.genres.add(self.genre)
+        self.performance = sample_performance(
+            play=self.play, theatre_hall=self.hall
+        )
+
+    def test_play_detail_expands_relations_by_default(self):
+        response = self.client.get(play_detail_url(self.play.id))
+
+        self.assertEqual(response.data["actors"][0]["id"], self.actor.id)
+        self.assertEqual(response.data["genres"][0]["name"], self.genre.name)
+
+    def test_expand_selects_relations(self):
+        response = self.client.get(
+            play_detail_url(self.play.id), {"expand": "genres"}
+        )
+
+        self.assertEqual(response.data["actors"], [self.actor.id])
+        self.assertEqual(response.data["genres"][0]["name"], self.genre.name)
+
+    def test_fields_trim_payload_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                play_detail_url(self.play.id), {"fields": "id,title,image"}
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data), {"id", "title", "image"})
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("description", queries[0]["sql"])
+
+    def test_nested_fields_and_expand(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                performance_detail_url(self.performance.id),
+                {"expand": "play", "fields": "id,play.title"},
+            )
+
+        self.assertEqual(
+            response.data,
+            {"id": self.performance.id, "play": {"title": "Hamlet"}},
+        )
+
+    def test_performance_detail_keeps_full_nesting_by_default(self):
+        response = self.client.get(performance_detail_url(self.performance.id))
+
+        self.assertEqual(response.data["theatre_hall"]["id"], self.hall.id)
+        self.assertEqual(
+            response.data["play"]["actors"][0]["id"], self.actor.id
+        )
+
+    def test_expanded_list_queries_do_not_grow_with_rows(self):
+        params = {"expand": "play.genres,theatre_hall"}
+        with CaptureQueriesContext(connection) as few:
+            self.client.get(PERFORMANCE_URL, params)
+
+        for _ in range(3):
+            play = sample_play()
+            play.genres.add(sample_genre(name=f"Genre {play.id}"))
+            sample_performance(play=play, theatre_hall=self.hall)
+        with CaptureQueriesContext(connection) as many:
+            response = self.client.get(PERFORMANCE_URL, params)
+
+        self.assertEqual(len(response.data), 4)
+        self.assertEqual(
+            response.data[0]["play"]["genres"][0]["name"], self.genre.name
+        )
+        self.assertEqual(len(many), len(few))
+
+    @override_settings(FAST_LIST_SERIALIZATION=True)
+    def test_fast_list_applies_fields(self):
+        response = self.client.get(PLAY_URL, {"fields": "id"})
+
+        self.assertEqual(response.data, [{"id": self.play.id}])
+
+    def test_fields_do_not_apply_to_writes(self):
+        admin = get_user_model().objects.create_superuser(
+            email="fields-admin@test.com", password="password123"
+        )
+        self.client.force_authenticate(admin)
+        response = self.client.post(
+            f"{PLAY_URL}?fields=id",
+            {"title": "Medea", "description": "Tragedy"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["title"], "Medea")
@@ -0,0 +1,130 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.tests.test_utils import (
+    sample_actor,
+    sample_genre,
+    sample_performance,
+    sample_play,
+    sample_theatre_hall,
+)
+
+ACTOR_BATCH_URL = reverse("theatre:actor-batch")
+GENRE_BATCH_URL = reverse("theatre:genre-batch")
+
+
+def actor_detail_url(actor_id):
+    return reverse("theatre:actor-detail", args=[actor_id])
+
+
+def genre_detail_url(genre_id):
+    return reverse("theatre:genre-detail", args=[genre_id])
+
+
+@pytest.mark.django_db
+@override_settings(
+    FILMOGRAPHY_PLAYS_LIMIT=2, FILMOGRAPHY_PERFORMANCES_LIMIT=2
+)
+class FilmographyTest(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user(
+            email="filmography@test.com", password="password123"
+        )
+        self.client.force_authenticate(self.user)
+
+        self.hall = sample_theatre_hall()
+        self.actor = sample_actor(first_name="Ada", last_name="Stone")
+        self.other_actor = sample_actor(first_name="Bo", last_name="Lake")
+        self.genre = sample_genre(name="Drama")
+        now = timezone.now()
+
+        self.plays = []
+        for number, title in enumerate(("Cymbeline", "Antigone", "Bacchae")):
+            play = sample_play(title=title)
+            play.actors.add(self.actor)
+            play.genres.add(self.genre)
+            self.plays.append(play)
+        self.plays[0].actors.add(self.other_actor)
+
+        self.past = sample_performance(
+            play=self.plays[0],
+            theatre_hall=self.hall,
+            show_time=now - timedelta(days=1),
+        )
+        self.upcoming = [
+            sample_performance(
+                play=self.plays[day % 3],
+                theatre_hall=self.hall,
+                show_time=now + timedelta(days=day + 1),
+            )
+            for day in range(3)
+        ]
+
+    def test_actor_detail_embeds_first_plays_and_next_performances(self):
+        response = self.client.get(actor_detail_url(self.actor.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [play["title"] for play in response.data["plays"]],
+            ["Antigone", "Bacchae"],
+        )
+        self.assertEqual(response.data["plays_count"], 3)
+        self.assertEqual(
+            [item["id"] for item in response.data["upcoming_performances"]],
+            [self.upcoming[0].id, self.upcoming[1].id],
+        )
+
+    def test_genre_detail(self):
+        response = self.client.get(genre_detail_url(self.genre.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["plays_count"], 3)
+        self.assertEqual(len(response.data["plays"]), 2)
+        self.assertEqual(len(response.data["upcoming_performances"]), 2)
+
+    def test_actor_batch_uses_fixed_number_of_queries(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                ACTOR_BATCH_URL,
+                {"ids": f"{self.actor.id},{self.other_actor.id}"},
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [actor["id"] for actor in response.data],
+            [self.actor.id, self.other_actor.id],
+        )
+        other = response.data[1]
+        self.assertEqual(
+            [play["title"] for play in other["plays"]], ["Cymbeline"]
+        )
+        self.assertEqual(
+            [item["id"] for item in other["upcoming_performances"]],
+            [self.upcoming[0].id],
+        )
+
+    def test_genre_batch(self):
+        empty = sample_genre(name="Farce")
+        response = self.client.get(
+            GENRE_BATCH_URL, {"ids": f"{self.genre.id},{empty.id}"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[1]["plays"], [])
+        self.assertEqual(response.data[1]["plays_count"], 0)
+        self.assertEqual(response.data[1]["upcoming_performances"], [])
+
+    def test_batch_validates_ids(self):
+        for params in ({}, {"ids": "1,x"}, {"ids": ",".join(["1"] * 101)}):
+            response = self.client.get(ACTOR_BATCH_URL, params)
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST, params
+            )
@@ -0,0 +1,105 @@
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.utils import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+
+from theatre import health
+from theatre.management.commands.wait_for_db import backoff_delay
+
+
+@pytest.mark.django_db
+class HealthEndpointsTest(TestCase):
+    def setUp(self):
+        health.reset_readiness()
+        self.addCleanup(health.reset_readiness)
+
+    def test_healthz(self):
+        response = self.client.get(reverse("healthz"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"status": "ok"})
+
+    def test_readyz_when_dependencies_are_up(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        media_root = os.path.join(directory.name, "media")
+
+        with override_settings(MEDIA_ROOT=media_root):
+            response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(os.path.isdir(media_root))
+        self.assertEqual(
+            set(response.json()["checks"]),
+            {"database", "cache", "media_storage"},
+        )
+
+    def test_readyz_reports_failed_check(self):
+        with mock.patch.dict(
+            health.READINESS_CHECKS,
+            {"cache": mock.Mock(side_effect=RuntimeError("down"))},
+        ):
+            response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(
+            response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        self.assertEqual(
+            response.json()["checks"]["cache"], {"ok": False, "error": "down"}
+        )
+
+    @override_settings(READINESS_CHECK_TIMEOUT=0.05)
+    def test_readyz_times_out_slow_check(self):
+        slow = mock.Mock(side_effect=lambda: health.time.sleep(0.5))
+        with mock.patch.dict(health.READINESS_CHECKS, {"database": slow}):
+            response = self.client.get(reverse("readyz"))
+
+        self.assertEqual(
+            response.json()["checks"]["database"],
+            {"ok": False, "error": "timeout"},
+        )
+
+    def test_readyz_result_is_cached(self):
+        check = mock.Mock()
+        with mock.patch.dict(health.READINESS_CHECKS, {"cache": check}):
+            self.client.get(reverse("readyz"))
+            self.client.get(reverse("readyz"))
+
+        check.assert_called_once()
+
+
+class WaitForDbTest(TestCase):
+    @mock.patch("theatre.management.commands.wait_for_db.time.sleep")
+    @mock.patch("django.db.backends.base.base.BaseDatabaseWrapper.ensure_connection")
+    def test_retries_until_database_is_ready(self, ensure_connection, sleep):
+        ensure_connection.side_effect = [OperationalError] * 3 + [None]
+
+        call_command("wait_for_db", stdout=StringIO())
+
+        self.assertEqual(ensure_connection.call_count, 4)
+        self.assertEqual(sleep.call_count, 3)
+
+    @mock.patch("theatre.management.commands.wait_for_db.time.sleep")
+    @mock.patch("django.db.backends.base.base.BaseDatabaseWrapper.ensure_connection")
+    def test_gives_up_after_max_attempts(self, ensure_connection, sleep):
+        ensure_connection.side_effect = OperationalError
+
+        with self.assertRaises(CommandError):
+            call_command("wait_for_db", max_attempts=3, stdout=StringIO())
+
+        self.assertEqual(ensure_connection.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_backoff_delay_is_capped(self):
+        for attempt in range(1, 20):
+            delay = backoff_delay(attempt, base_delay=0.5, max_delay=10)
+            self.assertGreaterEqual(delay, 0)
+            self.assertLessEqual(delay, min(10, 0.5 * 2 ** (attempt - 1)))
@@ -0,0 +1,83 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import IdempotencyKey, Reservation, Ticket
+from theatre.tests.test_utils import sample_performance
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+@pytest.mark.django_db
+class IdempotentReservationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser(
+            email="idempotent@test.com",
+            password="password123",
+        )
+        cls.performance = sample_performance()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def post(self, seat, key=None):
+        headers = {"Idempotency-Key": key} if key else {}
+        return self.client.post(
+            RESERVATION_URL,
+            {"tickets": [
+                {"performance": self.performance.id, "row": 1, "seat": seat}
+            ]},
+            format="json",
+            headers=headers,
+        )
+
+    def test_retry_replays_first_response(self):
+        first = self.post(seat=1, key="retry-1")
+        second = self.post(seat=1, key="retry-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(second["Idempotent-Replayed"], "true")
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertEqual(Ticket.objects.count(), 1)
+
+    def test_same_key_with_different_body_is_rejected(self):
+        self.post(seat=1, key="retry-2")
+        response = self.post(seat=2, key="retry-2")
+
+        self.assertEqual(
+            response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_failed_request_does_not_store_key(self):
+        response = self.post(seat=999, key="retry-3")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(IdempotencyKey.objects.filter(key="retry-3").exists())
+
+    def test_expired_key_is_reused(self):
+        self.post(seat=1, key="retry-4")
+        IdempotencyKey.objects.filter(key="retry-4").update(
+            created_at=timezone.now() - timedelta(days=2)
+        )
+
+        response = self.post(seat=2, key="retry-4")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Reservation.objects.count(), 2)
+
+    def test_without_key_creates_every_time(self):
+        self.post(seat=1)
+        self.post(seat=2)
+
+        self.assertEqual(Reservation.objects.count(), 2)
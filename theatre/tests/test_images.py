@@ -40,6 +40,7 @@ class ImageUploadTest(TestCase):
         self.assertTrue(actor.image.name.endswith('.jpg'))
 
         self.assertTrue(os.path.exists(actor.image.path))
+        # Identical content is stored once.
+        self.assertEqual(play.image.name, actor.image.name)
 
         os.remove(actor.image.path)
-        os.remove(play.image.path)
@@ -0,0 +1,210 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+from io import BytesIO, StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import (
+    SimpleUploadedFile,
+    TemporaryUploadedFile,
+)
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+from rest_framework.test import APIClient
+
+from theatre.media import INCOMING_DIR, collect_garbage
+from theatre.tests.test_utils import sample_actor, sample_play
+
+CONTENT = b"poster-bytes" * 100
+DIGEST = hashlib.sha256(CONTENT).hexdigest()
+
+
+def media_url(name):
+    return reverse("media", args=[name])
+
+
+def make_old(path):
+    past = time.time() - 7 * 86400
+    os.utime(path, (past, past))
+
+
+@pytest.mark.django_db
+class ContentAddressedMediaTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.addCleanup(shutil.rmtree, self.media_root)
+
+    def test_files_are_named_by_content_hash(self):
+        name = default_storage.save(
+            "uploads/images/upload.JPG", ContentFile(CONTENT)
+        )
+
+        self.assertEqual(
+            name, f"uploads/images/{DIGEST[:2]}/{DIGEST[2:4]}/{DIGEST}.jpg"
+        )
+        with default_storage.open(name) as file:
+            self.assertEqual(file.read(), CONTENT)
+
+    def test_identical_uploads_are_stored_once(self):
+        first = default_storage.save(
+            "uploads/images/a.jpg", ContentFile(CONTENT)
+        )
+        second = default_storage.save(
+            "uploads/images/b.jpg", ContentFile(CONTENT)
+        )
+
+        self.assertEqual(first, second)
+        self.assertEqual(
+            os.listdir(os.path.dirname(default_storage.path(first))),
+            [os.path.basename(first)],
+        )
+        self.assertEqual(os.listdir(default_storage.path(INCOMING_DIR)), [])
+
+    def test_temporary_uploads_are_moved(self):
+        upload = TemporaryUploadedFile("poster.png", "image/png", 0, None)
+        self.addCleanup(upload.close)
+        upload.write(CONTENT)
+        upload.seek(0)
+
+        name = default_storage.save("uploads/images/upload.png", upload)
+
+        self.assertTrue(name.endswith(f"{DIGEST}.png"))
+        self.assertFalse(os.path.exists(upload.temporary_file_path()))
+
+    def test_models_share_identical_images(self):
+        image = SimpleUploadedFile("a.jpg", CONTENT, content_type="image/jpeg")
+        actor = sample_actor(image=image)
+        play = sample_play(
+            image=SimpleUploadedFile("b.jpg", CONTENT, "image/jpeg")
+        )
+
+        self.assertEqual(actor.image.name, play.image.name)
+
+    def test_garbage_collection(self):
+        kept = sample_actor(
+            image=SimpleUploadedFile("a.jpg", CONTENT, "image/jpeg")
+        ).image.name
+        orphan = default_storage.save(
+            "uploads/images/b.jpg", ContentFile(b"orphan" * 10)
+        )
+        young = default_storage.save(
+            "uploads/images/c.jpg", ContentFile(b"young" * 10)
+        )
+        make_old(default_storage.path(kept))
+        make_old(default_storage.path(orphan))
+
+        self.assertEqual(collect_garbage(dry_run=True), [orphan])
+        self.assertTrue(default_storage.exists(orphan))
+
+        out = StringIO()
+        call_command("collect_media_garbage", stdout=out)
+
+        self.assertIn("Deleted 1 unreferenced files.", out.getvalue())
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertTrue(default_storage.exists(kept))
+        self.assertTrue(default_storage.exists(young))
+
+    def test_reupload_protects_file_from_collection(self):
+        name = default_storage.save(
+            "uploads/images/a.jpg", ContentFile(CONTENT)
+        )
+        make_old(default_storage.path(name))
+
+        default_storage.save("uploads/images/b.jpg", ContentFile(CONTENT))
+
+        self.assertEqual(collect_garbage(), [])
+
+    def test_serves_hashed_files_as_immutable(self):
+        name = default_storage.save(
+            "uploads/images/a.jpg", ContentFile(CONTENT)
+        )
+
+        response = self.client.get(media_url(name))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT)
+        self.assertEqual(response["ETag"], f'"{DIGEST}"')
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response["Content-Type"], "image/jpeg")
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+        not_modified = self.client.get(
+            media_url(name), HTTP_IF_NONE_MATCH=f'"{DIGEST}"'
+        )
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_serves_byte_ranges(self):
+        name = default_storage.save(
+            "uploads/images/a.jpg", ContentFile(CONTENT)
+        )
+        size = len(CONTENT)
+
+        response = self.client.get(media_url(name), HTTP_RANGE="bytes=0-3")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b"".join(response.streaming_content), CONTENT[:4])
+        self.assertEqual(response["Content-Range"], f"bytes 0-3/{size}")
+
+        suffix = self.client.get(media_url(name), HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(suffix.streaming_content), CONTENT[-5:])
+
+        stale = self.client.get(
+            media_url(name), HTTP_RANGE="bytes=0-3", HTTP_IF_RANGE='"other"'
+        )
+        self.assertEqual(stale.status_code, 200)
+
+        unsatisfiable = self.client.get(
+            media_url(name), HTTP_RANGE=f"bytes={size}-"
+        )
+        self.assertEqual(unsatisfiable.status_code, 416)
+
+    def test_legacy_files_are_revalidated(self):
+        path = os.path.join(self.media_root, "uploads/images/old-name.jpg")
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as file:
+            file.write(CONTENT)
+
+        response = self.client.get(media_url("uploads/images/old-name.jpg"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Cache-Control"], "public, no-cache")
+
+    def test_rejects_paths_outside_media(self):
+        for path in ("../manage.py", f"{INCOMING_DIR}/x.part", "missing.jpg"):
+            response = self.client.get(f"/media/{path}")
+            self.assertEqual(response.status_code, 404, path)
+
+    def test_upload_image_endpoint_deduplicates(self):
+        client = APIClient()
+        client.force_authenticate(
+            get_user_model().objects.create_superuser(
+                email="media@test.com", password="password123"
+            )
+        )
+        names = []
+        for actor in (sample_actor(), sample_actor()):
+            response = client.post(
+                reverse("theatre:actor-upload-image", args=[actor.id]),
+                {"image": self.png()},
+                format="multipart",
+            )
+            self.assertEqual(response.status_code, 200, response.data)
+            actor.refresh_from_db()
+            names.append(actor.image.name)
+
+        self.assertEqual(names[0], names[1])
+
+    @staticmethod
+    def png():
+        buffer = BytesIO()
+        Image.new("RGB", (4, 4), "red").save(buffer, format="PNG")
+        return SimpleUploadedFile("poster.png", buffer.getvalue(), "image/png")
@@ -0,0 +1,138 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.tests.test_utils import sample_performance
+
+METRICS_URL = reverse("metrics")
+PLAY_URL = reverse("theatre:play-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+def sample_value(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+class MetricsEndpointTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="metrics-user@test.com",
+            password="password123",
+        )
+        cls.admin = get_user_model().objects.create_superuser(
+            email="metrics-admin@test.com",
+            password="password123",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_metrics_forbidden_for_regular_user(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(METRICS_URL)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_metrics_available_for_admin(self):
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.get(METRICS_URL)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn(b"theatre_http_requests_total", response.content)
+
+    @override_settings(METRICS_TOKEN="scrape-secret")
+    def test_metrics_available_with_token(self):
+        response = self.client.get(
+            METRICS_URL, headers={"Authorization": "Bearer scrape-secret"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(
+            METRICS_URL, headers={"Authorization": "Bearer wrong"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_requests_are_counted_per_route_and_action(self):
+        labels = {
+            "route": "theatre:play-list",
+            "action": "list",
+            "method": "GET",
+            "status": "200",
+        }
+        before = sample_value("theatre_http_requests_total", **labels)
+        queries_before = sample_value(
+            "theatre_http_request_db_queries_count",
+            route="theatre:play-list",
+            action="list",
+        )
+
+        self.client.force_authenticate(user=self.user)
+        self.client.get(PLAY_URL)
+
+        self.assertEqual(
+            sample_value("theatre_http_requests_total", **labels), before + 1
+        )
+        self.assertEqual(
+            sample_value(
+                "theatre_http_request_db_queries_count",
+                route="theatre:play-list",
+                action="list",
+            ),
+            queries_before + 1,
+        )
+
+
+@pytest.mark.django_db
+class ReservationMetricsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            email="metrics-reservations@test.com",
+            password="password123",
+        )
+        cls.performance = sample_performance()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def reserve(self):
+        return self.client.post(
+            RESERVATION_URL,
+            {"tickets": [
+                {"performance": self.performance.id, "row": 1, "seat": 1}
+            ]},
+            format="json",
+        )
+
+    def test_reservation_outcomes_are_counted(self):
+        success = sample_value("theatre_reservations_total", outcome="success")
+        conflict = sample_value("theatre_reservations_total", outcome="conflict")
+        sold = sample_value(
+            "theatre_tickets_sold_total", performance=str(self.performance.id)
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.reserve()
+        response = self.reserve()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            sample_value("theatre_reservations_total", outcome="success"),
+            success + 1,
+        )
+        self.assertEqual(
+            sample_value("theatre_reservations_total", outcome="conflict"),
+            conflict + 1,
+        )
+        self.assertEqual(
+            sample_value(
+                "theatre_tickets_sold_total",
+                performance=str(self.performance.id),
+            ),
+            sold + 1,
+        )
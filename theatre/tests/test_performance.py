@@ -1,4 +1,5 @@
 import datetime
+from unittest import mock
 
 import pytest
 from django.contrib.auth import get_user_model
@@ -7,7 +8,7 @@ from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
-from theatre.models import Performance
+from theatre.models import Performance, Reservation, TheatreHall, Ticket
 from theatre.serializers import (
     PerformanceListSerializer,
     PerformanceDetailSerializer,
@@ -19,6 +20,8 @@ from theatre.tests.test_utils import (
 )
 
 PERFORMANCE_URL = reverse("theatre:performance-list")
+CALENDAR_URL = reverse("theatre:performance-calendar")
+SCHEDULE_URL = reverse("theatre:performance-schedule")
 
 
 def detail_url(performance_id):
@@ -135,3 +138,216 @@ class TestAdminUser(TestCase):
         }
         response = self.client.post(PERFORMANCE_URL, payload)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_overlapping_performance_is_rejected(self):
+        sample_performance(
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+            show_time=datetime.datetime(2024, 11, 10, 18, 0),
+        )
+        payload = {
+            "play": self.play.id,
+            "theatre_hall": self.theatre_hall.id,
+            "show_time": "2024-11-10T19:30:00",
+        }
+        response = self.client.post(PERFORMANCE_URL, payload)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("show_time", response.data)
+
+        payload["show_time"] = "2024-11-10T20:00:00"
+        response = self.client.post(PERFORMANCE_URL, payload)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_overlap_check_locks_the_hall(self):
+        performance = sample_performance(
+            play=self.play, theatre_hall=self.theatre_hall
+        )
+        payload = {
+            "play": self.play.id,
+            "theatre_hall": self.theatre_hall.id,
+            "show_time": "2024-11-10T19:30:00",
+        }
+
+        with mock.patch.object(
+            TheatreHall.objects,
+            "select_for_update",
+            wraps=TheatreHall.objects.select_for_update,
+        ) as select_for_update:
+            self.client.post(PERFORMANCE_URL, payload)
+            self.client.patch(
+                detail_url(performance.id), {"show_time": "2024-11-12T18:00"}
+            )
+
+        self.assertEqual(select_for_update.call_count, 2)
+
+
+@pytest.mark.django_db
+class TestPerformanceSchedule(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser(
+            email="schedule@mail.com",
+            password="password123",
+        )
+        cls.theatre_hall = sample_theatre_hall()
+        cls.play = sample_play()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def schedule(self, **params):
+        payload = {
+            "play": self.play.id,
+            "theatre_hall": self.theatre_hall.id,
+            "date_from": "2024-11-01",
+            "date_to": "2024-11-30",
+            "weekdays": [4, 5],
+            "times": ["14:00", "19:00"],
+        }
+        payload.update(params)
+        return self.client.post(SCHEDULE_URL, payload, format="json")
+
+    def test_schedule_creates_performances(self):
+        response = self.schedule()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # Ten Fridays and Saturdays in November 2024, two shows each.
+        self.assertEqual(len(response.data), 20)
+        show_times = list(
+            Performance.objects.order_by("show_time")
+            .values_list("show_time", flat=True)
+        )
+        self.assertEqual(show_times[0], datetime.datetime(2024, 11, 1, 14, 0))
+        self.assertEqual(show_times[-1], datetime.datetime(2024, 11, 30, 19, 0))
+        self.assertTrue(
+            all(show_time.weekday() in (4, 5) for show_time in show_times)
+        )
+
+    def test_schedule_uses_constant_number_of_queries(self):
+        # Lookups, hall lock, conflict check, one insert, then the card
+        # and sales rollup refreshes.
+        with self.assertNumQueries(16):
+            self.schedule()
+        self.assertEqual(Performance.objects.count(), 20)
+
+    def test_schedule_rejects_conflicts_with_existing_performances(self):
+        existing = sample_performance(
+            play=sample_play(),
+            theatre_hall=self.theatre_hall,
+            show_time=datetime.datetime(2024, 11, 8, 20, 30),
+        )
+
+        response = self.schedule()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data["show_times"]), 1)
+        self.assertIn(str(existing.id), response.data["show_times"][0])
+        self.assertEqual(Performance.objects.count(), 1)
+
+    def test_schedule_ignores_other_halls(self):
+        sample_performance(
+            play=self.play,
+            theatre_hall=sample_theatre_hall(name="Other hall"),
+            show_time=datetime.datetime(2024, 11, 8, 19, 0),
+        )
+
+        response = self.schedule()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_schedule_rejects_overlapping_times(self):
+        response = self.schedule(times=["14:00", "15:00"])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_schedule_validates_range(self):
+        response = self.schedule(date_from="2024-11-30", date_to="2024-11-01")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.schedule(date_to="2024-11-03", weekdays=[0])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@pytest.mark.django_db
+class TestPerformanceCalendar(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="calendar@example.com",
+            password="password123",
+        )
+        cls.theatre_hall = sample_theatre_hall(rows=2, seats_in_row=5)
+        cls.play = sample_play()
+        cls.first = sample_performance(
+            play=cls.play,
+            theatre_hall=cls.theatre_hall,
+            show_time=datetime.datetime(2024, 11, 10, 12, 0),
+        )
+        cls.second = sample_performance(
+            play=cls.play,
+            theatre_hall=cls.theatre_hall,
+            show_time=datetime.datetime(2024, 11, 10, 19, 0),
+        )
+        cls.third = sample_performance(
+            play=sample_play(),
+            theatre_hall=cls.theatre_hall,
+            show_time=datetime.datetime(2024, 11, 12, 19, 0),
+        )
+        reservation = Reservation.objects.create(user=cls.user)
+        for seat in range(1, 4):
+            Ticket.objects.create(
+                row=1,
+                seat=seat,
+                performance=cls.second,
+                reservation=reservation,
+            )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def test_calendar_groups_performances_by_day(self):
+        response = self.client.get(
+            CALENDAR_URL, {"from": "2024-11-10", "to": "2024-11-12"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [day["date"] for day in response.data],
+            ["2024-11-10", "2024-11-11", "2024-11-12"],
+        )
+
+        first_day = response.data[0]
+        self.assertEqual(first_day["performances_count"], 2)
+        self.assertEqual(first_day["available_seats_count"], 10 + 7)
+        self.assertEqual(
+            [p["id"] for p in first_day["performances"]],
+            [self.first.id, self.second.id],
+        )
+        self.assertEqual(first_day["performances"][1]["available_seats_count"], 7)
+        self.assertEqual(
+            first_day["performances"][0]["play_title"], self.play.title
+        )
+        self.assertEqual(response.data[1]["performances"], [])
+
+    def test_calendar_filters_by_play(self):
+        response = self.client.get(
+            CALENDAR_URL,
+            {"from": "2024-11-10", "to": "2024-11-12", "play": self.play.id},
+        )
+        self.assertEqual(response.data[2]["performances_count"], 0)
+        self.assertEqual(response.data[0]["performances_count"], 2)
+
+    def test_calendar_uses_constant_number_of_queries(self):
+        with self.assertNumQueries(1):
+            self.client.get(
+                CALENDAR_URL, {"from": "2024-11-01", "to": "2024-11-30"}
+            )
+
+    def test_calendar_validates_range(self):
+        response = self.client.get(
+            CALENDAR_URL, {"from": "2024-11-12", "to": "2024-11-10"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.get(CALENDAR_URL, {"from": "2024-11-12"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,105 @@
+import datetime
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.models import PerformanceCard, Reservation, Ticket
+from theatre.tests.test_utils import (
+    sample_genre,
+    sample_performance,
+    sample_play,
+    sample_theatre_hall,
+)
+
+PERFORMANCE_CARD_URL = reverse("theatre:performancecard-list")
+
+
+@pytest.mark.django_db
+class PerformanceCardTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="cards@example.com",
+            password="password123",
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.theatre_hall = sample_theatre_hall(rows=2, seats_in_row=5)
+        self.play = sample_play(title="Hamlet")
+        self.performance = sample_performance(
+            play=self.play, theatre_hall=self.theatre_hall
+        )
+
+    def card(self):
+        return PerformanceCard.objects.get(performance=self.performance)
+
+    def test_card_created_with_performance(self):
+        card = self.card()
+        self.assertEqual(card.play_title, "Hamlet")
+        self.assertEqual(card.theatre_hall_name, self.theatre_hall.name)
+        self.assertEqual(card.available_seats_count, 10)
+
+    def test_past_performance_has_no_card(self):
+        past = sample_performance(
+            play=self.play,
+            theatre_hall=self.theatre_hall,
+            show_time=datetime.datetime(2020, 1, 1, 19, 0),
+        )
+        self.assertFalse(PerformanceCard.objects.filter(performance=past).exists())
+
+    def test_tickets_change_available_seats(self):
+        reservation = Reservation.objects.create(user=self.user)
+        ticket = Ticket.objects.create(
+            row=1, seat=1, performance=self.performance, reservation=reservation
+        )
+        Ticket.objects.create(
+            row=1, seat=2, performance=self.performance, reservation=reservation
+        )
+        self.assertEqual(self.card().available_seats_count, 8)
+
+        ticket.delete()
+        self.assertEqual(self.card().available_seats_count, 9)
+
+    def test_play_and_genres_changes_are_propagated(self):
+        genre = sample_genre(name="Tragedy")
+        self.play.genres.add(genre)
+        self.play.title = "Hamlet, Prince of Denmark"
+        self.play.save()
+
+        card = self.card()
+        self.assertEqual(card.play_title, "Hamlet, Prince of Denmark")
+        self.assertEqual(card.genres, ["Tragedy"])
+
+    def test_theatre_hall_changes_are_propagated(self):
+        self.theatre_hall.rows = 3
+        self.theatre_hall.name = "Renamed hall"
+        self.theatre_hall.save()
+
+        card = self.card()
+        self.assertEqual(card.available_seats_count, 15)
+        self.assertEqual(card.theatre_hall_name, "Renamed hall")
+
+    def test_list_reads_single_table(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(PERFORMANCE_CARD_URL)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data[0]["id"], self.performance.id)
+        self.assertEqual(response.data[0]["play_title"], "Hamlet")
+        self.assertIsNone(response.data[0]["play_image"])
+
+    def test_list_filters_by_play(self):
+        sample_performance(theatre_hall=self.theatre_hall)
+
+        response = self.client.get(
+            PERFORMANCE_CARD_URL, {"play": self.play.id}
+        )
+        self.assertEqual(
+            [card["id"] for card in response.data], [self.performance.id]
+        )
@@ -0,0 +1,179 @@
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre import pricing
+from theatre.models import PerformancePrice, PriceTier, Ticket
+from theatre.tests.test_utils import (
+    sample_performance,
+    sample_play,
+    sample_reservation,
+    sample_theatre_hall,
+)
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+def seats_url(performance_id):
+    return reverse("theatre:performance-seats", args=[performance_id])
+
+
+def cheapest_url(performance_id):
+    return reverse("theatre:performance-cheapest-seats", args=[performance_id])
+
+
+@pytest.mark.django_db
+class PricingTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            email="pricing@test.com", password="password123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.hall = sample_theatre_hall(
+            rows=2, seats_in_row=4, seat_zones="BAAB\nCCCC"
+        )
+        self.tiers = {
+            code: PriceTier.objects.create(
+                theatre_hall=self.hall, code=code, name=name, price=price
+            )
+            for code, name, price in (
+                ("A", "Center", Decimal("50.00")),
+                ("B", "Side", Decimal("30.00")),
+                ("C", "Balcony", Decimal("20.00")),
+            )
+        }
+        self.performance = sample_performance(
+            play=sample_play(), theatre_hall=self.hall
+        )
+
+    def sell(self, *seats):
+        return sample_reservation(
+            self.user,
+            performance=self.performance,
+            tickets=[{"row": row, "seat": seat} for row, seat in seats],
+        )
+
+    def test_seat_map_has_tiers_and_availability(self):
+        self.sell((2, 1), (1, 2))
+
+        response = self.client.get(seats_url(self.performance.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rows"], ["BAAB", "CCCC"])
+        self.assertEqual(
+            sorted(map(tuple, response.data["taken"])), [(1, 2), (2, 1)]
+        )
+        self.assertEqual(
+            [
+                (tier["code"], tier["price"], tier["capacity"], tier["available"])
+                for tier in response.data["tiers"]
+            ],
+            [
+                ("C", "20.00", 4, 3),
+                ("B", "30.00", 2, 2),
+                ("A", "50.00", 2, 1),
+            ],
+        )
+
+    def test_grid_is_cached(self):
+        self.client.get(seats_url(self.performance.id))
+
+        with self.assertNumQueries(2):
+            self.client.get(seats_url(self.performance.id))
+
+    @override_settings(PRICE_GRID_CACHE_TTL=30)
+    def test_grid_expires(self):
+        with mock.patch.object(
+            pricing.cache, "set", wraps=pricing.cache.set
+        ) as cache_set:
+            pricing.get_grid(self.performance)
+
+        self.assertEqual(
+            [call.args[2] for call in cache_set.call_args_list], [30, 30]
+        )
+
+    def test_performance_prices_override_the_hall(self):
+        self.client.get(seats_url(self.performance.id))
+        PerformancePrice.objects.create(
+            performance=self.performance,
+            price_tier=self.tiers["C"],
+            price=Decimal("35.00"),
+        )
+
+        response = self.client.get(seats_url(self.performance.id))
+
+        self.assertEqual(
+            [(tier["code"], tier["price"]) for tier in response.data["tiers"]],
+            [("B", "30.00"), ("C", "35.00"), ("A", "50.00")],
+        )
+
+    def test_changing_a_tier_refreshes_the_grid(self):
+        self.client.get(seats_url(self.performance.id))
+        tier = self.tiers["A"]
+        tier.price = Decimal("10.00")
+        tier.save()
+
+        response = self.client.get(seats_url(self.performance.id))
+
+        self.assertEqual(response.data["tiers"][0]["code"], "A")
+
+    def test_reservation_records_prices(self):
+        response = self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"performance": self.performance.id, "row": 1, "seat": 2},
+                    {"performance": self.performance.id, "row": 2, "seat": 4},
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            sorted(Ticket.objects.values_list("price", flat=True)),
+            [Decimal("20.00"), Decimal("50.00")],
+        )
+        detail = self.client.get(RESERVATION_URL)
+        self.assertEqual(detail.data[0]["total_price"], "70.00")
+
+    def test_cheapest_available(self):
+        self.sell((2, 1), (2, 2), (2, 3))
+
+        one = self.client.get(cheapest_url(self.performance.id))
+        two = self.client.get(cheapest_url(self.performance.id), {"count": 2})
+        three = self.client.get(
+            cheapest_url(self.performance.id), {"count": 3}
+        )
+
+        self.assertEqual(one.data["tier"], "C")
+        self.assertEqual(one.data["seats"], [[2, 4]])
+        self.assertEqual(two.data["tier"], "B")
+        self.assertEqual(two.data["seats"], [[1, 1], [1, 4]])
+        self.assertEqual(two.data["total_price"], "60.00")
+        self.assertEqual(three.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_halls_without_zones_use_one_tier(self):
+        performance = sample_performance(
+            play=sample_play(),
+            theatre_hall=sample_theatre_hall(name="Plain", rows=1, seats_in_row=2),
+        )
+
+        response = self.client.get(seats_url(performance.id))
+
+        self.assertEqual(response.data["rows"], ["AA"])
+        self.assertIsNone(response.data["tiers"][0]["price"])
+
+    def test_zones_must_cover_the_hall(self):
+        self.hall.seat_zones = "BAAB\nCCC"
+
+        with self.assertRaises(ValidationError):
+            self.hall.full_clean()
@@ -0,0 +1,222 @@
+from datetime import date, datetime
+from io import StringIO
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.archive import archive_tickets
+from theatre.models import Reservation, SalesRollup, Ticket
+from theatre.tests.test_utils import (
+    sample_performance,
+    sample_play,
+    sample_theatre_hall,
+)
+
+SALES_ANALYTICS_URL = reverse("theatre:sales-analytics")
+
+
+@pytest.mark.django_db
+class SalesRollupTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(
+            email="rollups@test.com", password="password123"
+        )
+        self.hall = sample_theatre_hall(rows=2, seats_in_row=5)
+        self.play = sample_play()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.performance = sample_performance(
+                play=self.play,
+                theatre_hall=self.hall,
+                show_time=datetime(2024, 11, 10, 19, 0),
+            )
+        self.reservation = Reservation.objects.create(user=self.user)
+
+    def rollup(self):
+        return SalesRollup.objects.get(
+            play_id=self.play.id,
+            theatre_hall_id=self.hall.id,
+            day=date(2024, 11, 10),
+        )
+
+    def sell(self, *seats):
+        with self.captureOnCommitCallbacks(execute=True):
+            return [
+                Ticket.objects.create(
+                    row=1,
+                    seat=seat,
+                    performance=self.performance,
+                    reservation=self.reservation,
+                )
+                for seat in seats
+            ]
+
+    def test_ticket_signals_load_the_performance_once(self):
+        self.sell(1, 2, 3)
+        tickets = list(Ticket.objects.all())
+
+        with (
+            mock.patch("theatre.waitlist.promote"),
+            CaptureQueriesContext(connection) as context,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            for ticket in tickets:
+                ticket.delete()
+
+        performance_selects = [
+            query["sql"] for query in context.captured_queries
+            if query["sql"].startswith('SELECT "theatre_performance"')
+        ]
+        self.assertEqual(len(performance_selects), 1)
+        self.assertEqual(self.rollup().tickets_sold, 0)
+
+    def test_rolled_back_savepoint_does_not_count(self):
+        def create(seat):
+            Ticket.objects.create(
+                row=1,
+                seat=seat,
+                performance=self.performance,
+                reservation=self.reservation,
+            )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                create(1)
+            with transaction.atomic():
+                create(2)
+            try:
+                with transaction.atomic():
+                    create(3)
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(Ticket.objects.count(), 2)
+        self.assertEqual(self.rollup().tickets_sold, 2)
+
+    def test_performance_creates_rollup(self):
+        rollup = self.rollup()
+        self.assertEqual(rollup.performances_count, 1)
+        self.assertEqual(rollup.capacity, 10)
+        self.assertEqual(rollup.tickets_sold, 0)
+
+    def test_tickets_update_rollup_on_commit(self):
+        tickets = self.sell(1, 2, 3)
+        self.assertEqual(self.rollup().tickets_sold, 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            tickets[0].delete()
+        self.assertEqual(self.rollup().tickets_sold, 2)
+
+    def test_uncommitted_tickets_are_not_counted(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            Ticket.objects.create(
+                row=1,
+                seat=1,
+                performance=self.performance,
+                reservation=self.reservation,
+            )
+
+        self.assertEqual(self.rollup().tickets_sold, 0)
+
+    def test_resized_hall_updates_capacity(self):
+        self.hall.rows = 3
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hall.save()
+
+        self.assertEqual(self.rollup().capacity, 15)
+
+    def test_reconcile_repairs_drift(self):
+        self.sell(1, 2)
+        SalesRollup.objects.update(tickets_sold=42, capacity=0)
+
+        call_command("reconcile_sales_rollups", "--all", stdout=StringIO())
+
+        self.assertEqual(self.rollup().tickets_sold, 2)
+        self.assertEqual(self.rollup().capacity, 10)
+
+    def test_reconcile_counts_archived_tickets(self):
+        self.sell(1, 2)
+        list(archive_tickets(datetime(2025, 1, 1)))
+
+        call_command("reconcile_sales_rollups", "--all", stdout=StringIO())
+
+        self.assertEqual(self.rollup().tickets_sold, 2)
+
+
+@pytest.mark.django_db
+class SalesAnalyticsTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            email="analytics@test.com", password="password123"
+        )
+        for day, sold in ((1, 5), (2, 0), (3, 10)):
+            SalesRollup.objects.create(
+                play_id=1,
+                theatre_hall_id=1,
+                day=date(2024, 11, day),
+                performances_count=1,
+                capacity=20,
+                tickets_sold=sold,
+            )
+        SalesRollup.objects.create(
+            play_id=2,
+            theatre_hall_id=1,
+            day=date(2024, 11, 1),
+            performances_count=1,
+            capacity=0,
+            tickets_sold=0,
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def get(self, **params):
+        return self.client.get(
+            SALES_ANALYTICS_URL,
+            {"from": "2024-11-01", "to": "2024-11-30", **params},
+        )
+
+    def test_running_totals_and_trend(self):
+        with self.assertNumQueries(1):
+            response = self.get(play="1")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["running_tickets_sold"] for row in response.data], [5, 5, 15]
+        )
+        self.assertEqual(
+            [row["occupancy"] for row in response.data], [25.0, 0.0, 50.0]
+        )
+        self.assertEqual(
+            [row["occupancy_trend"] for row in response.data],
+            [25.0, 12.5, 25.0],
+        )
+
+    def test_running_totals_are_partitioned(self):
+        response = self.get()
+
+        play_2 = [row for row in response.data if row["play"] == 2]
+        self.assertEqual(play_2[0]["running_tickets_sold"], 0)
+        self.assertIsNone(play_2[0]["occupancy"])
+
+    def test_analytics_validates_range(self):
+        response = self.get(to="2024-10-01")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_analytics_is_admin_only(self):
+        user = get_user_model().objects.create_user(
+            email="analytics-user@test.com", password="password123"
+        )
+        self.client.force_authenticate(user)
+
+        self.assertEqual(self.get().status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,102 @@
+import gzip
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre import schema
+from theatre.management.commands.profile_startup import parse_importtime
+
+SCHEMA_URL = reverse("schema")
+
+
+class CachedSchemaTest(SimpleTestCase):
+    def setUp(self):
+        self.schema_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.schema_dir)
+        settings_override = override_settings(OPENAPI_SCHEMA_DIR=self.schema_dir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        schema._schema_files.clear()
+        self.addCleanup(schema._schema_files.clear)
+        self.client = APIClient()
+
+    def test_build_schema_writes_every_format(self):
+        call_command("build_schema", stdout=StringIO())
+
+        self.assertTrue((self.schema_dir / "schema.yaml").exists())
+        document = json.loads((self.schema_dir / "schema.json").read_bytes())
+        self.assertIn("/api/theatre/plays/", document["paths"])
+
+    def test_schema_is_generated_on_first_hit(self):
+        response = self.client.get(SCHEMA_URL, {"format": "json"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.content, (self.schema_dir / "schema.json").read_bytes()
+        )
+        self.assertIn("ETag", response)
+
+    def test_schema_is_served_from_disk(self):
+        (self.schema_dir / "schema.yaml").write_bytes(b"openapi: 3.0.3\n")
+
+        response = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(response.content, b"openapi: 3.0.3\n")
+        self.assertFalse((self.schema_dir / "schema.json").exists())
+
+    def test_not_modified_when_etag_matches(self):
+        etag = self.client.get(SCHEMA_URL)["ETag"]
+
+        response = self.client.get(SCHEMA_URL, headers={"If-None-Match": etag})
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b"")
+
+    def test_not_modified_when_weak_etag_matches(self):
+        etag = self.client.get(SCHEMA_URL)["ETag"]
+
+        response = self.client.get(
+            SCHEMA_URL, headers={"If-None-Match": f'"other", W/{etag}'}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_gzip_when_accepted(self):
+        plain = self.client.get(SCHEMA_URL)
+        response = self.client.get(
+            SCHEMA_URL, headers={"Accept-Encoding": "gzip, br"}
+        )
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertNotEqual(response["ETag"], plain["ETag"])
+        self.assertIn("Accept-Encoding", response["Vary"])
+
+    def test_gzip_refused_with_zero_weight(self):
+        response = self.client.get(
+            SCHEMA_URL, headers={"Accept-Encoding": "gzip;q=0"}
+        )
+
+        self.assertNotEqual(response.get("Content-Encoding"), "gzip")
+
+
+class ParseImportTimeTest(SimpleTestCase):
+    def test_parse_importtime(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |   _io\n"
+            "import time:      1500 |       2000 | django\n"
+        )
+
+        self.assertEqual(
+            parse_importtime(output),
+            [("_io", 0.12, 0.12), ("django", 1.5, 2.0)],
+        )
@@ -0,0 +1,211 @@
+import asyncio
+import json
+from unittest import mock
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from TheatreAPIService.asgi import application
+from theatre.models import Reservation, Ticket
+from theatre.seat_events import LocalBroker, get_broker
+from theatre.tests.test_utils import sample_performance
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+
+
+def stream_path(performance_id):
+    return f"/api/theatre/performances/{performance_id}/seats/stream/"
+
+
+class LocalBrokerTest(SimpleTestCase):
+    def test_many_subscribers_receive_events(self):
+        async def scenario():
+            broker = LocalBroker(max_pending=10)
+            subscriptions = [broker.subscribe(1) for _ in range(1000)]
+            other = broker.subscribe(2)
+
+            for seat in range(3):
+                broker.publish(1, {"type": "reserved", "seats": [[1, seat]]})
+
+            for subscription in subscriptions:
+                received = [await subscription.get() for _ in range(3)]
+                self.assertEqual(
+                    [event["seats"] for event in received],
+                    [[[1, 0]], [[1, 1]], [[1, 2]]],
+                )
+            self.assertEqual(len(other.events), 0)
+
+        asyncio.run(scenario())
+
+    def test_slow_subscriber_memory_is_bounded(self):
+        async def scenario():
+            broker = LocalBroker(max_pending=5)
+            subscriptions = [broker.subscribe(1) for _ in range(200)]
+
+            for seat in range(100):
+                broker.publish(1, {"type": "reserved", "seats": [[1, seat]]})
+
+            for subscription in subscriptions:
+                self.assertLessEqual(len(subscription.events), 5)
+                event = await subscription.get()
+                self.assertEqual(event["type"], "resync")
+                self.assertEqual(len(subscription.events), 0)
+
+        asyncio.run(scenario())
+
+    def test_unsubscribe_removes_subscription(self):
+        async def scenario():
+            broker = LocalBroker()
+            subscription = broker.subscribe(1)
+            broker.unsubscribe(subscription)
+            broker.publish(1, {"type": "reserved", "seats": []})
+
+            self.assertEqual(broker.subscribers_count(1), 0)
+            self.assertEqual(len(subscription.events), 0)
+
+        asyncio.run(scenario())
+
+
+@pytest.mark.django_db
+class SeatEventsPublishingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_superuser(
+            email="events@test.com",
+            password="password123",
+        )
+        cls.performance = sample_performance()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    @mock.patch("theatre.seat_events.get_broker")
+    def test_reservation_publishes_reserved_seats(self, get_broker_mock):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                RESERVATION_URL,
+                {"tickets": [
+                    {"performance": self.performance.id, "row": 1, "seat": 1},
+                    {"performance": self.performance.id, "row": 1, "seat": 2},
+                ]},
+                format="json",
+            )
+
+        get_broker_mock.return_value.publish.assert_called_once_with(
+            self.performance.id,
+            {
+                "type": "reserved",
+                "performance": self.performance.id,
+                "seats": [[1, 1], [1, 2]],
+            },
+        )
+
+    @mock.patch("theatre.seat_events.get_broker")
+    def test_ticket_deletion_publishes_released_seat(self, get_broker_mock):
+        ticket = Ticket.objects.create(
+            row=2,
+            seat=3,
+            performance=self.performance,
+            reservation=Reservation.objects.create(user=self.user),
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            ticket.delete()
+
+        get_broker_mock.return_value.publish.assert_called_once_with(
+            self.performance.id,
+            {
+                "type": "released",
+                "performance": self.performance.id,
+                "seats": [[2, 3]],
+            },
+        )
+
+
+@pytest.mark.django_db
+class SeatStreamTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="stream@test.com",
+            password="password123",
+        )
+        cls.performance = sample_performance()
+        Ticket.objects.create(
+            row=1,
+            seat=1,
+            performance=cls.performance,
+            reservation=Reservation.objects.create(user=cls.user),
+        )
+
+    def run_stream(self, path, query_string=b"", publish=()):
+        @async_to_sync
+        async def scenario():
+            messages = []
+            disconnected = asyncio.Event()
+
+            async def receive():
+                await disconnected.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                messages.append(message)
+
+            scope = {
+                "type": "http",
+                "method": "GET",
+                "path": path,
+                "query_string": query_string,
+                "headers": [],
+            }
+            task = asyncio.ensure_future(application(scope, receive, send))
+
+            while len(messages) < 2 and not task.done():
+                await asyncio.sleep(0.01)
+            for event in publish:
+                get_broker().publish(self.performance.id, event)
+            while len(messages) < 2 + len(publish) and not task.done():
+                await asyncio.sleep(0.01)
+
+            disconnected.set()
+            await task
+            return messages
+
+        return scenario()
+
+    def test_stream_requires_token(self):
+        messages = self.run_stream(stream_path(self.performance.id))
+        self.assertEqual(messages[0]["status"], 401)
+
+    def test_stream_sends_snapshot_and_events(self):
+        token = str(AccessToken.for_user(self.user))
+        event = {"type": "released", "performance": self.performance.id,
+                 "seats": [[1, 1]]}
+
+        messages = self.run_stream(
+            stream_path(self.performance.id),
+            query_string=f"token={token}".encode(),
+            publish=[event],
+        )
+
+        self.assertEqual(messages[0]["status"], 200)
+        snapshot = messages[1]["body"].decode()
+        self.assertTrue(snapshot.startswith("event: snapshot\n"))
+        self.assertIn('"seats": [[1, 1]]', snapshot)
+        self.assertEqual(
+            messages[2]["body"],
+            f"event: released\ndata: {json.dumps(event)}\n\n".encode(),
+        )
+        self.assertEqual(get_broker().subscribers_count(self.performance.id), 0)
+
+    def test_unknown_performance_returns_404(self):
+        token = str(AccessToken.for_user(self.user))
+        messages = self.run_stream(
+            stream_path(0), query_string=f"token={token}".encode()
+        )
+        self.assertEqual(messages[0]["status"], 404)
@@ -0,0 +1,137 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre import seat_layout
+from theatre.models import PerformanceCard, PriceTier
+from theatre.tests.test_utils import (
+    sample_performance,
+    sample_play,
+    sample_reservation,
+    sample_theatre_hall,
+)
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+RESERVATION_URL = reverse("theatre:reservation-list")
+THEATRE_HALL_URL = reverse("theatre:theatrehall-list")
+
+
+def seats_url(performance_id):
+    return reverse("theatre:performance-seats", args=[performance_id])
+
+
+def cheapest_url(performance_id):
+    return reverse("theatre:performance-cheapest-seats", args=[performance_id])
+
+
+class ParseTest(TestCase):
+    def test_runs_cover_the_row(self):
+        mask = seat_layout.parse("2 -1 2\n5", 2, 5)
+
+        self.assertEqual(mask, 0b11111_11011)
+        self.assertEqual(mask.bit_count(), 9)
+
+    def test_empty_layout_is_the_rectangle(self):
+        self.assertEqual(seat_layout.parse("", 2, 3), 0b111111)
+
+    def test_invalid_layouts(self):
+        for spec in ("2 -1 2", "2 -1 1\n5", "2 x 2\n5", "-5\n-5"):
+            with self.subTest(spec=spec), self.assertRaises(ValueError):
+                seat_layout.parse(spec, 2, 5)
+
+
+@pytest.mark.django_db
+class SeatLayoutTest(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_superuser(
+            email="layout@test.com", password="password123"
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.hall = sample_theatre_hall(
+            rows=2, seats_in_row=5, seat_layout="2 -1 2\n-1 4"
+        )
+        self.performance = sample_performance(
+            play=sample_play(), theatre_hall=self.hall
+        )
+
+    def test_capacity_leaves_out_gaps(self):
+        sample_reservation(
+            self.user,
+            performance=self.performance,
+            tickets=[{"row": 1, "seat": 1}],
+        )
+
+        response = self.client.get(PERFORMANCE_URL)
+
+        self.assertEqual(self.hall.capacity, 8)
+        self.assertEqual(response.data[0]["available_seats_count"], 7)
+        self.assertEqual(
+            PerformanceCard.objects.get().available_seats_count, 7
+        )
+        self.assertEqual(
+            self.performance.get_free_seats(),
+            [(1, 2), (1, 4), (1, 5), (2, 2), (2, 3), (2, 4), (2, 5)],
+        )
+
+    def test_gaps_cannot_be_booked(self):
+        response = self.client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"performance": self.performance.id, "row": 2, "seat": 1}
+                ]
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_seat_map_marks_gaps(self):
+        response = self.client.get(seats_url(self.performance.id))
+
+        self.assertEqual(response.data["rows"], ["AA.AA", ".AAAA"])
+        self.assertEqual(response.data["tiers"][0]["capacity"], 8)
+
+    def test_seats_left_out_by_a_resize_are_skipped(self):
+        sample_reservation(
+            self.user,
+            performance=self.performance,
+            tickets=[{"row": 1, "seat": 1}, {"row": 1, "seat": 5}],
+        )
+        PriceTier.objects.create(
+            theatre_hall=self.hall, code="A", name="Stalls", price=20
+        )
+        self.hall.seats_in_row = 4
+        self.hall.seat_layout = ""
+        self.hall.save()
+        self.performance.refresh_from_db()
+
+        seats = self.client.get(seats_url(self.performance.id))
+        cheapest = self.client.get(
+            cheapest_url(self.performance.id), {"count": 1}
+        )
+
+        self.assertEqual(len(self.performance.get_free_seats()), 7)
+        self.assertEqual(seats.status_code, status.HTTP_200_OK)
+        self.assertEqual(seats.data["tiers"][0]["available"], 7)
+        self.assertEqual(cheapest.data["seats"], [[1, 2]])
+
+    def test_hall_api_validates_the_layout(self):
+        response = self.client.post(
+            THEATRE_HALL_URL,
+            {"name": "Box", "rows": 1, "seats_in_row": 4, "seat_layout": "3"},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("seat_layout", response.data)
+
+    def test_clean_checks_the_layout(self):
+        self.hall.seat_layout = "5\n5\n5"
+
+        with self.assertRaises(ValidationError):
+            self.hall.full_clean()
@@ -0,0 +1,99 @@
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import TestCase
+
+from theatre.throttling import (
+    ScopedSlidingWindowThrottle,
+    SlidingWindowRateThrottle,
+)
+from theatre.views import PlayViewSet, ReservationViewSet
+
+RATES = {
+    "anon": "2/min",
+    "user": "5/min",
+    "catalog": "4/min",
+    "reservations": "4/min",
+    "reservation_writes": "2/min",
+}
+
+
+def sample_request(method="GET", ip="10.0.0.1"):
+    return SimpleNamespace(
+        method=method,
+        user=AnonymousUser(),
+        META={"REMOTE_ADDR": ip},
+    )
+
+
+@mock.patch.object(SlidingWindowRateThrottle, "THROTTLE_RATES", RATES)
+class SlidingWindowThrottleTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        SlidingWindowRateThrottle._finished_windows.clear()
+        self.now = 600.0
+
+    def allow(self, request, view):
+        throttle = ScopedSlidingWindowThrottle()
+        throttle.timer = lambda: self.now
+        allowed = throttle.allow_request(request, view)
+        return allowed, throttle
+
+    def test_limit_within_window(self):
+        request = sample_request()
+        results = [self.allow(request, PlayViewSet())[0] for _ in range(5)]
+        self.assertEqual(results, [True, True, True, True, False])
+
+    def test_rejected_requests_are_not_counted(self):
+        request = sample_request()
+        for _ in range(10):
+            self.allow(request, PlayViewSet())
+
+        self.now += 60
+        allowed, throttle = self.allow(request, PlayViewSet())
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.previous, 4)
+
+    def test_previous_window_is_weighted(self):
+        request = sample_request()
+        for _ in range(4):
+            self.allow(request, PlayViewSet())
+
+        self.now += 90
+        results = [self.allow(request, PlayViewSet())[0] for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+
+    def test_wait_is_reported(self):
+        request = sample_request()
+        for _ in range(4):
+            self.allow(request, PlayViewSet())
+
+        self.now += 10
+        allowed, throttle = self.allow(request, PlayViewSet())
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 50)
+
+    def test_writes_use_separate_scope(self):
+        request = sample_request(method="POST")
+        results = [
+            self.allow(request, ReservationViewSet())[0] for _ in range(3)
+        ]
+        self.assertEqual(results, [True, True, False])
+
+        allowed, throttle = self.allow(sample_request(), ReservationViewSet())
+        self.assertTrue(allowed)
+        self.assertEqual(throttle.scope, "reservations")
+
+    def test_clients_are_throttled_separately(self):
+        for _ in range(4):
+            self.allow(sample_request(ip="10.0.0.1"), PlayViewSet())
+
+        allowed, _ = self.allow(sample_request(ip="10.0.0.2"), PlayViewSet())
+        self.assertTrue(allowed)
+
+    def test_view_without_scope_uses_anon_rate(self):
+        request = sample_request()
+        results = [self.allow(request, object())[0] for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
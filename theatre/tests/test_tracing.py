@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from theatre import tracing
+from theatre.tests.test_utils import sample_performance
+
+PERFORMANCE_URL = reverse("theatre:performance-list")
+IN_MEMORY_EXPORTER = "theatre.tracing.InMemoryExporter"
+
+
+@pytest.mark.django_db
+@override_settings(TRACING_EXPORTER=IN_MEMORY_EXPORTER)
+class TracingTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email="tracing@test.com",
+            password="password123",
+        )
+        sample_performance()
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.exporter = tracing.get_exporter()
+        self.exporter.traces.clear()
+
+    @override_settings(TRACING_SAMPLE_RATE=1)
+    def test_request_phases_are_recorded(self):
+        self.client.get(PERFORMANCE_URL)
+
+        trace = self.exporter.traces[-1]
+        spans = {span["name"]: span for span in trace["spans"]}
+        self.assertEqual(trace["attributes"]["route"], "theatre:performance-list")
+        self.assertEqual(
+            set(spans),
+            {
+                "request",
+                "authentication",
+                "permissions",
+                "get_queryset",
+                "serialize",
+                "sql",
+                "render",
+            },
+        )
+        self.assertEqual(
+            spans["permissions"]["attributes"]["permissions"],
+            ["IsAdminOrIfAuthenticatedReadOnly"],
+        )
+        root_id = spans["request"]["span_id"]
+        self.assertEqual(spans["render"]["parent_id"], root_id)
+        self.assertEqual(
+            spans["sql"]["parent_id"], spans["serialize"]["span_id"]
+        )
+        json.dumps(trace)
+
+    @override_settings(
+        TRACING_SAMPLE_RATE=1, FAST_LIST_SERIALIZATION=False
+    )
+    def test_drf_serializer_is_traced(self):
+        self.client.get(PERFORMANCE_URL)
+
+        spans = self.exporter.traces[-1]["spans"]
+        serialize = [span for span in spans if span["name"] == "serialize"]
+        self.assertEqual(
+            serialize[0]["attributes"]["serializer"], "ListSerializer"
+        )
+
+    @override_settings(TRACING_SAMPLE_RATE=0)
+    def test_nothing_recorded_when_disabled(self):
+        self.client.get(PERFORMANCE_URL)
+
+        self.assertEqual(len(self.exporter.traces), 0)
+        self.assertFalse(tracing.is_active())
+
+    def test_span_outside_trace_is_noop(self):
+        with tracing.span("anything") as span:
+            self.assertIsNone(span)
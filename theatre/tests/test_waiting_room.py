@@ -0,0 +1,144 @@
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre.tests.test_utils import (
+    sample_performance,
+    sample_play,
+    sample_theatre_hall,
+)
+from theatre.waiting_room import ADMISSION_HEADER
+
+RESERVATION_URL = reverse("theatre:reservation-list")
+NOW = 1_900_000_000
+
+
+def waiting_room_url(performance_id):
+    return reverse(
+        "theatre:performance-waiting-room", args=[performance_id]
+    )
+
+
+def at(seconds):
+    return mock.patch(
+        "theatre.waiting_room.time.time", return_value=NOW + seconds
+    )
+
+
+@pytest.mark.django_db
+class WaitingRoomTest(TestCase):
+    def setUp(self):
+        self.performance = sample_performance(
+            play=sample_play(),
+            theatre_hall=sample_theatre_hall(),
+            admissions_per_minute=60,
+        )
+        self.url = waiting_room_url(self.performance.id)
+        self.clients = []
+        for index in range(3):
+            client = APIClient()
+            client.force_authenticate(
+                get_user_model().objects.create_superuser(
+                    email=f"fan{index}@test.com", password="password123"
+                )
+            )
+            self.clients.append(client)
+
+    def reserve(self, client, seat, token=None):
+        headers = {ADMISSION_HEADER: token} if token else {}
+        return client.post(
+            RESERVATION_URL,
+            {
+                "tickets": [
+                    {"performance": self.performance.id, "row": 1, "seat": seat}
+                ]
+            },
+            format="json",
+            headers=headers,
+        )
+
+    def test_users_are_admitted_at_the_configured_rate(self):
+        with at(0):
+            first = self.clients[0].post(self.url)
+            second = self.clients[1].post(self.url)
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data["position"], 1)
+        self.assertIsNotNone(first.data["admission_token"])
+        self.assertEqual(second.data["ahead"], 1)
+        self.assertEqual(second.data["estimated_wait"], 1)
+        self.assertIsNone(second.data["admission_token"])
+
+        with at(1):
+            polled = self.clients[1].get(
+                self.url, {"token": second.data["token"]}
+            )
+
+        self.assertEqual(polled.data["position"], 2)
+        self.assertIsNotNone(polled.data["admission_token"])
+
+    def test_idle_room_does_not_save_up_admissions(self):
+        with at(0):
+            self.clients[0].post(self.url)
+        with at(300):
+            responses = [client.post(self.url) for client in self.clients[1:]]
+
+        self.assertIsNotNone(responses[0].data["admission_token"])
+        self.assertIsNone(responses[1].data["admission_token"])
+
+    def test_joining_again_keeps_the_place(self):
+        with at(0):
+            self.clients[0].post(self.url)
+            first = self.clients[1].post(self.url)
+            again = self.clients[1].post(self.url)
+
+        self.assertEqual(first.data["position"], again.data["position"])
+
+    def test_reservation_requires_admission(self):
+        with at(0):
+            token = self.clients[0].post(self.url).data["admission_token"]
+
+        rejected = self.reserve(self.clients[0], 1)
+        stolen = self.reserve(self.clients[1], 1, token)
+        admitted = self.reserve(self.clients[0], 1, token)
+
+        self.assertEqual(rejected.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(stolen.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(admitted.status_code, status.HTTP_201_CREATED)
+
+    def test_rejected_reservations_do_not_query_the_database(self):
+        self.reserve(self.clients[0], 1)
+
+        with self.assertNumQueries(0):
+            response = self.reserve(self.clients[0], 1)
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_invalid_queue_token(self):
+        with at(0):
+            token = self.clients[0].post(self.url).data["token"]
+
+        response = self.clients[1].get(self.url, {"token": token})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_open_sales_have_no_waiting_room(self):
+        performance = sample_performance(
+            play=sample_play(),
+            theatre_hall=sample_theatre_hall(name="Open hall"),
+        )
+
+        response = self.clients[0].post(waiting_room_url(performance.id))
+        reservation = self.clients[0].post(
+            RESERVATION_URL,
+            {"tickets": [{"performance": performance.id, "row": 1, "seat": 1}]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(reservation.status_code, status.HTTP_201_CREATED)
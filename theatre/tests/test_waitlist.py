@@ -0,0 +1,213 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from theatre import waitlist
+from theatre.models import Performance, Ticket, WaitlistEntry
+from theatre.tests.test_utils import (
+    sample_performance,
+    sample_reservation,
+    sample_theatre_hall,
+)
+from theatre.ticket_release import release_tickets
+
+WAITLIST_URL = reverse("theatre:waitlistentry-list")
+
+
+def claim_url(entry_id):
+    return reverse("theatre:waitlistentry-claim", args=[entry_id])
+
+
+def detail_url(entry_id):
+    return reverse("theatre:waitlistentry-detail", args=[entry_id])
+
+
+@pytest.mark.django_db
+class WaitlistTest(TestCase):
+    def setUp(self):
+        self.buyer = get_user_model().objects.create_user(
+            email="buyer@test.com", password="password123"
+        )
+        self.first = get_user_model().objects.create_user(
+            email="first@test.com", password="password123"
+        )
+        self.second = get_user_model().objects.create_user(
+            email="second@test.com", password="password123"
+        )
+        self.performance = sample_performance(
+            theatre_hall=sample_theatre_hall(rows=1, seats_in_row=2)
+        )
+        self.sold = sample_reservation(
+            self.buyer,
+            performance=self.performance,
+            tickets=[{"row": 1, "seat": 1}, {"row": 1, "seat": 2}],
+        )
+
+    def join(self, user, seats_count):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client.post(
+            WAITLIST_URL,
+            {"performance": self.performance.id, "seats_count": seats_count},
+        )
+
+    def release(self, tickets):
+        with self.captureOnCommitCallbacks(execute=True):
+            release_tickets(tickets)
+
+    def test_users_join_in_order(self):
+        first = self.join(self.first, 2)
+        second = self.join(self.second, 1)
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(first.data["status"], "waiting")
+        self.assertEqual(first.data["position"], 1)
+        self.assertEqual(second.data["position"], 2)
+
+    def test_join_is_rejected_while_seats_are_free(self):
+        Ticket.objects.filter(seat=2)._raw_delete(Ticket.objects.db)
+
+        self.assertEqual(
+            self.join(self.first, 1).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.join(self.first, 2).status_code, status.HTTP_201_CREATED
+        )
+
+    def test_join_twice_is_rejected(self):
+        self.join(self.first, 1)
+
+        response = self.join(self.first, 2)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_release_offers_seats_first_come_first_served(self):
+        self.join(self.first, 1)
+        self.join(self.second, 1)
+
+        self.release(Ticket.objects.filter(seat=2))
+
+        first = WaitlistEntry.objects.get(user=self.first)
+        second = WaitlistEntry.objects.get(user=self.second)
+        self.assertEqual(first.status, WaitlistEntry.Status.OFFERED)
+        self.assertGreater(first.expires_at, timezone.now())
+        self.assertEqual(
+            list(first.reservation.tickets.values_list("row", "seat")),
+            [(1, 2)],
+        )
+        self.assertEqual(second.status, WaitlistEntry.Status.WAITING)
+
+    def test_larger_entries_keep_their_place(self):
+        self.join(self.first, 2)
+        self.join(self.second, 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Ticket.objects.get(seat=1).delete()
+
+        self.assertEqual(
+            WaitlistEntry.objects.get(user=self.first).status,
+            WaitlistEntry.Status.WAITING,
+        )
+        self.assertEqual(
+            WaitlistEntry.objects.get(user=self.second).status,
+            WaitlistEntry.Status.OFFERED,
+        )
+
+    def test_claim_keeps_the_reservation(self):
+        self.join(self.first, 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.sold.delete()
+        entry = WaitlistEntry.objects.get(user=self.first)
+        client = APIClient()
+        client.force_authenticate(self.first)
+
+        response = client.post(claim_url(entry.id))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["tickets"]), 2)
+        entry.refresh_from_db()
+        self.assertEqual(entry.status, WaitlistEntry.Status.CLAIMED)
+        self.assertEqual(entry.reservation.user, self.first)
+
+    def test_expired_offers_pass_to_the_next_entry(self):
+        self.join(self.first, 1)
+        self.join(self.second, 1)
+        self.release(Ticket.objects.filter(seat=2))
+        WaitlistEntry.objects.filter(user=self.first).update(
+            expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        client = APIClient()
+        client.force_authenticate(self.first)
+        entry_id = WaitlistEntry.objects.get(user=self.first).id
+
+        claim = client.post(claim_url(entry_id))
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("expire_waitlist_offers", stdout=mock.Mock())
+
+        self.assertEqual(claim.status_code, status.HTTP_400_BAD_REQUEST)
+        first = WaitlistEntry.objects.get(user=self.first)
+        second = WaitlistEntry.objects.get(user=self.second)
+        self.assertEqual(first.status, WaitlistEntry.Status.EXPIRED)
+        self.assertIsNone(first.reservation)
+        self.assertEqual(second.status, WaitlistEntry.Status.OFFERED)
+
+    def test_leaving_gives_offered_seats_to_the_next_entry(self):
+        self.join(self.first, 1)
+        self.join(self.second, 1)
+        self.release(Ticket.objects.filter(seat=2))
+        client = APIClient()
+        client.force_authenticate(self.first)
+        entry_id = WaitlistEntry.objects.get(user=self.first).id
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.delete(detail_url(entry_id))
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(WaitlistEntry.objects.filter(user=self.first).exists())
+        self.assertEqual(
+            WaitlistEntry.objects.get(user=self.second).status,
+            WaitlistEntry.Status.OFFERED,
+        )
+
+    def test_users_see_only_their_entries(self):
+        self.join(self.first, 1)
+        client = APIClient()
+        client.force_authenticate(self.second)
+
+        response = client.get(WAITLIST_URL)
+
+        self.assertEqual(response.data, [])
+
+    def test_promotion_retries_seats_taken_meanwhile(self):
+        self.join(self.first, 1)
+        Ticket.objects.filter(seat=2)._raw_delete(Ticket.objects.db)
+        real_free_seats = Performance.get_free_seats
+
+        with mock.patch.object(
+            Performance,
+            "get_free_seats",
+            autospec=True,
+            side_effect=[[(1, 1)], real_free_seats(self.performance)],
+        ):
+            promoted = waitlist.promote(self.performance.id)
+
+        self.assertEqual(len(promoted), 1)
+        self.assertEqual(
+            list(promoted[0].reservation.tickets.values_list("seat", flat=True)),
+            [2],
+        )
+
+    def test_deleting_a_reservation_promotes_once(self):
+        with mock.patch("theatre.waitlist.promote") as promote_mock:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.sold.delete()
+
+        promote_mock.assert_called_once_with(self.performance.id)
@@ -0,0 +1,122 @@
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import SimpleRateThrottle
+
+from theatre import metrics
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """Sliding-window-counter throttle with fixed memory per client.
+
+    Instead of a list of request timestamps, each client keeps one integer
+    counter per window. The count for the current window is incremented
+    atomically with ``cache.incr`` and the finished previous window is
+    weighted by how much of it still overlaps the sliding window. Finished
+    windows never change, so their counts are memoized in-process and the
+    cache is touched once per allowed request.
+    """
+    max_memoized_windows = 10000
+    _finished_windows = {}
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": ident,
+        }
+
+    def window_key(self, window):
+        return f"{self.key}_{window}"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window = int(self.now // self.duration)
+        self.elapsed = self.now - window * self.duration
+
+        self.previous = self.get_finished_count(self.window_key(window - 1))
+        current_key = self.window_key(window)
+        self.current = self.increment(current_key)
+
+        if self.estimate(self.current) > self.num_requests:
+            self.cache.decr(current_key)
+            self.current -= 1
+            return self.throttle_failure()
+        return True
+
+    def estimate(self, current):
+        """Approximates the number of requests in the last ``duration``."""
+        weight = 1 - self.elapsed / self.duration
+        return self.previous * weight + current
+
+    def increment(self, key):
+        """Atomically increments the counter, creating it if needed."""
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            if self.cache.add(key, 1, self.duration * 2):
+                return 1
+            return self.cache.incr(key)
+
+    def get_finished_count(self, key):
+        """Returns the count of a window that is already over."""
+        finished = SlidingWindowRateThrottle._finished_windows
+        hit = key in finished
+        metrics.record_cache("throttle_windows", hit)
+        if not hit:
+            if len(finished) >= self.max_memoized_windows:
+                finished.clear()
+            finished[key] = self.cache.get(key, 0)
+        return finished[key]
+
+    def wait(self):
+        if self.current >= self.num_requests:
+            return self.duration - self.elapsed
+
+        excess = self.estimate(self.current + 1) - self.num_requests
+        return max(excess * self.duration / self.previous, 0)
+
+
+class ScopedSlidingWindowThrottle(SlidingWindowRateThrottle):
+    """Throttles each view by its own scope.
+
+    Safe requests use ``view.throttle_scope``; unsafe ones use
+    ``view.throttle_write_scope`` when it is set. Both can be overridden per
+    action with ``@action(throttle_scope=...)``. Views without a scope fall
+    back to the ``user`` or ``anon`` rate.
+    """
+    scope_attr = "throttle_scope"
+    write_scope_attr = "throttle_write_scope"
+
+    def __init__(self):
+        # The rate depends on the view, so it is resolved per request.
+        pass
+
+    def get_scope(self, request, view):
+        if request.method not in SAFE_METHODS:
+            scope = getattr(view, self.write_scope_attr, None)
+            if scope:
+                return scope
+
+        scope = getattr(view, self.scope_attr, None)
+        if scope:
+            return scope
+
+        if request.user and request.user.is_authenticated:
+            return "user"
+        return "anon"
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(request, view)
+        self.rate = self.get_rate()
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
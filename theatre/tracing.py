@@ -0,0 +1,208 @@
+import json
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+_current_trace = ContextVar("current_trace", default=None)
+
+
+class Trace:
+    """Spans recorded while handling one request."""
+
+    def __init__(self, name):
+        self.trace_id = uuid.uuid4().hex
+        self.name = name
+        self.started_at = time.time()
+        self.attributes = {}
+        self.spans = []
+        self.open_spans = []
+
+    def as_dict(self):
+        return {
+            "trace_id": self.trace_id,
+            "name": self.name,
+            "started_at": self.started_at,
+            "attributes": self.attributes,
+            "spans": self.spans,
+        }
+
+
+class Span:
+    __slots__ = ("trace", "record", "started")
+
+    def __init__(self, trace, name, attributes):
+        self.trace = trace
+        self.record = {
+            "span_id": uuid.uuid4().hex[:16],
+            "parent_id": trace.open_spans[-1] if trace.open_spans else None,
+            "name": name,
+            "attributes": attributes,
+        }
+
+    def __enter__(self):
+        self.trace.open_spans.append(self.record["span_id"])
+        self.record["offset_ms"] = (time.time() - self.trace.started_at) * 1000
+        self.started = time.perf_counter()
+        return self.record
+
+    def __exit__(self, exc_type, exc, tb):
+        self.record["duration_ms"] = (time.perf_counter() - self.started) * 1000
+        if exc_type is not None:
+            self.record["attributes"]["error"] = exc_type.__name__
+        self.trace.open_spans.pop()
+        self.trace.spans.append(self.record)
+        return False
+
+
+class NoopSpan:
+    """Returned when no trace is active, so disabled tracing costs a lookup."""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+NOOP_SPAN = NoopSpan()
+
+
+def is_active():
+    return _current_trace.get() is not None
+
+
+def span(name, **attributes):
+    """Context manager recording a span in the current trace, if any."""
+    trace = _current_trace.get()
+    if trace is None:
+        return NOOP_SPAN
+    return Span(trace, name, attributes)
+
+
+def should_sample():
+    rate = getattr(settings, "TRACING_SAMPLE_RATE", 0)
+    return rate > 0 and (rate >= 1 or random.random() < rate)
+
+
+class ActiveTrace:
+    """Activates a new trace and exports it when the block exits."""
+
+    def __init__(self, name):
+        self.trace = Trace(name)
+
+    def __enter__(self):
+        self.token = _current_trace.set(self.trace)
+        self.root = Span(self.trace, "request", {})
+        self.root.__enter__()
+        return self.trace
+
+    def __exit__(self, exc_type, exc, tb):
+        self.root.__exit__(exc_type, exc, tb)
+        _current_trace.reset(self.token)
+        get_exporter().export(self.trace.as_dict())
+        return False
+
+
+def start_trace(name):
+    return ActiveTrace(name)
+
+
+def trace_sql(execute, sql, params, many, context):
+    """Database execute wrapper recording a span per statement."""
+    with span("sql", statement=sql, many=many):
+        return execute(sql, params, many, context)
+
+
+class JSONFileExporter:
+    """Appends one JSON line per trace to ``TRACING_EXPORT_PATH``."""
+
+    def __init__(self):
+        self.path = settings.TRACING_EXPORT_PATH
+        self.lock = threading.Lock()
+
+    def export(self, trace):
+        line = json.dumps(trace, default=str) + "\n"
+        with self.lock, open(self.path, "a") as file:
+            file.write(line)
+
+
+class InMemoryExporter:
+    """Keeps the latest traces in memory; a stand-in for a collector."""
+
+    def __init__(self, max_traces=100):
+        self.traces = deque(maxlen=max_traces)
+
+    def export(self, trace):
+        self.traces.append(trace)
+
+
+@lru_cache(maxsize=None)
+def load_exporter(path):
+    return import_string(path)()
+
+
+def get_exporter():
+    return load_exporter(
+        getattr(settings, "TRACING_EXPORTER", "theatre.tracing.JSONFileExporter")
+    )
+
+
+@lru_cache(maxsize=None)
+def traced_serializer_class(serializer_class):
+    """Subclass of ``serializer_class`` whose ``data`` is recorded as a span."""
+
+    class TracedSerializer(serializer_class):
+        @property
+        def data(self):
+            with span("serialize", serializer=serializer_class.__name__):
+                return super().data
+
+    TracedSerializer.__name__ = serializer_class.__name__
+    TracedSerializer.__qualname__ = serializer_class.__qualname__
+    return TracedSerializer
+
+
+class TracedViewMixin:
+    """Records DRF request phases as spans when the request is traced."""
+
+    def perform_authentication(self, request):
+        if not is_active():
+            return super().perform_authentication(request)
+
+        authenticators = [type(a).__name__ for a in request.authenticators]
+        with span("authentication", authenticators=authenticators):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        if not is_active():
+            return super().check_permissions(request)
+
+        permissions = [type(p).__name__ for p in self.get_permissions()]
+        with span("permissions", permissions=permissions):
+            super().check_permissions(request)
+
+    def initial(self, request, *args, **kwargs):
+        if is_active():
+            # Views override get_queryset without calling super(), so the
+            # bound method is wrapped on the instance instead.
+            get_queryset = self.get_queryset
+
+            def traced_get_queryset():
+                with span("get_queryset", view=type(self).__name__):
+                    return get_queryset()
+
+            self.get_queryset = traced_get_queryset
+        super().initial(request, *args, **kwargs)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if is_active():
+            serializer.__class__ = traced_serializer_class(type(serializer))
+        return serializer
@@ -8,7 +8,15 @@ from theatre.views import (
     TheatreHallViewSet,
     PerformanceViewSet,
     ReservationViewSet,
-    TicketModelViewSet
+    TicketModelViewSet,
+    PerformanceCardViewSet,
+    WaitlistViewSet,
+    ArchiveReportView,
+    CatalogImportView,
+    CatalogExportView,
+    CheckInView,
+    CheckInSyncView,
+    SalesAnalyticsView,
 )
 
 router = routers.DefaultRouter()
@@ -20,9 +28,33 @@ router.register("theatre_halls", TheatreHallViewSet)
 router.register("performances", PerformanceViewSet)
 router.register("reservations", ReservationViewSet)
 router.register("tickets", TicketModelViewSet)
+router.register("performance_cards", PerformanceCardViewSet)
+router.register("waitlist", WaitlistViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
+    path(
+        "archive/report/",
+        ArchiveReportView.as_view(),
+        name="archive-report",
+    ),
+    path(
+        "catalog/import/",
+        CatalogImportView.as_view(),
+        name="catalog-import",
+    ),
+    path(
+        "catalog/export/",
+        CatalogExportView.as_view(),
+        name="catalog-export",
+    ),
+    path("check_in/", CheckInView.as_view(), name="check-in"),
+    path("check_in/sync/", CheckInSyncView.as_view(), name="check-in-sync"),
+    path(
+        "analytics/sales/",
+        SalesAnalyticsView.as_view(),
+        name="sales-analytics",
+    ),
 ]
 
 app_name = "theatre"
@@ -1,3 +1,16 @@
+from datetime import datetime
+
+from rest_framework.exceptions import ValidationError
+
+
 def params_to_int(qs):
     """Converts a list of strings to an integer list."""
     return [int(str_id) for str_id in qs.split(',')]
+
+
+def params_to_date(value, param_name):
+    """Converts a YYYY-MM-DD string to a date."""
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValidationError({param_name: "Date must be in YYYY-MM-DD format."})
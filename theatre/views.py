@@ -1,12 +1,55 @@
-from datetime import datetime
+import codecs
+from datetime import timedelta
 
+from django.conf import settings
+from django.db.models import (
+    Avg,
+    Count,
+    F,
+    Case,
+    OuterRef,
+    FloatField,
+    RowRange,
+    Subquery,
+    Sum,
+    When,
+    Value,
+    Window,
+)
+from django.db.models.functions import Cast, NullIf, Round, TruncDate
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import timezone
 from drf_spectacular.utils import OpenApiParameter, extend_schema, OpenApiExample
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
+from rest_framework.views import APIView
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.decorators import action
-from rest_framework.permissions import IsAdminUser
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 
-from theatre import serializers
+from theatre import (
+    cancellations,
+    catalog,
+    checkin,
+    filmography,
+    metrics,
+    pricing,
+    serializers,
+    tracing,
+    waiting_room,
+    waitlist,
+)
+from theatre.authentication import MetricsTokenAuthentication
+from theatre.fieldsets import (
+    EXPAND_PARAM,
+    FIELDS_PARAM,
+    ExpandableFieldsViewMixin,
+    names_at,
+    parse_names,
+)
+from theatre.idempotency import IdempotentCreateMixin, IDEMPOTENCY_HEADER
 from theatre.models import (
     Genre,
     Actor,
@@ -14,6 +57,10 @@ from theatre.models import (
     TheatreHall,
     Reservation,
     Performance, Ticket,
+    PerformanceCard,
+    ArchivedTicket,
+    SalesRollup,
+    WaitlistEntry,
 )
 from theatre.serializers import (
     GenreSerializer,
@@ -30,8 +77,32 @@ from theatre.serializers import (
     PerformanceSerializer,
     PerformanceListSerializer,
     PerformanceDetailSerializer, TicketSerializer,
+    PerformanceScheduleSerializer,
+    CalendarDaySerializer,
+    PerformanceCardSerializer,
+    ArchiveReportSerializer,
+    CatalogImportSerializer,
+    TicketTokenSerializer,
+    CheckInSerializer,
+    CheckInSyncSerializer,
+    CheckInResultSerializer,
+    SalesRollupSerializer,
+    WaitlistEntrySerializer,
+    WaitingRoomSerializer,
+    CancellationRequestSerializer,
+    CancellationSerializer,
+    SeatMapSerializer,
+    CheapestSeatsSerializer,
 )
-from theatre.utils import params_to_int
+from theatre.permissions import IsAdminOrMetricsScraper
+from theatre.row_serializers import get_row_serializer
+from theatre.tracing import TracedViewMixin
+from theatre.utils import params_to_int, params_to_date
+
+CALENDAR_MAX_DAYS = 62
+ARCHIVE_REPORT_MAX_DAYS = 366
+SALES_ANALYTICS_MAX_DAYS = 366
+FILMOGRAPHY_MAX_IDS = 100
 
 
 class ImageUploadMixin:
@@ -53,23 +124,138 @@ class ImageUploadMixin:
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class GenreViewSet(viewsets.ModelViewSet):
+class FastListMixin:
+    """Serves ``list`` from ``.values()`` rows instead of model instances.
+
+    The list serializer is compiled into a ``RowSerializer`` that produces
+    the same output. Enabled by the ``FAST_LIST_SERIALIZATION`` setting.
+    Rows cannot hold nested objects, so ``?expand=`` lists take the
+    regular path.
+    """
+
+    def get_fast_list_queryset(self):
+        return self.get_queryset()
+
+    def list(self, request, *args, **kwargs):
+        if (
+            not getattr(settings, "FAST_LIST_SERIALIZATION", False)
+            or EXPAND_PARAM in request.query_params
+        ):
+            return super().list(request, *args, **kwargs)
+
+        row_serializer = get_row_serializer(self.get_serializer_class())
+        names = names_at(
+            parse_names(request.query_params.get(FIELDS_PARAM, "")), ""
+        )
+        queryset = self.filter_queryset(self.get_fast_list_queryset())
+        rows = queryset.values(*row_serializer.get_lookups(names))
+
+        page = self.paginate_queryset(rows)
+        with tracing.span("serialize", serializer="RowSerializer"):
+            data = row_serializer.serialize(
+                rows if page is None else page, request, names
+            )
+
+        if page is not None:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+
+class FilmographyMixin:
+    """Embeds plays and upcoming performances in detail and batch reads.
+
+    ``filmography_relation`` is the field of ``Play`` linking to the
+    viewset's model. Batch reads serve many ids with the same three
+    queries as a single detail read.
+    """
+    filmography_relation = None
+    filmography_actions = ("retrieve", "batch")
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in self.filmography_actions:
+            queryset = filmography.with_plays(queryset)
+        return queryset
+
+    def get_object(self):
+        instance = super().get_object()
+        if self.action == "retrieve":
+            filmography.attach_upcoming_performances(
+                [instance], self.filmography_relation
+            )
+        return instance
+
+    def batch_response(self, request):
+        try:
+            ids = params_to_int(request.query_params["ids"])
+        except (KeyError, ValueError):
+            raise ValidationError(
+                {"ids": "Must be a comma-separated list of ids."}
+            )
+        if len(ids) > FILMOGRAPHY_MAX_IDS:
+            raise ValidationError(
+                {"ids": f"At most {FILMOGRAPHY_MAX_IDS} ids are allowed."}
+            )
+
+        items = filmography.attach_upcoming_performances(
+            self.get_queryset().filter(id__in=ids).order_by("id"),
+            self.filmography_relation,
+        )
+        serializer = self.get_serializer(items, many=True)
+        return Response(serializer.data)
+
+
+BATCH_IDS_PARAMETER = OpenApiParameter(
+    "ids",
+    type=str,
+    required=True,
+    description=f"Comma-separated ids, at most {FILMOGRAPHY_MAX_IDS}. "
+                "(ex. ?ids=1,2,3)",
+)
+
+
+class GenreViewSet(
+    TracedViewMixin,
+    ExpandableFieldsViewMixin,
+    FilmographyMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    throttle_scope = "catalog"
+    filmography_relation = "genres"
 
     def get_serializer_class(self):
-        if self.action == "retrieve":
+        if self.action in self.filmography_actions:
             return GenreDetailSerializer
 
         return GenreSerializer
 
+    @extend_schema(
+        parameters=[BATCH_IDS_PARAMETER],
+        responses=GenreDetailSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="batch")
+    def batch(self, request):
+        """Plays and upcoming performances of several genres."""
+        return self.batch_response(request)
+
 
-class ActorViewSet(viewsets.ModelViewSet, ImageUploadMixin):
+class ActorViewSet(
+    TracedViewMixin,
+    ExpandableFieldsViewMixin,
+    FilmographyMixin,
+    FastListMixin,
+    viewsets.ModelViewSet,
+    ImageUploadMixin,
+):
     queryset = Actor.objects.all()
     serializer_class = ActorSerializer
+    throttle_scope = "catalog"
+    filmography_relation = "actors"
 
     def get_serializer_class(self):
-        if self.action == "retrieve":
+        if self.action in self.filmography_actions:
             return ActorDetailSerializer
 
         if self.action == "upload_image":
@@ -82,7 +268,7 @@ class ActorViewSet(viewsets.ModelViewSet, ImageUploadMixin):
         first_name = self.request.query_params.get("first_name")
         last_name = self.request.query_params.get("last_name")
 
-        queryset = self.queryset
+        queryset = super().get_queryset()
 
         if first_name:
             queryset = queryset.filter(first_name__icontains=first_name)
@@ -109,10 +295,25 @@ class ActorViewSet(viewsets.ModelViewSet, ImageUploadMixin):
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=[BATCH_IDS_PARAMETER],
+        responses=ActorDetailSerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="batch")
+    def batch(self, request):
+        """Filmographies of several actors, e.g. for an actor grid."""
+        return self.batch_response(request)
+
 
-class PlayViewSet(viewsets.ModelViewSet):
+class PlayViewSet(
+    TracedViewMixin,
+    ExpandableFieldsViewMixin,
+    FastListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Play.objects.all()
     serializer_class = PlaySerializer
+    throttle_scope = "catalog"
 
     def get_queryset(self):
         """Retrieve the plays with filters"""
@@ -120,7 +321,7 @@ class PlayViewSet(viewsets.ModelViewSet):
         actors = self.request.query_params.get("actors")
         genres = self.request.query_params.get("genres")
 
-        queryset = self.queryset
+        queryset = super().get_queryset()
 
         if title:
             queryset = queryset.filter(title__icontains=title)
@@ -170,24 +371,33 @@ class PlayViewSet(viewsets.ModelViewSet):
         return super().list(request, *args, **kwargs)
 
 
-class TheatreHallViewSet(viewsets.ModelViewSet):
+class TheatreHallViewSet(
+    TracedViewMixin,
+    ExpandableFieldsViewMixin,
+    viewsets.ModelViewSet,
+):
     queryset = TheatreHall.objects.all()
     serializer_class = TheatreHallSerializer
+    throttle_scope = "catalog"
 
 
-class ReservationViewSet(viewsets.ModelViewSet):
+class ReservationViewSet(
+    TracedViewMixin,
+    IdempotentCreateMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Reservation.objects.prefetch_related(
         "tickets__performance__play",
         "tickets__performance__theatre_hall"
     )
     serializer_class = ReservationSerializer
+    throttle_scope = "reservations"
+    throttle_write_scope = "reservation_writes"
 
     def get_queryset(self):
-        return Reservation.objects.filter(user=self.request.user)
-
-    def perform_create(self, serializer):
-        print(self.request.data)
-        serializer.save(user=self.request.user)
+        return Reservation.objects.filter(
+            user=self.request.user
+        ).prefetch_related("tickets")
 
     @extend_schema(
         examples=[
@@ -206,13 +416,75 @@ class ReservationViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                IDEMPOTENCY_HEADER,
+                type=str,
+                location=OpenApiParameter.HEADER,
+                required=False,
+                description="Unique key for safely retrying the request. "
+                            "Retries with the same key replay the first "
+                            "response instead of creating a new reservation.",
+            ),
+            OpenApiParameter(
+                waiting_room.ADMISSION_HEADER,
+                type=str,
+                location=OpenApiParameter.HEADER,
+                required=False,
+                description="Admission token from the waiting room. "
+                            "Required for performances that have one.",
+            ),
+        ]
+    )
+    def create(self, request, *args, **kwargs):
+        waiting_room.require_admission(request)
+        return super().create(request, *args, **kwargs)
+
+    def perform_destroy(self, instance):
+        cancellations.cancel(instance)
+
+    @extend_schema(
+        request=CancellationRequestSerializer,
+        responses=CancellationSerializer,
+    )
+    @action(
+        methods=["POST"],
+        detail=True,
+        url_path="cancel",
+        permission_classes=[IsAuthenticated],
+    )
+    def cancel(self, request, pk=None):
+        """Cancels some tickets of the reservation, or all of them."""
+        reservation = self.get_object()
+        serializer = CancellationRequestSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        cancellation = cancellations.cancel(
+            reservation, serializer.validated_data.get("tickets")
+        )
+        return Response(CancellationSerializer(cancellation).data)
+
+    @extend_schema(responses=TicketTokenSerializer(many=True))
+    @action(methods=["GET"], detail=True, url_path="tokens")
+    def tokens(self, request, pk=None):
+        """Signed tokens of the reservation's tickets, for QR codes."""
+        reservation = self.get_object()
+        serializer = TicketTokenSerializer(reservation.tickets.all(), many=True)
+        return Response(serializer.data)
 
-class PerformanceViewSet(viewsets.ModelViewSet):
+
+class PerformanceViewSet(
+    TracedViewMixin,
+    ExpandableFieldsViewMixin,
+    FastListMixin,
+    viewsets.ModelViewSet,
+):
     queryset = Performance.objects.all()
     serializer_class = PerformanceSerializer
+    throttle_scope = "catalog"
 
     def get_queryset(self):
-        queryset = self.queryset
+        queryset = super().get_queryset()
 
         play = self.request.query_params.get("play")
         theatre_hall = self.request.query_params.get("theatre_hall")
@@ -227,9 +499,19 @@ class PerformanceViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(theatre_hall_id__in=theatre_hall_ids)
 
         if date:
-            date = datetime.strptime(date, "%Y-%m-%d").date()
-            queryset = queryset.filter(show_time__date=date)
+            date = params_to_date(date, "date")
+            queryset = queryset.filter(
+                show_time__gte=date,
+                show_time__lt=date + timedelta(days=1),
+            )
 
+        if self.action == "list":
+            queryset = queryset.annotate(
+                available_seats_count=(
+                    F("theatre_hall__capacity")
+                    - Count("tickets")
+                )
+            )
         return queryset
 
     @extend_schema(
@@ -254,6 +536,227 @@ class PerformanceViewSet(viewsets.ModelViewSet):
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "from",
+                type=str,
+                required=True,
+                description="First day of the range (YYYY-MM-DD). "
+                            "(ex. ?from=2024-11-01)",
+            ),
+            OpenApiParameter(
+                "to",
+                type=str,
+                required=True,
+                description="Last day of the range, inclusive (YYYY-MM-DD). "
+                            "(ex. ?to=2024-11-30)",
+            ),
+            OpenApiParameter(
+                "play",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by play. (ex. ?play=1)",
+            ),
+            OpenApiParameter(
+                "theatre_hall",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by theatre hall. (ex. ?theatre_hall=1,2)",
+            ),
+        ],
+        responses=CalendarDaySerializer(many=True),
+    )
+    @action(methods=["GET"], detail=False, url_path="calendar")
+    def calendar(self, request):
+        """Performances grouped by day, with availability, for a date range."""
+        date_from = params_to_date(request.query_params.get("from"), "from")
+        date_to = params_to_date(request.query_params.get("to"), "to")
+        days_count = (date_to - date_from).days + 1
+
+        if days_count < 1:
+            raise ValidationError({"to": "Must not be earlier than from."})
+        if days_count > CALENDAR_MAX_DAYS:
+            raise ValidationError(
+                {"to": f"Range must not exceed {CALENDAR_MAX_DAYS} days."}
+            )
+
+        performances = (
+            self.get_queryset()
+            .filter(
+                show_time__gte=date_from,
+                show_time__lt=date_to + timedelta(days=1),
+            )
+            .annotate(day=TruncDate("show_time"), tickets_sold=Count("tickets"))
+            .annotate(
+                available_seats_count=(
+                    F("theatre_hall__capacity")
+                    - F("tickets_sold")
+                ),
+            )
+            .annotate(
+                sold_out=Case(
+                    When(available_seats_count__lte=0, then=Value(True)),
+                    default=Value(False),
+                ),
+            )
+            .values(
+                "id",
+                "play_id",
+                "play__title",
+                "theatre_hall_id",
+                "theatre_hall__name",
+                "show_time",
+                "day",
+                "available_seats_count",
+                "sold_out",
+            )
+            .order_by("show_time")
+        )
+
+        days = {}
+        for offset in range(days_count):
+            day = date_from + timedelta(days=offset)
+            days[day] = {
+                "date": day,
+                "performances_count": 0,
+                "available_seats_count": 0,
+                "performances": [],
+            }
+
+        for performance in performances:
+            day = days[performance["day"]]
+            day["performances_count"] += 1
+            day["available_seats_count"] += performance["available_seats_count"]
+            day["performances"].append(performance)
+
+        serializer = CalendarDaySerializer(days.values(), many=True)
+        return Response(serializer.data)
+
+    @extend_schema(
+        request=PerformanceScheduleSerializer,
+        responses={201: PerformanceSerializer(many=True)},
+    )
+    @action(methods=["POST"], detail=False, url_path="schedule")
+    def schedule(self, request):
+        """Creates the performances of a weekly recurrence in one request."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        performances = serializer.save()
+        return Response(
+            PerformanceSerializer(performances, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "token",
+                type=str,
+                description="Queue token returned when joining. "
+                            "Required to poll with GET.",
+            ),
+        ],
+        request=None,
+        responses=WaitingRoomSerializer,
+    )
+    @action(
+        methods=["GET", "POST"],
+        detail=True,
+        url_path="waiting_room",
+        permission_classes=[IsAuthenticated],
+    )
+    def waiting_room(self, request, pk=None):
+        """Joins (POST) or polls (GET) the waiting room of an on-sale.
+
+        Served from the cache only. Once admitted, the response carries
+        the admission token needed to reserve seats.
+        """
+        try:
+            performance_id = int(pk)
+        except ValueError:
+            raise NotFound
+        rate = waiting_room.get_admission_rate(performance_id)
+        if rate is None:
+            raise NotFound("This performance has no waiting room.")
+
+        if request.method == "POST":
+            position = waiting_room.join(performance_id, request.user.id)
+        else:
+            position = waiting_room.read_queue_token(
+                request.query_params.get("token", ""),
+                performance_id,
+                request.user.id,
+            )
+            if position is None:
+                raise ValidationError({"token": "Invalid or expired token."})
+
+        return Response(
+            waiting_room.check(
+                performance_id, request.user.id, position, rate
+            )
+        )
+
+    def get_seat_performance(self, pk):
+        performance = (
+            Performance.objects.select_related("theatre_hall")
+            .filter(id=pk).first()
+        )
+        if performance is None:
+            raise NotFound
+        return performance
+
+    @extend_schema(responses=SeatMapSerializer)
+    @action(methods=["GET"], detail=True, url_path="seats")
+    def seats(self, request, pk=None):
+        """Seat map with the price tier of every seat and free seats per tier.
+
+        Tiers come from the cached price grid of the hall, so the map costs
+        the performance and its taken seats only.
+        """
+        performance = self.get_seat_performance(pk)
+        taken = list(performance.get_taken_seats())
+        grid = pricing.get_grid(performance)
+        return Response(SeatMapSerializer({
+            "performance": performance.id,
+            "rows": grid.rows,
+            "taken": taken,
+            "tiers": grid.availability(taken),
+        }).data)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "count",
+                type=int,
+                description="Number of seats wanted. (ex. ?count=2)",
+            ),
+        ],
+        responses=CheapestSeatsSerializer,
+    )
+    @action(methods=["GET"], detail=True, url_path="seats/cheapest")
+    def cheapest_seats(self, request, pk=None):
+        """Cheapest price tier with enough free seats, and seats in it."""
+        try:
+            count = int(request.query_params.get("count", 1))
+        except ValueError:
+            count = 0
+        if count < 1:
+            raise ValidationError({"count": "Must be a positive integer."})
+
+        performance = self.get_seat_performance(pk)
+        grid = pricing.get_grid(performance)
+        cheapest = grid.cheapest_available(
+            performance.get_taken_seats(), count
+        )
+        if cheapest is None:
+            raise NotFound(f"No price tier has {count} free seats.")
+        code, seats = cheapest
+        return Response(CheapestSeatsSerializer({
+            "tier": code,
+            "price": grid.tiers[code][1],
+            "seats": seats,
+            "total_price": grid.total(seats),
+        }).data)
+
     def get_serializer_class(self):
         if self.action == "list":
             return PerformanceListSerializer
@@ -261,9 +764,406 @@ class PerformanceViewSet(viewsets.ModelViewSet):
         if self.action == "retrieve":
             return PerformanceDetailSerializer
 
+        if self.action == "schedule":
+            return PerformanceScheduleSerializer
+
         return PerformanceSerializer
 
 
-class TicketModelViewSet(viewsets.ModelViewSet):
+class TicketModelViewSet(TracedViewMixin, viewsets.ModelViewSet):
     queryset = Ticket.objects.all()
     serializer_class = TicketSerializer
+    throttle_scope = "reservations"
+    throttle_write_scope = "reservation_writes"
+
+
+class WaitlistViewSet(
+    TracedViewMixin,
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    """The user's places in the queues of sold-out performances.
+
+    Released seats are offered in joining order and held in a reservation
+    until ``expires_at``; claim the offer to keep them.
+    """
+    queryset = WaitlistEntry.objects.all()
+    serializer_class = WaitlistEntrySerializer
+    permission_classes = (IsAuthenticated,)
+    throttle_scope = "reservations"
+    throttle_write_scope = "reservation_writes"
+
+    def get_queryset(self):
+        ahead = (
+            WaitlistEntry.objects.filter(
+                performance=OuterRef("performance"),
+                status=WaitlistEntry.Status.WAITING,
+                id__lte=OuterRef("id"),
+            )
+            .order_by()
+            .values("performance")
+            .annotate(count=Count("id"))
+            .values("count")
+        )
+        return (
+            self.queryset.filter(user=self.request.user)
+            .annotate(position=Subquery(ahead))
+            .order_by("-id")
+        )
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+    def perform_destroy(self, instance):
+        waitlist.leave(instance)
+
+    @extend_schema(request=None, responses=ReservationSerializer)
+    @action(methods=["POST"], detail=True, url_path="claim")
+    def claim(self, request, pk=None):
+        """Keeps the seats offered to this entry."""
+        entry = waitlist.claim(self.get_object())
+        return Response(ReservationSerializer(entry.reservation).data)
+
+
+class PerformanceCardViewSet(TracedViewMixin, viewsets.ReadOnlyModelViewSet):
+    """Upcoming performances served from the denormalized card table."""
+    queryset = PerformanceCard.objects.all()
+    serializer_class = PerformanceCardSerializer
+    throttle_scope = "catalog"
+
+    def get_queryset(self):
+        queryset = self.queryset.filter(show_time__gte=timezone.now())
+
+        play = self.request.query_params.get("play")
+        theatre_hall = self.request.query_params.get("theatre_hall")
+        date = self.request.query_params.get("date")
+
+        if play:
+            queryset = queryset.filter(play_id__in=params_to_int(play))
+
+        if theatre_hall:
+            queryset = queryset.filter(
+                theatre_hall_id__in=params_to_int(theatre_hall)
+            )
+
+        if date:
+            date = params_to_date(date, "date")
+            queryset = queryset.filter(
+                show_time__gte=date,
+                show_time__lt=date + timedelta(days=1),
+            )
+
+        return queryset
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "play",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by play. (ex. ?play=1)",
+            ),
+            OpenApiParameter(
+                "theatre_hall",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by theatre hall. (ex. ?theatre_hall=1,2)",
+            ),
+            OpenApiParameter(
+                "date",
+                type={"type": "array", "items": {"type": "string"}},
+                description="Filter by performance date (YYYY-MM-DD). (ex. ?date=2024-10-13)",
+            ),
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+
+class ArchiveReportView(TracedViewMixin, APIView):
+    """Tickets of archived performances, per performance, for a date range."""
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "from",
+                type=str,
+                required=True,
+                description="First show day of the range (YYYY-MM-DD). "
+                            "(ex. ?from=2024-01-01)",
+            ),
+            OpenApiParameter(
+                "to",
+                type=str,
+                required=True,
+                description="Last show day of the range, inclusive "
+                            "(YYYY-MM-DD). (ex. ?to=2024-06-30)",
+            ),
+            OpenApiParameter(
+                "play",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by play. (ex. ?play=1)",
+            ),
+        ],
+        responses=ArchiveReportSerializer,
+    )
+    def get(self, request):
+        date_from = params_to_date(request.query_params.get("from"), "from")
+        date_to = params_to_date(request.query_params.get("to"), "to")
+        days_count = (date_to - date_from).days + 1
+
+        if days_count < 1:
+            raise ValidationError({"to": "Must not be earlier than from."})
+        if days_count > ARCHIVE_REPORT_MAX_DAYS:
+            raise ValidationError(
+                {"to": f"Range must not exceed {ARCHIVE_REPORT_MAX_DAYS} days."}
+            )
+
+        tickets = ArchivedTicket.objects.filter(
+            show_time__gte=date_from,
+            show_time__lt=date_to + timedelta(days=1),
+        )
+        play = request.query_params.get("play")
+        if play:
+            tickets = tickets.filter(play_id__in=params_to_int(play))
+
+        performances = (
+            tickets.values(
+                "performance_id", "play_id", "theatre_hall_id", "show_time"
+            )
+            .annotate(tickets_count=Count("id"))
+            .order_by("show_time", "performance_id")
+        )
+        totals = tickets.aggregate(
+            tickets_count=Count("id"),
+            reservations_count=Count("reservation_id", distinct=True),
+        )
+
+        serializer = ArchiveReportSerializer(
+            {
+                "date_from": date_from,
+                "date_to": date_to,
+                **totals,
+                "performances": performances,
+            }
+        )
+        return Response(serializer.data)
+
+
+class CatalogImportView(TracedViewMixin, APIView):
+    """Imports genres, actors and plays from an uploaded JSONL or CSV file."""
+    permission_classes = (IsAdminUser,)
+    parser_classes = (MultiPartParser,)
+    throttle_scope = "catalog"
+
+    @extend_schema(request=CatalogImportSerializer)
+    def post(self, request):
+        serializer = CatalogImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            stats = catalog.import_catalog(
+                catalog.read_records(
+                    codecs.iterdecode(data["file"], "utf-8"),
+                    data["file_format"],
+                ),
+                dry_run=data["dry_run"],
+            )
+        except catalog.CatalogError as error:
+            # Batches before the invalid record are committed; say so.
+            return Response(
+                {"file": [str(error)], "committed": error.stats},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        except UnicodeDecodeError:
+            raise ValidationError({"file": "File must be UTF-8 encoded."})
+        return Response(stats)
+
+
+class CatalogExportView(TracedViewMixin, APIView):
+    """Streams every genre, actor and play as JSONL or CSV."""
+    permission_classes = (IsAdminUser,)
+    throttle_scope = "catalog"
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "file_format",
+                type=str,
+                enum=catalog.FORMATS,
+                description="Export format, jsonl by default. "
+                            "(ex. ?file_format=csv)",
+            ),
+        ],
+        responses={(200, "application/x-ndjson"): str, (200, "text/csv"): str},
+    )
+    def get(self, request):
+        file_format = request.query_params.get("file_format", "jsonl")
+        if file_format not in catalog.FORMATS:
+            raise ValidationError(
+                {"file_format": f"Must be one of {', '.join(catalog.FORMATS)}."}
+            )
+
+        response = StreamingHttpResponse(
+            catalog.export_lines(file_format),
+            content_type=catalog.CONTENT_TYPES[file_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="catalog.{file_format}"'
+        )
+        return response
+
+
+class CheckInView(TracedViewMixin, APIView):
+    """Admits a ticket at the door by its signed token."""
+    permission_classes = (IsAdminUser,)
+    throttle_scope = "check_in"
+
+    @extend_schema(
+        request=CheckInSerializer, responses=CheckInResultSerializer
+    )
+    def post(self, request):
+        serializer = CheckInSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        token = serializer.validated_data["token"]
+
+        outcome, ticket = checkin.recorder.scan(
+            token, serializer.validated_data.get("performance")
+        )
+        if checkin.recorder.should_flush():
+            checkin.recorder.flush()
+
+        result = checkin.scan_result(token, outcome, ticket)
+        return Response(CheckInResultSerializer(result).data)
+
+
+class CheckInSyncView(TracedViewMixin, APIView):
+    """Uploads the scans of a scanner that was offline, in scan order."""
+    permission_classes = (IsAdminUser,)
+    throttle_scope = "check_in"
+
+    @extend_schema(
+        request=CheckInSyncSerializer,
+        responses=CheckInResultSerializer(many=True),
+    )
+    def post(self, request):
+        serializer = CheckInSyncSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        performance_id = serializer.validated_data.get("performance")
+
+        results = []
+        for scan in serializer.validated_data["scans"]:
+            outcome, ticket = checkin.recorder.scan(
+                scan["token"], performance_id, scan.get("scanned_at")
+            )
+            results.append(checkin.scan_result(scan["token"], outcome, ticket))
+        checkin.recorder.flush()
+
+        return Response(CheckInResultSerializer(results, many=True).data)
+
+
+class SalesAnalyticsView(TracedViewMixin, APIView):
+    """Daily sales per play and hall, read from the sales rollups only."""
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "from",
+                type=str,
+                required=True,
+                description="First day of the range (YYYY-MM-DD). "
+                            "(ex. ?from=2024-11-01)",
+            ),
+            OpenApiParameter(
+                "to",
+                type=str,
+                required=True,
+                description="Last day of the range, inclusive (YYYY-MM-DD). "
+                            "(ex. ?to=2024-11-30)",
+            ),
+            OpenApiParameter(
+                "play",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by play. (ex. ?play=1)",
+            ),
+            OpenApiParameter(
+                "theatre_hall",
+                type={"type": "array", "items": {"type": "number"}},
+                description="Filter by theatre hall. (ex. ?theatre_hall=1,2)",
+            ),
+        ],
+        responses=SalesRollupSerializer(many=True),
+    )
+    def get(self, request):
+        date_from = params_to_date(request.query_params.get("from"), "from")
+        date_to = params_to_date(request.query_params.get("to"), "to")
+        days_count = (date_to - date_from).days + 1
+
+        if days_count < 1:
+            raise ValidationError({"to": "Must not be earlier than from."})
+        if days_count > SALES_ANALYTICS_MAX_DAYS:
+            raise ValidationError(
+                {"to": f"Range must not exceed {SALES_ANALYTICS_MAX_DAYS} days."}
+            )
+
+        rollups = SalesRollup.objects.filter(
+            day__gte=date_from, day__lte=date_to
+        )
+        play = request.query_params.get("play")
+        theatre_hall = request.query_params.get("theatre_hall")
+        if play:
+            rollups = rollups.filter(play_id__in=params_to_int(play))
+        if theatre_hall:
+            rollups = rollups.filter(
+                theatre_hall_id__in=params_to_int(theatre_hall)
+            )
+
+        occupancy = (
+            Cast("tickets_sold", FloatField()) * 100 / NullIf("capacity", 0)
+        )
+        partition = {
+            "partition_by": [F("play_id"), F("theatre_hall_id")],
+            "order_by": F("day").asc(),
+        }
+        rows = (
+            rollups.annotate(
+                occupancy=Round(occupancy, 2),
+                running_tickets_sold=Window(Sum("tickets_sold"), **partition),
+                occupancy_trend=Round(
+                    Window(
+                        Avg(occupancy),
+                        frame=RowRange(start=-6, end=0),
+                        **partition,
+                    ),
+                    2,
+                ),
+            )
+            .values(
+                "day",
+                "play_id",
+                "theatre_hall_id",
+                "performances_count",
+                "capacity",
+                "tickets_sold",
+                "running_tickets_sold",
+                "occupancy",
+                "occupancy_trend",
+            )
+            .order_by("play_id", "theatre_hall_id", "day")
+        )
+        return Response(SalesRollupSerializer(rows, many=True).data)
+
+
+@extend_schema(exclude=True)
+class MetricsView(APIView):
+    """Prometheus exposition for staff users or the METRICS_TOKEN scraper."""
+    authentication_classes = (MetricsTokenAuthentication, JWTAuthentication)
+    permission_classes = (IsAdminOrMetricsScraper,)
+    throttle_classes = ()
+
+    def get(self, request):
+        return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
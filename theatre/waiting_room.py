@@ -0,0 +1,168 @@
+import math
+import time
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from rest_framework.exceptions import PermissionDenied
+
+from theatre.models import Performance
+
+QUEUE_SALT = "theatre.waiting_room.queue"
+ADMISSION_SALT = "theatre.waiting_room.admission"
+ADMISSION_HEADER = "Admission-Token"
+# How long the admission rate of a performance is cached; saving the
+# performance drops it sooner.
+RATE_CACHE_TTL = 60
+
+
+def get_ttl():
+    return getattr(settings, "WAITING_ROOM_TTL", 60 * 60 * 24)
+
+
+def get_admission_ttl():
+    return getattr(settings, "WAITING_ROOM_ADMISSION_TTL", 600)
+
+
+def get_tick():
+    return getattr(settings, "WAITING_ROOM_TICK", 1)
+
+
+def key(performance_id, name):
+    return f"waiting_room_{performance_id}_{name}"
+
+
+def get_admission_rate(performance_id):
+    """Users admitted per minute, or ``None`` when sales are open.
+
+    Cached, as every reservation asks for it during an on-sale.
+    """
+    rate_key = key(performance_id, "rate")
+    rate = cache.get(rate_key)
+    if rate is None:
+        rate = Performance.objects.filter(id=performance_id).values_list(
+            "admissions_per_minute", flat=True
+        ).first() or 0
+        cache.set(rate_key, rate, RATE_CACHE_TTL)
+    return rate or None
+
+
+def forget_admission_rate(performance_id):
+    cache.delete(key(performance_id, "rate"))
+
+
+def increment(counter_key, delta=1):
+    cache.add(counter_key, 0, get_ttl())
+    return cache.incr(counter_key, delta)
+
+
+def advance(performance_id, rate):
+    """Moves the admission line forward by one batch per tick.
+
+    The first caller of a tick wins an atomic ``add`` and admits the
+    batch, so the line moves at ``rate`` however many clients poll. Ticks
+    nobody polls are lost rather than saved up, and the line never gets
+    ahead of the queue, so an idle room cannot let a burst through.
+    """
+    interval = max(get_tick(), 60 / rate)
+    tick = int(time.time() // interval)
+    if not cache.add(
+        key(performance_id, f"tick_{tick}"), 1, math.ceil(interval) * 2
+    ):
+        return
+    batch = max(1, round(rate * interval / 60))
+    joined = cache.get(key(performance_id, "joined"), 0)
+    admitted = cache.get(key(performance_id, "admitted"), 0)
+    delta = min(batch, joined - admitted)
+    if delta > 0:
+        increment(key(performance_id, "admitted"), delta)
+
+
+def make_queue_token(performance_id, user_id, position):
+    return signing.dumps(
+        {"p": performance_id, "u": user_id, "n": position}, salt=QUEUE_SALT
+    )
+
+
+def read_queue_token(token, performance_id, user_id):
+    """Returns the position a queue token holds, or ``None``."""
+    try:
+        data = signing.loads(token, salt=QUEUE_SALT, max_age=get_ttl())
+    except signing.BadSignature:
+        return None
+    if data.get("p") != performance_id or data.get("u") != user_id:
+        return None
+    return data.get("n")
+
+
+def make_admission_token(performance_id, user_id):
+    return signing.dumps(
+        {"p": performance_id, "u": user_id}, salt=ADMISSION_SALT
+    )
+
+
+def is_admitted(token, performance_id, user_id):
+    if not token:
+        return False
+    try:
+        data = signing.loads(
+            token, salt=ADMISSION_SALT, max_age=get_admission_ttl()
+        )
+    except signing.BadSignature:
+        return False
+    return data.get("p") == performance_id and data.get("u") == user_id
+
+
+def join(performance_id, user_id):
+    """Gives the user a place at the back of the queue, once."""
+    user_key = key(performance_id, f"user_{user_id}")
+    position = cache.get(user_key)
+    if position is None:
+        position = increment(key(performance_id, "joined"))
+        cache.set(user_key, position, get_ttl())
+    return position
+
+
+def check(performance_id, user_id, position, rate):
+    """Describes the user's place, with an admission token once admitted."""
+    advance(performance_id, rate)
+    admitted = cache.get(key(performance_id, "admitted"), 0)
+    ahead = max(position - admitted, 0)
+    return {
+        "position": position,
+        "ahead": ahead,
+        "estimated_wait": math.ceil(ahead * 60 / rate),
+        "token": make_queue_token(performance_id, user_id, position),
+        "admission_token": (
+            None if ahead else make_admission_token(performance_id, user_id)
+        ),
+    }
+
+
+def require_admission(request):
+    """Rejects a reservation booking a gated performance without admission.
+
+    Runs before the reservation is validated, so turned away requests
+    never reach the database.
+    """
+    tickets = request.data.get("tickets")
+    if not isinstance(tickets, list):
+        return
+    performance_ids = set()
+    for ticket in tickets:
+        try:
+            performance_ids.add(int(ticket["performance"]))
+        except (KeyError, TypeError, ValueError):
+            continue
+
+    token = request.headers.get(ADMISSION_HEADER)
+    for performance_id in sorted(performance_ids):
+        if get_admission_rate(performance_id) and not is_admitted(
+            token, performance_id, request.user.id
+        ):
+            raise PermissionDenied(
+                f"Performance {performance_id} is in high demand. Join its "
+                f"waiting room and send the admission token in the "
+                f"{ADMISSION_HEADER} header.",
+                code="admission_required",
+            )
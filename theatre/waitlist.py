@@ -0,0 +1,179 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from theatre import pricing, seat_events
+from theatre.models import Performance, Reservation, Ticket, WaitlistEntry
+from theatre.on_commit import CommitBatch
+
+WAITING = WaitlistEntry.Status.WAITING
+OFFERED = WaitlistEntry.Status.OFFERED
+CLAIMED = WaitlistEntry.Status.CLAIMED
+EXPIRED = WaitlistEntry.Status.EXPIRED
+
+
+def get_claim_window():
+    return timedelta(seconds=getattr(settings, "WAITLIST_CLAIM_SECONDS", 600))
+
+
+def get_batch_size():
+    return getattr(settings, "WAITLIST_PROMOTE_BATCH_SIZE", 50)
+
+
+def free_seats_count(performance):
+    return performance.theatre_hall.capacity - performance.tickets.count()
+
+
+def hold_seats(entry, performance, seats):
+    """Reserves ``seats`` for the entry's user and offers them."""
+    reservation = Reservation.objects.create(user_id=entry.user_id)
+    grid = pricing.get_grid(performance)
+    for row, seat in seats:
+        Ticket.objects.create(
+            reservation=reservation,
+            performance=performance,
+            row=row,
+            seat=seat,
+            price=grid.price_of(row, seat),
+        )
+    seat_events.publish_on_commit(
+        performance.id, seat_events.RESERVED, seats
+    )
+
+    entry.status = OFFERED
+    entry.reservation = reservation
+    entry.expires_at = timezone.now() + get_claim_window()
+    entry.save(update_fields=("status", "reservation", "expires_at"))
+
+
+def promote(performance_id):
+    """Offers the free seats of a performance to its waitlist.
+
+    Waiting entries are served in the order they joined; one asking for
+    more seats than are free keeps its place while later, smaller ones
+    are served. Entries are locked with ``SKIP LOCKED``, so workers
+    promoting the same performance take disjoint entries instead of
+    waiting on each other, and the unique ticket constraint stops them
+    from handing out a seat twice: the loser of a race re-reads the free
+    seats and tries again. Returns the promoted entries.
+    """
+    promoted = []
+    with transaction.atomic():
+        performance = (
+            Performance.objects.select_related("theatre_hall")
+            .filter(id=performance_id, show_time__gt=timezone.now())
+            .first()
+        )
+        if performance is None:
+            return promoted
+        free_seats = performance.get_free_seats()
+        if not free_seats:
+            return promoted
+
+        entries = (
+            WaitlistEntry.objects.select_for_update(skip_locked=True)
+            .filter(performance_id=performance_id, status=WAITING)
+            .order_by("id")[:get_batch_size()]
+        )
+        for entry in entries:
+            for attempt in range(2):
+                if entry.seats_count > len(free_seats):
+                    break
+                seats = free_seats[:entry.seats_count]
+                try:
+                    with transaction.atomic():
+                        hold_seats(entry, performance, seats)
+                except (
+                    IntegrityError, ValidationError, DjangoValidationError
+                ):
+                    # Another worker took one of the seats meanwhile.
+                    free_seats = performance.get_free_seats()
+                    continue
+                free_seats = free_seats[entry.seats_count:]
+                promoted.append(entry)
+                break
+            if not free_seats:
+                break
+    return promoted
+
+
+class PendingPromotions(CommitBatch):
+    """Performances to promote once the current transaction commits."""
+
+    def __init__(self):
+        super().__init__()
+        self.performance_ids = set()
+
+    def collect(self, performance_id):
+        self.performance_ids.add(performance_id)
+
+    def run(self):
+        for performance_id in sorted(self.performance_ids):
+            promote(performance_id)
+
+
+def promote_on_commit(performance_id):
+    """Promotes the waitlist once released seats are committed.
+
+    Releases in one transaction share a single callback, so deleting a
+    reservation of many tickets promotes each performance once.
+    """
+    PendingPromotions.add(performance_id)
+
+
+def expire_offers(performance_id=None):
+    """Takes back the seats of offers that were not claimed in time.
+
+    Deleting the held reservations releases their tickets, which promotes
+    the next entries. Returns the number of expired offers.
+    """
+    with transaction.atomic():
+        entries = WaitlistEntry.objects.select_for_update(
+            skip_locked=True
+        ).filter(status=OFFERED, expires_at__lte=timezone.now())
+        if performance_id is not None:
+            entries = entries.filter(performance_id=performance_id)
+        entries = list(entries.values_list("id", "reservation_id"))
+        if not entries:
+            return 0
+
+        WaitlistEntry.objects.filter(
+            id__in=[entry_id for entry_id, _ in entries]
+        ).update(status=EXPIRED)
+        for reservation in Reservation.objects.filter(
+            id__in=[reservation_id for _, reservation_id in entries]
+        ):
+            reservation.delete()
+    return len(entries)
+
+
+def claim(entry):
+    """Confirms an offer, keeping its reservation for the user."""
+    with transaction.atomic():
+        entry = WaitlistEntry.objects.select_for_update().get(id=entry.id)
+        if entry.status == CLAIMED:
+            return entry
+        if (
+            entry.status != OFFERED
+            or entry.reservation_id is None
+            or entry.expires_at <= timezone.now()
+        ):
+            raise ValidationError(
+                {"status": "There is no offer to claim for this entry."}
+            )
+        entry.status = CLAIMED
+        entry.save(update_fields=("status",))
+    return entry
+
+
+def leave(entry):
+    """Removes an entry, giving back the seats of a pending offer."""
+    with transaction.atomic():
+        entry = WaitlistEntry.objects.select_for_update().get(id=entry.id)
+        if entry.status == OFFERED and entry.reservation_id is not None:
+            entry.reservation.delete()
+        entry.delete()
@@ -47,3 +47,10 @@ class User(AbstractBaseUser):
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    def has_perm(self, perm, obj=None):
+        """The model has no permission tables; superusers may do anything."""
+        return self.is_active and self.is_superuser
+
+    def has_module_perms(self, app_label):
+        return self.is_active and self.is_superuser